@@ -1,20 +1,85 @@
+import argparse
+import csv
+import hashlib
+import json
 import os
+import queue
+import shutil
+import threading
+import time
 from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from io import BytesIO
 
 import clip
+import numpy as np
 import requests
 import torch
 import torch.nn as nn
 from PIL import Image
-from clip.model import build_model
+from clip.model import CLIP, build_model
 
 DEFAULT_MODEL_NAME = "fakeddit-clip"
 DEFAULT_LABELS = ("real", "spam")
 DEFAULT_TIMEOUT_SECONDS = 20
 DEFAULT_THRESHOLD_PERCENT = 50.0
 
+# Concurrent classify calls share one CLIP forward pass: the batcher waits up
+# to REPORT_SPAM_BATCH_WAIT_MS after the first pending request for more, up
+# to REPORT_SPAM_BATCH_MAX requests per pass. REPORT_SPAM_BATCHING=0 runs
+# every request on its own. A caller gives up on its batched result after
+# REPORT_SPAM_BATCH_TIMEOUT_SECONDS.
+DEFAULT_BATCH_MAX = 16
+DEFAULT_BATCH_WAIT_MS = 5.0
+DEFAULT_BATCH_TIMEOUT_SECONDS = 30.0
+
+# CLIP image/text features are cached by SHA-256 of the image bytes and of
+# the CLIP token ids (the text after the tokenizer's own cleanup), as float16:
+# 1 KB per 512-d entry. REPORT_SPAM_EMBED_CACHE_SIZE=0 disables the cache;
+# REPORT_SPAM_EMBED_CACHE_DIR also persists entries as .npy files, capped at
+# REPORT_SPAM_EMBED_CACHE_DISK_MB (least recently used files go first; files
+# of checkpoints no longer loaded are removed on reload).
+DEFAULT_EMBED_CACHE_SIZE = 20000
+DEFAULT_EMBED_CACHE_DISK_MB = 256.0
+# Pruning goes below the cap so the next prune is thousands of writes away.
+EMBED_CACHE_PRUNE_TARGET = 0.9
+
+# Image ingestion: downloads stream through a pooled session and stop at
+# REPORT_SPAM_IMAGE_MAX_BYTES; JPEGs are decoded in draft mode at the smallest
+# DCT scale still covering the model input (REPORT_SPAM_JPEG_DRAFT=0 decodes
+# full size); fetch + decode + preprocess run on REPORT_SPAM_INGEST_THREADS.
+DEFAULT_IMAGE_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_INGEST_THREADS = 4
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# REPORT_SPAM_QUANTIZE=int8 swaps the plain nn.Linear layers (the MLP of every
+# CLIP residual block, image and text towers, plus the classifier head) for
+# dynamically quantized int8 kernels after loading. Attention projections and
+# the patch conv stay float32.
+QUANTIZE_MODES = ("none", "int8")
+
+# `report_spam_model.py --convert` writes <checkpoint>.mmap.pt next to the
+# Fakeddit checkpoint: float32 clip_model / classifier state dicts plus the
+# CLIP architecture, in torch's zip format so torch.load(mmap=True) maps the
+# tensors instead of reading them. REPORT_SPAM_CHECKPOINT_FORMAT=auto (default)
+# uses it when it matches the checkpoint, mmap requires it, torch ignores it.
+CHECKPOINT_FORMATS = ("auto", "mmap", "torch")
+CONVERTED_FORMAT_VERSION = "siara-clip-spam-mmap-v1"
+CONVERTED_SUFFIX = ".mmap.pt"
+FINGERPRINT_BYTES = 1024 * 1024
+
 _MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+_EMBEDDING_CACHE = None
+_EMBEDDING_CACHE_LOCK = threading.Lock()
+_INGEST_EXECUTOR = None
+_IMAGE_SESSION = None
+_INGEST_LOCK = threading.Lock()
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when a report image exceeds REPORT_SPAM_IMAGE_MAX_BYTES."""
 
 
 def _resolve_model_path(model_path=None):
@@ -37,6 +102,97 @@ def _normalize_percent(value, fallback):
     return max(0.0, min(100.0, numeric))
 
 
+def _elapsed_ms(started_at):
+    return round((time.perf_counter() - started_at) * 1000.0, 2)
+
+
+def _env_flag(name, default=True):
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def _get_batch_config():
+    try:
+        max_batch = max(1, int(os.getenv("REPORT_SPAM_BATCH_MAX", str(DEFAULT_BATCH_MAX))))
+    except ValueError:
+        max_batch = DEFAULT_BATCH_MAX
+    try:
+        wait_ms = max(0.0, float(os.getenv("REPORT_SPAM_BATCH_WAIT_MS", str(DEFAULT_BATCH_WAIT_MS))))
+    except ValueError:
+        wait_ms = DEFAULT_BATCH_WAIT_MS
+    try:
+        timeout_seconds = max(
+            0.1, float(os.getenv("REPORT_SPAM_BATCH_TIMEOUT_SECONDS", str(DEFAULT_BATCH_TIMEOUT_SECONDS)))
+        )
+    except ValueError:
+        timeout_seconds = DEFAULT_BATCH_TIMEOUT_SECONDS
+    return {
+        "enabled": _env_flag("REPORT_SPAM_BATCHING"),
+        "max_batch": max_batch,
+        "wait_seconds": wait_ms / 1000.0,
+        "timeout_seconds": timeout_seconds,
+    }
+
+
+def _get_embedding_cache_config():
+    try:
+        max_entries = max(0, int(os.getenv("REPORT_SPAM_EMBED_CACHE_SIZE", str(DEFAULT_EMBED_CACHE_SIZE))))
+    except ValueError:
+        max_entries = DEFAULT_EMBED_CACHE_SIZE
+    directory = str(os.getenv("REPORT_SPAM_EMBED_CACHE_DIR", "") or "").strip()
+    try:
+        disk_mb = max(0.0, float(os.getenv("REPORT_SPAM_EMBED_CACHE_DISK_MB", str(DEFAULT_EMBED_CACHE_DISK_MB))))
+    except ValueError:
+        disk_mb = DEFAULT_EMBED_CACHE_DISK_MB
+    return {
+        "max_entries": max_entries,
+        "directory": os.path.abspath(directory) if directory else None,
+        "max_disk_bytes": int(disk_mb * 1024 * 1024),
+    }
+
+
+def _get_ingest_config():
+    try:
+        max_bytes = max(1, int(os.getenv("REPORT_SPAM_IMAGE_MAX_BYTES", str(DEFAULT_IMAGE_MAX_BYTES))))
+    except ValueError:
+        max_bytes = DEFAULT_IMAGE_MAX_BYTES
+    try:
+        threads = max(1, int(os.getenv("REPORT_SPAM_INGEST_THREADS", str(DEFAULT_INGEST_THREADS))))
+    except ValueError:
+        threads = DEFAULT_INGEST_THREADS
+    return {
+        "max_bytes": max_bytes,
+        "threads": threads,
+        "jpeg_draft": _env_flag("REPORT_SPAM_JPEG_DRAFT"),
+    }
+
+
+def _get_ingest_executor():
+    global _INGEST_EXECUTOR, _IMAGE_SESSION
+    with _INGEST_LOCK:
+        if _INGEST_EXECUTOR is None:
+            threads = _get_ingest_config()["threads"]
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=threads)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _IMAGE_SESSION = session
+            _INGEST_EXECUTOR = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="spam-ingest")
+        return _INGEST_EXECUTOR
+
+
+def _get_checkpoint_format():
+    checkpoint_format = str(os.getenv("REPORT_SPAM_CHECKPOINT_FORMAT", "auto") or "auto").strip().lower()
+    return checkpoint_format if checkpoint_format in CHECKPOINT_FORMATS else "auto"
+
+
+def _get_quantize_mode():
+    mode = str(os.getenv("REPORT_SPAM_QUANTIZE", "none") or "none").strip().lower()
+    return mode if mode in QUANTIZE_MODES else "none"
+
+
 def _build_classifier():
     return nn.Sequential(
         nn.Linear(1024, 512),
@@ -46,7 +202,28 @@ def _build_classifier():
     )
 
 
-def _load_model_bundle(model_path):
+def _quantize_dynamic_int8(module):
+    return torch.ao.quantization.quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8)
+
+
+def converted_checkpoint_path(model_path):
+    if model_path.endswith(CONVERTED_SUFFIX):
+        return model_path
+    return os.path.splitext(model_path)[0] + CONVERTED_SUFFIX
+
+
+def _checkpoint_fingerprint(model_path):
+    """Size plus SHA-256 of the first and last MiB: cheap, and survives copies (unlike mtime)."""
+    size = os.path.getsize(model_path)
+    digest = hashlib.sha256(str(size).encode("ascii"))
+    with open(model_path, "rb") as fh:
+        digest.update(fh.read(FINGERPRINT_BYTES))
+        fh.seek(max(0, size - FINGERPRINT_BYTES))
+        digest.update(fh.read(FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+
+def _read_checkpoint_state(model_path):
     state_dict = torch.load(model_path, map_location="cpu", weights_only=False)
     if not isinstance(state_dict, (dict, OrderedDict)):
         raise TypeError("Expected a checkpoint state_dict")
@@ -71,14 +248,401 @@ def _load_model_bundle(model_path):
     classifier = _build_classifier()
     classifier.load_state_dict(classifier_state)
     classifier.float().eval()
+    return clip_model, classifier
+
+
+def _load_converted_checkpoint(converted_path, expected_fingerprint=None):
+    converted = torch.load(converted_path, map_location="cpu", mmap=True, weights_only=True)
+    if not isinstance(converted, dict) or converted.get("format") != CONVERTED_FORMAT_VERSION:
+        raise TypeError(f"{converted_path} is not a converted spam checkpoint ({CONVERTED_FORMAT_VERSION})")
+    if expected_fingerprint and converted.get("source_fingerprint") != expected_fingerprint:
+        return None
+
+    # Build on the meta device and adopt the mapped tensors (assign=True), so
+    # no weight is allocated, initialised or copied.
+    with torch.device("meta"):
+        clip_model = CLIP(**converted["architecture"])
+        classifier = _build_classifier()
+    clip_model.load_state_dict(converted["clip_model"], assign=True)
+    classifier.load_state_dict(converted["classifier"], assign=True)
+    # The text causal mask is a plain attribute, not a buffer.
+    attn_mask = clip_model.build_attention_mask()
+    for block in clip_model.transformer.resblocks:
+        block.attn_mask = attn_mask
+    if any(tensor.is_meta for tensor in list(clip_model.parameters()) + list(classifier.parameters())):
+        raise KeyError(f"{converted_path} is missing weights")
+    return clip_model.eval(), classifier.eval()
 
+
+def _load_model_bundle(model_path, quantize=None):
+    started_at = time.perf_counter()
+    checkpoint_format = _get_checkpoint_format()
+    converted_path = converted_checkpoint_path(model_path)
+    loaded = None
+    if converted_path == model_path:
+        loaded = _load_converted_checkpoint(model_path)
+    elif checkpoint_format != "torch" and os.path.exists(converted_path):
+        loaded = _load_converted_checkpoint(converted_path, _checkpoint_fingerprint(model_path))
+        if loaded is None:
+            print(f"[report-spam] {converted_path} is stale for {model_path}; loading the checkpoint", flush=True)
+    if loaded is None and checkpoint_format == "mmap" and converted_path != model_path:
+        raise FileNotFoundError(f"No up-to-date converted checkpoint at {converted_path}")
+
+    if loaded is not None:
+        clip_model, classifier = loaded
+        loaded_format = "mmap"
+    else:
+        clip_model, classifier = _read_checkpoint_state(model_path)
+        loaded_format = "torch"
+
+    quantize = quantize or _get_quantize_mode()
+    if quantize == "int8":
+        clip_model = _quantize_dynamic_int8(clip_model)
+        classifier = _quantize_dynamic_int8(classifier)
+
+    input_resolution = int(clip_model.visual.input_resolution)
     return {
         "clip_model": clip_model,
         "classifier": classifier,
-        "input_resolution": int(clip_model.visual.input_resolution),
+        "input_resolution": input_resolution,
+        "preprocess": clip.clip._transform(input_resolution),
+        "quantization": quantize,
+        "checkpoint_format": loaded_format,
+        "load_ms": _elapsed_ms(started_at),
     }
 
 
+def _encode_features(bundle, image_batch, text_batch):
+    """CLIP features for (N, 3, H, W) images and (M, 77) tokens; either may be None."""
+    with torch.inference_mode():
+        image_features = None if image_batch is None else bundle["clip_model"].encode_image(image_batch).float()
+        text_features = None if text_batch is None else bundle["clip_model"].encode_text(text_batch).float()
+        return image_features, text_features
+
+
+def _classify_features(bundle, image_features, text_features):
+    """(N, 512) image + text features -> (N, 2) softmax probabilities."""
+    with torch.inference_mode():
+        fused_features = torch.cat([text_features, image_features], dim=-1)
+        logits = bundle["classifier"](fused_features)
+        return torch.softmax(logits, dim=-1).tolist()
+
+
+def _forward_probabilities(bundle, image_batch, text_batch):
+    """(N, 3, H, W) images + (N, 77) tokens -> (N, 2) softmax probabilities."""
+    image_features, text_features = _encode_features(bundle, image_batch, text_batch)
+    return _classify_features(bundle, image_features, text_features)
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of float16 CLIP features keyed by (model tag, kind, sha256)."""
+
+    def __init__(
+        self,
+        max_entries=DEFAULT_EMBED_CACHE_SIZE,
+        directory=None,
+        max_disk_bytes=int(DEFAULT_EMBED_CACHE_DISK_MB * 1024 * 1024),
+    ):
+        self.max_entries = int(max_entries)
+        self.directory = directory
+        self.max_disk_bytes = int(max_disk_bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        # Unknown until the first prune walks the directory.
+        self._disk_bytes = None
+        self._disk_evictions = 0
+
+    def _disk_path(self, key):
+        model_tag, kind, digest = key
+        return os.path.join(self.directory, model_tag, kind, digest[:2], f"{digest}.npy")
+
+    def _remember_locked(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+
+        if self.directory:
+            try:
+                value = np.load(self._disk_path(key), allow_pickle=False)
+            except (OSError, ValueError):
+                value = None
+            if value is not None and value.dtype == np.float16:
+                # Disk hits refresh the mtime the pruner orders by.
+                try:
+                    os.utime(self._disk_path(key))
+                except OSError:
+                    pass
+                with self._lock:
+                    self._remember_locked(key, value)
+                    self._disk_hits += 1
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key, value):
+        value = np.ascontiguousarray(value, dtype=np.float16)
+        with self._lock:
+            self._remember_locked(key, value)
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as fh:
+                np.save(fh, value, allow_pickle=False)
+            os.replace(temp_path, path)
+            written = os.path.getsize(path)
+        except OSError as exc:
+            print(f"[report-spam] embedding cache write failed for {path}: {exc}", flush=True)
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += written
+            needs_prune = self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes
+        if needs_prune:
+            self.prune()
+
+    def prune(self, live_tags=None):
+        """Trim the disk store to ``max_disk_bytes``, least recently used first.
+
+        With ``live_tags``, directories (and memory entries) of every other
+        model tag are removed first. Returns the kept files and bytes.
+        """
+        if not self.directory:
+            return {"files": 0, "bytes": 0, "evicted": 0}
+        # One pruner at a time; concurrent writers just skip.
+        if not self._prune_lock.acquire(blocking=False):
+            return None
+        try:
+            removed = 0
+            if live_tags is not None:
+                live_tags = set(live_tags)
+                with self._lock:
+                    for key in [key for key in self._entries if key[0] not in live_tags]:
+                        del self._entries[key]
+                try:
+                    tags = os.listdir(self.directory)
+                except OSError:
+                    tags = []
+                for tag in tags:
+                    if tag not in live_tags and os.path.isdir(os.path.join(self.directory, tag)):
+                        shutil.rmtree(os.path.join(self.directory, tag), ignore_errors=True)
+                        print(f"[report-spam] removed embedding cache of stale model tag {tag}", flush=True)
+
+            files = []
+            for root, _dirs, names in os.walk(self.directory):
+                for name in names:
+                    if not name.endswith(".npy"):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            kept = len(files)
+            if total > self.max_disk_bytes:
+                target = self.max_disk_bytes * EMBED_CACHE_PRUNE_TARGET
+                files.sort()
+                for _, size, path in files:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    removed += 1
+                    kept -= 1
+                    total -= size
+
+            with self._lock:
+                self._disk_bytes = total
+                self._disk_evictions += removed
+            return {"files": kept, "bytes": total, "evicted": removed}
+        finally:
+            self._prune_lock.release()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "directory": self.directory,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes if self.directory else None,
+                "disk_evictions": self._disk_evictions,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._disk_hits) / lookups, 4) if lookups else None,
+            }
+
+
+def _get_embedding_cache():
+    global _EMBEDDING_CACHE
+    if _EMBEDDING_CACHE is None:
+        with _EMBEDDING_CACHE_LOCK:
+            if _EMBEDDING_CACHE is None:
+                config = _get_embedding_cache_config()
+                _EMBEDDING_CACHE = (
+                    EmbeddingCache(config["max_entries"], config["directory"], config["max_disk_bytes"])
+                    if config["max_entries"] > 0
+                    else False
+                )
+    return _EMBEDDING_CACHE or None
+
+
+def _model_cache_tag(model_path, modified_at, quantization="none"):
+    """Short id of one checkpoint version; cached features never outlive a reload."""
+    stat_key = f"{os.path.basename(model_path)}:{os.path.getsize(model_path)}:{modified_at}:{quantization}"
+    return hashlib.sha256(stat_key.encode("utf-8")).hexdigest()[:16]
+
+
+class ClipBatcherClosed(RuntimeError):
+    """The batcher was closed (model reloaded) before the request was queued."""
+
+
+class ClipBatcher:
+    """Background worker that runs pending classify requests as one batch."""
+
+    def __init__(
+        self,
+        bundle,
+        max_batch=DEFAULT_BATCH_MAX,
+        wait_seconds=DEFAULT_BATCH_WAIT_MS / 1000.0,
+        timeout_seconds=DEFAULT_BATCH_TIMEOUT_SECONDS,
+    ):
+        self.bundle = bundle
+        self.max_batch = int(max_batch)
+        self.wait_seconds = float(wait_seconds)
+        self.timeout_seconds = float(timeout_seconds)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._thread = threading.Thread(target=self._run, name="clip-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, image_tensor, text_tokens):
+        """Queue one (3, H, W) image and/or (77,) token row (None skips it).
+
+        Resolves to ``(image_features, text_features, batch_size)`` with (512,)
+        float32 rows, None for the skipped input. Fails with
+        ``ClipBatcherClosed`` once ``close`` has been called.
+        """
+        future = Future()
+        with self._lock:
+            # Checked under the lock close() takes, so nothing lands behind
+            # the stop sentinel.
+            if self._closed:
+                future.set_exception(ClipBatcherClosed("CLIP batcher is closed"))
+                return future
+            self._queue.put((image_tensor, text_tokens, future))
+        return future
+
+    def close(self):
+        """Stop accepting requests; already queued ones still run."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.wait_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch, then stop.
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                self._fail_pending()
+                return
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            image_rows = [index for index, item in enumerate(batch) if item[0] is not None]
+            text_rows = [index for index, item in enumerate(batch) if item[1] is not None]
+            try:
+                image_features, text_features = _encode_features(
+                    self.bundle,
+                    torch.stack([batch[index][0] for index in image_rows]) if image_rows else None,
+                    torch.stack([batch[index][1] for index in text_rows]) if text_rows else None,
+                )
+            except Exception as exc:
+                for item in batch:
+                    item[2].set_exception(exc)
+                continue
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+            results = [[None, None] for _ in batch]
+            for position, index in enumerate(image_rows):
+                results[index][0] = image_features[position]
+            for position, index in enumerate(text_rows):
+                results[index][1] = text_features[position]
+            for item, (image_row, text_row) in zip(batch, results):
+                item[2].set_result((image_row, text_row, len(batch)))
+
+    def _fail_pending(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and item[2].set_running_or_notify_cancel():
+                item[2].set_exception(ClipBatcherClosed("CLIP batcher is closed"))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": round(self._items / self._batches, 2) if self._batches else None,
+                "largest_batch": self._largest_batch,
+                "max_batch": self.max_batch,
+                "wait_ms": round(self.wait_seconds * 1000.0, 2),
+            }
+
+
 def load_report_spam_model(model_path=None):
     resolved_path = _resolve_model_path(model_path)
     cache_key = os.path.abspath(resolved_path)
@@ -88,26 +652,167 @@ def load_report_spam_model(model_path=None):
     if cached and cached.get("modified_at") == modified_at:
         return cached["bundle"]
 
+    with _MODEL_LOCK:
+        cached = _MODEL_CACHE.get(cache_key)
+        if cached and cached.get("modified_at") == modified_at:
+            return cached["bundle"]
+        return _reload_model_bundle(cache_key, modified_at, cached)
+
+
+def _reload_model_bundle(cache_key, modified_at, cached):
     bundle = _load_model_bundle(cache_key)
+    bundle["cache_tag"] = _model_cache_tag(cache_key, modified_at, bundle["quantization"])
+    print(
+        f"[report-spam] loaded {os.path.basename(cache_key)} ({bundle['checkpoint_format']}, "
+        f"quantization={bundle['quantization']}) in {bundle['load_ms']} ms",
+        flush=True,
+    )
+    batch_config = _get_batch_config()
+    if batch_config["enabled"]:
+        bundle["batcher"] = ClipBatcher(
+            bundle,
+            max_batch=batch_config["max_batch"],
+            wait_seconds=batch_config["wait_seconds"],
+            timeout_seconds=batch_config["timeout_seconds"],
+        )
+    if cached and cached["bundle"].get("batcher") is not None:
+        cached["bundle"]["batcher"].close()
     _MODEL_CACHE[cache_key] = {
         "modified_at": modified_at,
         "bundle": bundle,
     }
+    cache = _get_embedding_cache()
+    if cache is not None:
+        cache.prune(live_tags={entry["bundle"]["cache_tag"] for entry in _MODEL_CACHE.values()})
     return bundle
 
 
-def _load_image(image_url=None, image_path=None, timeout_seconds=DEFAULT_TIMEOUT_SECONDS):
+def _read_image_bytes(image_url=None, image_path=None, timeout_seconds=DEFAULT_TIMEOUT_SECONDS, max_bytes=None):
+    max_bytes = max_bytes or _get_ingest_config()["max_bytes"]
     if image_path:
-        with Image.open(image_path) as local_image:
-            return local_image.convert("RGB")
+        if os.path.getsize(image_path) > max_bytes:
+            raise ImageTooLargeError(f"Report image exceeds {max_bytes} bytes")
+        with open(image_path, "rb") as fh:
+            return fh.read()
 
     if not image_url:
         raise ValueError("image_url or image_path is required")
 
-    response = requests.get(image_url, timeout=timeout_seconds)
-    response.raise_for_status()
-    with Image.open(BytesIO(response.content)) as remote_image:
-        return remote_image.convert("RGB")
+    _get_ingest_executor()
+    with _IMAGE_SESSION.get(image_url, timeout=timeout_seconds, stream=True) as response:
+        response.raise_for_status()
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ImageTooLargeError(f"Report image exceeds {max_bytes} bytes")
+        buffer = bytearray()
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                raise ImageTooLargeError(f"Report image exceeds {max_bytes} bytes")
+    return bytes(buffer)
+
+
+def _decode_image(image_bytes, min_size=None):
+    """Decode to RGB; JPEGs are DCT-downscaled while both sides stay >= ``min_size``."""
+    with Image.open(BytesIO(image_bytes)) as image:
+        if min_size and image.format == "JPEG":
+            image.draft("RGB", (min_size, min_size))
+        return image.convert("RGB")
+
+
+def _load_image(image_url=None, image_path=None, timeout_seconds=DEFAULT_TIMEOUT_SECONDS):
+    return _decode_image(_read_image_bytes(image_url, image_path, timeout_seconds))
+
+
+def _ingest_image(bundle, image_url, image_path, cache):
+    """Fetch, hash and (on an embedding-cache miss) decode + preprocess one report image."""
+    config = _get_ingest_config()
+    timings = {}
+    started_at = time.perf_counter()
+    image_bytes = _read_image_bytes(image_url=image_url, image_path=image_path, max_bytes=config["max_bytes"])
+    timings["fetch"] = _elapsed_ms(started_at)
+
+    ingested = {"bytes": len(image_bytes), "key": None, "cached": None, "tensor": None, "decoded_size": None}
+    if cache is not None:
+        ingested["key"] = (bundle["cache_tag"], "image", hashlib.sha256(image_bytes).hexdigest())
+        ingested["cached"] = cache.get(ingested["key"])
+    if ingested["cached"] is None:
+        started_at = time.perf_counter()
+        image = _decode_image(image_bytes, bundle["input_resolution"] if config["jpeg_draft"] else None)
+        timings["decode"] = _elapsed_ms(started_at)
+        ingested["decoded_size"] = list(image.size)
+        started_at = time.perf_counter()
+        ingested["tensor"] = bundle["preprocess"](image)
+        timings["preprocess"] = _elapsed_ms(started_at)
+    ingested["timings"] = timings
+    return ingested
+
+
+def _embed_report_inputs(bundle, ingested, text_tokens, cache):
+    """Image + text features for one report, served from the embedding cache when possible.
+
+    ``ingested`` comes from ``_ingest_image``. Returns ``(image_features,
+    text_features, batch_size, cache_info)``; the features are (1, 512)
+    float32 tensors. With the cache enabled, fresh features are rounded
+    through float16 too, so a cached re-classification returns exactly the
+    first result.
+    """
+    image_cached = ingested["cached"]
+    text_key = text_cached = None
+    if cache is not None:
+        text_key = (bundle["cache_tag"], "text", hashlib.sha256(text_tokens.numpy().tobytes()).hexdigest())
+        text_cached = cache.get(text_key)
+
+    image_tensor = ingested["tensor"]
+    text_input = None if text_cached is not None else text_tokens
+
+    batch_size = 0
+    image_features = text_features = None
+    if image_tensor is not None or text_input is not None:
+        batcher = bundle.get("batcher")
+        encoded = None
+        if batcher is not None:
+            future = batcher.submit(image_tensor, text_input)
+            try:
+                encoded = future.result(timeout=batcher.timeout_seconds)
+            except ClipBatcherClosed:
+                # The checkpoint was reloaded after this request took the old
+                # bundle; encode it on its own with that bundle instead.
+                encoded = None
+            except FutureTimeoutError:
+                future.cancel()
+                raise TimeoutError(
+                    f"CLIP batch did not finish within {batcher.timeout_seconds:g} s"
+                ) from None
+        if encoded is not None:
+            image_features, text_features, batch_size = encoded
+        else:
+            image_batch, text_batch = _encode_features(
+                bundle,
+                None if image_tensor is None else image_tensor.unsqueeze(0),
+                None if text_input is None else text_input.unsqueeze(0),
+            )
+            image_features = None if image_batch is None else image_batch[0]
+            text_features = None if text_batch is None else text_batch[0]
+            batch_size = 1
+
+    cache_info = None
+    if cache is not None:
+        if image_features is None:
+            image_features = torch.from_numpy(image_cached.astype(np.float32))
+        else:
+            image_features = image_features.half().float()
+            cache.put(ingested["key"], image_features.numpy().astype(np.float16))
+        if text_features is None:
+            text_features = torch.from_numpy(text_cached.astype(np.float32))
+        else:
+            text_features = text_features.half().float()
+            cache.put(text_key, text_features.numpy().astype(np.float16))
+        cache_info = {
+            "image": "hit" if image_cached is not None else "miss",
+            "text": "hit" if text_cached is not None else "miss",
+        }
+    return image_features.unsqueeze(0), text_features.unsqueeze(0), batch_size, cache_info
 
 
 def classify_report_payload(
@@ -136,17 +841,29 @@ def classify_report_payload(
         DEFAULT_THRESHOLD_PERCENT,
     )
 
+    request_started_at = time.perf_counter()
     bundle = load_report_spam_model(resolved_model_path)
-    image = _load_image(image_url=image_url, image_path=image_path)
-    image_tensor = clip.clip._transform(bundle["input_resolution"])(image).unsqueeze(0)
-    text_tensor = clip.tokenize([normalized_text], truncate=True)
+    cache = _get_embedding_cache()
+    # The image is fetched and decoded on the ingest pool while this thread
+    # tokenizes the text.
+    ingest_future = _get_ingest_executor().submit(_ingest_image, bundle, image_url, image_path, cache)
+    started_at = time.perf_counter()
+    text_tokens = clip.tokenize([normalized_text], truncate=True)[0]
+    tokenize_ms = _elapsed_ms(started_at)
+    ingested = ingest_future.result()
 
-    with torch.no_grad():
-        image_features = bundle["clip_model"].encode_image(image_tensor).float()
-        text_features = bundle["clip_model"].encode_text(text_tensor).float()
-        fused_features = torch.cat([text_features, image_features], dim=-1)
-        logits = bundle["classifier"](fused_features)
-        probabilities = torch.softmax(logits, dim=-1)[0].tolist()
+    started_at = time.perf_counter()
+    image_features, text_features, batch_size, cache_info = _embed_report_inputs(bundle, ingested, text_tokens, cache)
+    encode_ms = _elapsed_ms(started_at)
+    started_at = time.perf_counter()
+    probabilities = _classify_features(bundle, image_features, text_features)[0]
+    timings = {
+        **ingested["timings"],
+        "tokenize": tokenize_ms,
+        "encode": encode_ms,
+        "classify": _elapsed_ms(started_at),
+        "total": _elapsed_ms(request_started_at),
+    }
 
     real_score = _normalize_percent(probabilities[0], 0.0)
     spam_score = _normalize_percent(probabilities[1], 0.0)
@@ -170,5 +887,272 @@ def classify_report_payload(
             "text_length": len(normalized_text),
             "image_source": image_url or image_path,
             "input_resolution": bundle["input_resolution"],
+            "quantization": bundle["quantization"],
+            "batch_size": batch_size,
+            "embedding_cache": cache_info,
+            "image_bytes": ingested["bytes"],
+            "decoded_size": ingested["decoded_size"],
+            "timings_ms": timings,
         },
     }
+
+
+def get_report_spam_batch_stats():
+    return {
+        path: cached["bundle"]["batcher"].stats()
+        for path, cached in list(_MODEL_CACHE.items())
+        if cached["bundle"].get("batcher") is not None
+    }
+
+
+def get_report_spam_cache_stats():
+    cache = _get_embedding_cache()
+    return cache.stats() if cache is not None else None
+
+
+def benchmark_batching(model_path=None, batch_sizes=(1, 4, 8, 16, 32), rounds=3):
+    """Forward-pass throughput per batch size on synthetic inputs (items/s)."""
+    bundle = _load_model_bundle(_resolve_model_path(model_path))
+    resolution = bundle["input_resolution"]
+    largest = max(batch_sizes)
+    generator = torch.Generator().manual_seed(0)
+    images = torch.rand((largest, 3, resolution, resolution), generator=generator)
+    texts = clip.tokenize([f"Accident sur la route nationale {index}" for index in range(largest)], truncate=True)
+
+    results = []
+    for batch_size in batch_sizes:
+        _forward_probabilities(bundle, images[:batch_size], texts[:batch_size])  # warm-up
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            _forward_probabilities(bundle, images[:batch_size], texts[:batch_size])
+        elapsed = time.perf_counter() - started_at
+        results.append(
+            {
+                "batch_size": batch_size,
+                "items_per_second": round(batch_size * rounds / elapsed, 2),
+                "ms_per_batch": round(elapsed * 1000.0 / rounds, 1),
+            }
+        )
+    baseline = results[0]["items_per_second"]
+    for row in results:
+        row["speedup"] = round(row["items_per_second"] / baseline, 2)
+    return results
+
+
+def convert_checkpoint(model_path=None, output_path=None):
+    """Write the mmap-loadable copy of a Fakeddit checkpoint and check it matches.
+
+    The weights are taken from the model as ``_read_checkpoint_state`` builds
+    it (CLIP's build_model round-trips them through float16), so the converted
+    file scores exactly like the original.
+    """
+    resolved_path = _resolve_model_path(model_path)
+    output_path = output_path or converted_checkpoint_path(resolved_path)
+
+    started_at = time.perf_counter()
+    clip_model, classifier = _read_checkpoint_state(resolved_path)
+    torch_load_ms = _elapsed_ms(started_at)
+    if not hasattr(clip_model.visual, "conv1"):
+        raise ValueError("Only ViT CLIP checkpoints can be converted")
+
+    architecture = {
+        "embed_dim": int(clip_model.text_projection.shape[1]),
+        "image_resolution": int(clip_model.visual.input_resolution),
+        "vision_layers": len(clip_model.visual.transformer.resblocks),
+        "vision_width": int(clip_model.visual.conv1.out_channels),
+        "vision_patch_size": int(clip_model.visual.conv1.kernel_size[0]),
+        "context_length": int(clip_model.context_length),
+        "vocab_size": int(clip_model.vocab_size),
+        "transformer_width": int(clip_model.transformer.width),
+        "transformer_heads": int(clip_model.transformer.resblocks[0].attn.num_heads),
+        "transformer_layers": int(clip_model.transformer.layers),
+    }
+    converted = {
+        "format": CONVERTED_FORMAT_VERSION,
+        "source": os.path.basename(resolved_path),
+        "source_fingerprint": _checkpoint_fingerprint(resolved_path),
+        "architecture": architecture,
+        "clip_model": OrderedDict(
+            (key, value.detach().float().contiguous()) for key, value in clip_model.state_dict().items()
+        ),
+        "classifier": OrderedDict(
+            (key, value.detach().float().contiguous()) for key, value in classifier.state_dict().items()
+        ),
+    }
+    temp_path = f"{output_path}.tmp"
+    torch.save(converted, temp_path)
+    os.replace(temp_path, output_path)
+
+    started_at = time.perf_counter()
+    mapped_clip, mapped_classifier = _load_converted_checkpoint(output_path)
+    mmap_load_ms = _elapsed_ms(started_at)
+
+    generator = torch.Generator().manual_seed(0)
+    resolution = architecture["image_resolution"]
+    images = torch.rand((2, 3, resolution, resolution), generator=generator)
+    texts = clip.tokenize(["Accident sur la route nationale", "Embouteillage au centre-ville"])
+    reference = _forward_probabilities({"clip_model": clip_model, "classifier": classifier}, images, texts)
+    mapped = _forward_probabilities({"clip_model": mapped_clip, "classifier": mapped_classifier}, images, texts)
+    max_diff = max(abs(a - b) for row_a, row_b in zip(reference, mapped) for a, b in zip(row_a, row_b))
+    if max_diff > 1e-6:
+        raise ValueError(f"Converted checkpoint diverges from the original (max probability diff {max_diff})")
+
+    return {
+        "output_path": output_path,
+        "size_mb": round(os.path.getsize(output_path) / (1024 * 1024), 1),
+        "torch_load_ms": torch_load_ms,
+        "mmap_load_ms": mmap_load_ms,
+        "max_probability_diff": max_diff,
+    }
+
+
+def _serialized_size_mb(module):
+    buffer = BytesIO()
+    torch.save(module.state_dict(), buffer)
+    return round(buffer.tell() / (1024 * 1024), 1)
+
+
+def _label_to_int(value):
+    normalized = str(value).strip().lower()
+    if normalized in ("1", "spam", "fake", "true"):
+        return 1
+    if normalized in ("0", "real", "legit", "false"):
+        return 0
+    return None
+
+
+def _read_labeled_reports(path, limit=None):
+    """Rows of ``{text, image_path|image_url, label}`` from a .csv or .jsonl file."""
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(fh))
+        else:
+            rows = [json.loads(line) for line in fh if line.strip()]
+    reports = []
+    for row in rows:
+        text = str(row.get("text") or "").strip()
+        if not text or not (row.get("image_path") or row.get("image_url")):
+            continue
+        reports.append(
+            {
+                "text": text,
+                "image_path": row.get("image_path") or None,
+                "image_url": row.get("image_url") or None,
+                "label": _label_to_int(row.get("label", "")),
+            }
+        )
+        if limit and len(reports) >= limit:
+            break
+    return reports
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))]
+
+
+def quantization_parity_report(labeled_path, model_path=None, threshold_percent=None, limit=None):
+    """Score a labeled held-out set with float32 and int8 models and compare them.
+
+    Reports spam-score deltas (percentage points), label flips at the
+    threshold, accuracy of each mode against the labels, per-report
+    encode+classify latency (batch 1) and serialized weight size.
+    """
+    resolved_path = _resolve_model_path(model_path)
+    threshold = _normalize_percent(
+        threshold_percent or os.getenv("REPORT_SPAM_THRESHOLD"),
+        DEFAULT_THRESHOLD_PERCENT,
+    )
+    reports = _read_labeled_reports(labeled_path, limit)
+    if not reports:
+        raise ValueError(f"No labeled reports with text and an image in {labeled_path}")
+
+    modes = {}
+    inputs = None
+    for mode in ("none", "int8"):
+        bundle = _load_model_bundle(resolved_path, quantize=mode)
+        if inputs is None:
+            inputs = [
+                (
+                    bundle["preprocess"](_load_image(report["image_url"], report["image_path"])).unsqueeze(0),
+                    clip.tokenize([report["text"]], truncate=True),
+                )
+                for report in reports
+            ]
+        _forward_probabilities(bundle, *inputs[0])  # warm-up
+        scores = []
+        latencies = []
+        for image_batch, text_batch in inputs:
+            started_at = time.perf_counter()
+            probabilities = _forward_probabilities(bundle, image_batch, text_batch)[0]
+            latencies.append((time.perf_counter() - started_at) * 1000.0)
+            scores.append(_normalize_percent(probabilities[1], 0.0))
+        labeled = [(score, report["label"]) for score, report in zip(scores, reports) if report["label"] is not None]
+        modes[mode] = {
+            "scores": scores,
+            "latency_ms_mean": round(sum(latencies) / len(latencies), 2),
+            "latency_ms_p95": round(_percentile(latencies, 95), 2),
+            "weights_mb": _serialized_size_mb(bundle["clip_model"]) + _serialized_size_mb(bundle["classifier"]),
+            "accuracy": round(
+                sum(int(score >= threshold) == label for score, label in labeled) / len(labeled), 4
+            )
+            if labeled
+            else None,
+        }
+
+    deltas = [abs(a - b) for a, b in zip(modes["none"]["scores"], modes["int8"]["scores"])]
+    flips = sum((a >= threshold) != (b >= threshold) for a, b in zip(modes["none"]["scores"], modes["int8"]["scores"]))
+    return {
+        "reports": len(reports),
+        "labeled": sum(report["label"] is not None for report in reports),
+        "threshold": threshold,
+        "spam_score_delta": {
+            "mean": round(sum(deltas) / len(deltas), 4),
+            "p95": round(_percentile(deltas, 95), 4),
+            "max": round(max(deltas), 4),
+        },
+        "label_flips": flips,
+        "label_flip_rate": round(flips / len(reports), 4),
+        "float32": {key: value for key, value in modes["none"].items() if key != "scores"},
+        "int8": {key: value for key, value in modes["int8"].items() if key != "scores"},
+        "int8_speedup": round(modes["none"]["latency_ms_mean"] / modes["int8"]["latency_ms_mean"], 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched CLIP spam classification")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--batch-sizes", default="1,4,8,16,32")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--parity",
+        metavar="LABELED_FILE",
+        default=None,
+        help="Compare float32 and int8 on a labeled .csv/.jsonl (text, image_path|image_url, label) instead",
+    )
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument(
+        "--convert",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="OUTPUT",
+        help=f"Write the mmap-loadable checkpoint (default: <checkpoint>{CONVERTED_SUFFIX}) instead",
+    )
+    args = parser.parse_args()
+
+    if args.convert is not None:
+        print(json.dumps(convert_checkpoint(args.model_path, args.convert or None), indent=2))
+        raise SystemExit(0)
+
+    if args.parity:
+        print(json.dumps(quantization_parity_report(args.parity, args.model_path, limit=args.limit), indent=2))
+        raise SystemExit(0)
+
+    sizes = tuple(int(size) for size in args.batch_sizes.split(",") if size.strip())
+    print(f"torch {torch.__version__}, {torch.get_num_threads()} intra-op threads")
+    for row in benchmark_batching(args.model_path, sizes, args.rounds):
+        print(
+            f"batch {row['batch_size']:>3}: {row['items_per_second']:>8.2f} items/s "
+            f"({row['ms_per_batch']} ms/batch, x{row['speedup']})"
+        )
@@ -13,6 +13,13 @@ everything. Instead it combines:
 The runtime entry point is :func:`validate_report`. Training lives in
 ``train_report_validator.py``.
 
+The trainer also exports the text classifier as a compiled scorer
+(``report_validator_model.npz``: vocabulary, IDF weights and per-class
+coefficients). When it is present and not older than the joblib,
+:class:`CompiledTextScorer` scores texts in NumPy without unpickling the
+scikit-learn pipeline. ``REPORT_VALIDATOR_BACKEND`` forces ``compiled`` or
+``sklearn`` (default ``auto``).
+
 All scores returned here are decimal probabilities in ``[0, 1]``. The frontend
 is responsible for converting to percentages for display.
 """
@@ -21,10 +28,14 @@ from __future__ import annotations
 
 import json
 import os
+import re
+import time
+import unicodedata
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import joblib
+import numpy as np
 
 LABELS = ("real", "spam", "out_of_context", "invalid_location", "suspicious")
 
@@ -38,9 +49,27 @@ _BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 DEFAULT_MODEL_PATH = os.path.join(_BASE_DIR, "report_validator_model.joblib")
 DEFAULT_METADATA_PATH = os.path.join(_BASE_DIR, "report_validator_metadata.json")
 
+COMPILED_SCORER_SUFFIX = ".npz"
+COMPILED_SCORER_FORMAT_VERSION = 1
+VALIDATOR_BACKENDS = ("auto", "compiled", "sklearn")
+
+# The artifact only changes on retrain, so its mtime is re-checked at most once
+# per REPORT_VALIDATOR_RELOAD_SECONDS instead of on every request.
+DEFAULT_RELOAD_INTERVAL_SECONDS = 30.0
+
 _MODEL_CACHE: Dict[str, Any] = {}
 
 
+def _reload_interval_seconds() -> float:
+    try:
+        return max(
+            0.0,
+            float(os.getenv("REPORT_VALIDATOR_RELOAD_SECONDS", str(DEFAULT_RELOAD_INTERVAL_SECONDS))),
+        )
+    except ValueError:
+        return DEFAULT_RELOAD_INTERVAL_SECONDS
+
+
 def _resolve_model_path(path: Optional[str] = None) -> str:
     return os.path.abspath(path) if path else DEFAULT_MODEL_PATH
 
@@ -49,27 +78,216 @@ def _resolve_metadata_path(path: Optional[str] = None) -> str:
     return os.path.abspath(path) if path else DEFAULT_METADATA_PATH
 
 
-def load_validator(
-    model_path: Optional[str] = None,
-    metadata_path: Optional[str] = None,
-) -> Dict[str, Any]:
-    """Load the trained validator pipeline + metadata. Cached by mtime."""
+def compiled_scorer_path(model_path: str) -> str:
+    """Path of the compiled scorer exported next to a joblib pipeline."""
+
+    return os.path.splitext(model_path)[0] + COMPILED_SCORER_SUFFIX
 
-    resolved_model = _resolve_model_path(model_path)
-    resolved_meta = _resolve_metadata_path(metadata_path)
 
+def _validator_backend() -> str:
+    backend = os.getenv("REPORT_VALIDATOR_BACKEND", "auto").strip().lower()
+    return backend if backend in VALIDATOR_BACKENDS else "auto"
+
+
+def _strip_accents_unicode(text: str) -> str:
+    # Same transform as sklearn's strip_accents="unicode".
+    try:
+        text.encode("ASCII", errors="strict")
+        return text
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize("NFKD", text)
+        return "".join([char for char in normalized if not unicodedata.combining(char)])
+
+
+class CompiledTextScorer:
+    """NumPy re-implementation of the TF-IDF + LogisticRegression pipeline.
+
+    Reproduces ``pipeline.predict_proba`` (word n-grams, lowercasing, unicode
+    accent stripping, sublinear TF, IDF, row normalization, then softmax or
+    one-vs-rest logistic probabilities) from the arrays written by
+    ``train_report_validator.export_compiled_scorer``.
+    """
+
+    def __init__(
+        self,
+        *,
+        terms: Sequence[str],
+        idf: np.ndarray,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        config: Mapping[str, Any],
+    ) -> None:
+        self.classes_ = np.asarray(config["classes"])
+        self.config = dict(config)
+        self._vocabulary = {term: index for index, term in enumerate(terms)}
+        self._idf = np.asarray(idf, dtype=np.float64)
+        self._coef = np.asarray(coef, dtype=np.float64)  # (n_terms, n_outputs)
+        self._intercept = np.asarray(intercept, dtype=np.float64)
+        self._token_re = re.compile(config["token_pattern"])
+        self._ngram_range = tuple(int(n) for n in config["ngram_range"])
+        self._lowercase = bool(config["lowercase"])
+        self._strip_accents = config.get("strip_accents") == "unicode"
+        self._binary = bool(config.get("binary", False))
+        self._sublinear_tf = bool(config["sublinear_tf"])
+        self._norm = config.get("norm")
+        self._ovr = bool(config["ovr"])
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledTextScorer":
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(data["config"].tobytes().decode("utf-8"))
+            if config.get("format_version") != COMPILED_SCORER_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported compiled scorer format {config.get('format_version')!r} in {path}"
+                )
+            terms_blob = data["terms"].tobytes().decode("utf-8")
+            return cls(
+                terms=terms_blob.split("\n") if terms_blob else [],
+                idf=data["idf"],
+                coef=data["coef"],
+                intercept=data["intercept"],
+                config=config,
+            )
+
+    @property
+    def n_terms(self) -> int:
+        return len(self._vocabulary)
+
+    def analyze(self, text: str) -> List[str]:
+        """Word n-grams exactly as the fitted TfidfVectorizer builds them."""
+
+        if self._lowercase:
+            text = text.lower()
+        if self._strip_accents:
+            text = _strip_accents_unicode(text)
+        tokens = self._token_re.findall(text)
+        min_n, max_n = self._ngram_range
+        if max_n == 1:
+            return tokens
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            for start in range(len(tokens) - n + 1):
+                ngrams.append(" ".join(tokens[start : start + n]))
+        return ngrams
+
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """TF-IDF rows in CSR form: ``(row_ptr, columns, values)``."""
+
+        vocabulary = self._vocabulary
+        columns: List[int] = []
+        counts: List[int] = []
+        row_ptr = [0]
+        for text in texts:
+            row_counts: Dict[int, int] = {}
+            for term in self.analyze(text):
+                column = vocabulary.get(term)
+                if column is not None:
+                    row_counts[column] = row_counts.get(column, 0) + 1
+            for column in sorted(row_counts):
+                columns.append(column)
+                counts.append(row_counts[column])
+            row_ptr.append(len(columns))
+
+        column_array = np.asarray(columns, dtype=np.intp)
+        values = np.ones(len(counts)) if self._binary else np.asarray(counts, dtype=np.float64)
+        if self._sublinear_tf:
+            np.log(values, out=values)
+            values += 1.0
+        values *= self._idf[column_array]
+
+        lengths = np.diff(row_ptr)
+        if self._norm in ("l1", "l2") and len(values):
+            starts = np.asarray(row_ptr[:-1])[lengths > 0]
+            if self._norm == "l2":
+                norms = np.sqrt(np.add.reduceat(values * values, starts))
+            else:
+                norms = np.add.reduceat(np.abs(values), starts)
+            norms[norms == 0.0] = 1.0
+            values /= np.repeat(norms, lengths[lengths > 0])
+        return np.asarray(row_ptr), column_array, values
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        row_ptr, columns, values = self.transform(texts)
+        scores = np.tile(self._intercept, (len(texts), 1))
+        if len(values):
+            lengths = np.diff(row_ptr)
+            scored = lengths > 0
+            # One gather of the touched coefficient rows, summed per document.
+            contributions = values[:, None] * self._coef[columns]
+            scores[scored] += np.add.reduceat(contributions, row_ptr[:-1][scored], axis=0)
+        return scores
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        decision = self.decision_function(texts)
+        if self._ovr:
+            prob = 1.0 / (1.0 + np.exp(-decision))
+            if prob.shape[1] == 1:
+                return np.hstack([1.0 - prob, prob])
+            return prob / prob.sum(axis=1, keepdims=True)
+        if decision.shape[1] == 1:
+            decision = np.hstack([-decision, decision])
+        decision = decision - decision.max(axis=1, keepdims=True)
+        np.exp(decision, out=decision)
+        return decision / decision.sum(axis=1, keepdims=True)
+
+
+def _artifact_to_load(resolved_model: str) -> Tuple[str, str]:
+    """Pick ``(backend, path)``: the compiled scorer unless it is missing or stale."""
+
+    backend = _validator_backend()
+    compiled_path = compiled_scorer_path(resolved_model)
+    if backend != "sklearn" and os.path.exists(compiled_path):
+        if (
+            backend == "compiled"
+            or not os.path.exists(resolved_model)
+            or os.path.getmtime(compiled_path) >= os.path.getmtime(resolved_model)
+        ):
+            return "compiled", compiled_path
+        print(
+            f"[report-validator] compiled scorer {compiled_path} is older than "
+            f"{resolved_model}; using the sklearn pipeline"
+        )
+    if backend == "compiled":
+        raise FileNotFoundError(
+            f"Compiled report validator not found at {compiled_path}. "
+            "Run `python train_report_validator.py --compile-only` first."
+        )
     if not os.path.exists(resolved_model):
         raise FileNotFoundError(
             f"Report validator model not found at {resolved_model}. "
             "Run `python train_report_validator.py` first."
         )
+    return "sklearn", resolved_model
+
+
+def load_validator(
+    model_path: Optional[str] = None,
+    metadata_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Load the trained validator (compiled scorer or pipeline) + metadata.
 
-    mtime = os.path.getmtime(resolved_model)
+    Cached per model path; the artifact mtime is re-checked (and the model
+    reloaded if it changed) at most once per reload interval.
+    """
+
+    resolved_model = _resolve_model_path(model_path)
+    resolved_meta = _resolve_metadata_path(metadata_path)
+
+    now = time.monotonic()
     cached = _MODEL_CACHE.get(resolved_model)
-    if cached and cached.get("mtime") == mtime:
+    if cached and now - cached["checked_at"] < _reload_interval_seconds():
+        return cached["bundle"]
+
+    backend, artifact_path = _artifact_to_load(resolved_model)
+    signature = (backend, artifact_path, os.path.getmtime(artifact_path))
+    if cached and cached.get("signature") == signature:
+        cached["checked_at"] = now
         return cached["bundle"]
 
-    pipeline = joblib.load(resolved_model)
+    if backend == "compiled":
+        pipeline = CompiledTextScorer.load(artifact_path)
+    else:
+        pipeline = joblib.load(artifact_path)
 
     metadata: Dict[str, Any] = {}
     if os.path.exists(resolved_meta):
@@ -78,12 +296,13 @@ def load_validator(
 
     bundle = {
         "pipeline": pipeline,
+        "backend": backend,
         "metadata": metadata,
         "labels": tuple(metadata.get("labels") or LABELS),
         "model_name": metadata.get("model_name") or DEFAULT_MODEL_NAME,
         "model_version": metadata.get("model_version") or DEFAULT_MODEL_VERSION,
     }
-    _MODEL_CACHE[resolved_model] = {"mtime": mtime, "bundle": bundle}
+    _MODEL_CACHE[resolved_model] = {"signature": signature, "checked_at": now, "bundle": bundle}
     return bundle
 
 
@@ -127,6 +346,53 @@ def _coords_valid(lat: Any, lon: Any) -> bool:
     return True
 
 
+def _empty_text_result(labels: Sequence[str]) -> Dict[str, Any]:
+    # Empty text is suspicious by definition; surface that to the fusion stage.
+    return {
+        "text": "",
+        "probabilities": {label: 0.0 for label in labels},
+        "top_label": "suspicious" if "suspicious" in labels else labels[0],
+        "top_score": 0.0,
+        "is_empty": True,
+    }
+
+
+def predict_texts(bundle: Dict[str, Any], texts: Sequence[str]) -> List[Dict[str, Any]]:
+    """Run the text classifier over many texts (see :func:`build_text_input`).
+
+    All non-empty texts go through one ``predict_proba`` call: a single sparse
+    TF-IDF transform and one matrix product against the classifier weights.
+    """
+
+    pipeline = bundle["pipeline"]
+    labels = list(bundle.get("labels") or LABELS)
+    results: List[Dict[str, Any]] = [_empty_text_result(labels) for _ in texts]
+
+    scored_rows = [index for index, text in enumerate(texts) if text]
+    if not scored_rows:
+        return results
+
+    probas = pipeline.predict_proba([texts[index] for index in scored_rows])
+    pipeline_classes = [str(label) for label in getattr(pipeline, "classes_", labels)]
+    for row, index in enumerate(scored_rows):
+        proba_map = {
+            label: float(probas[row, idx]) for idx, label in enumerate(pipeline_classes)
+        }
+        # Keep ordering in metadata even if classes_ is missing some labels.
+        for label in labels:
+            proba_map.setdefault(label, 0.0)
+
+        top_label = max(proba_map.items(), key=lambda item: item[1])
+        results[index] = {
+            "text": texts[index],
+            "probabilities": proba_map,
+            "top_label": top_label[0],
+            "top_score": float(top_label[1]),
+            "is_empty": False,
+        }
+    return results
+
+
 def predict_text(
     bundle: Dict[str, Any],
     title: Any,
@@ -135,37 +401,7 @@ def predict_text(
 ) -> Dict[str, Any]:
     """Run only the text classifier and return per-label probabilities."""
 
-    pipeline = bundle["pipeline"]
-    labels = list(bundle.get("labels") or LABELS)
-    text = build_text_input(title, description, incident_type)
-
-    if not text:
-        # Empty text is suspicious by definition; surface that to the fusion stage.
-        return {
-            "text": "",
-            "probabilities": {label: 0.0 for label in labels},
-            "top_label": "suspicious" if "suspicious" in labels else labels[0],
-            "top_score": 0.0,
-            "is_empty": True,
-        }
-
-    probas = pipeline.predict_proba([text])[0]
-    pipeline_classes = list(getattr(pipeline, "classes_", labels))
-    proba_map = {
-        str(label): float(probas[idx]) for idx, label in enumerate(pipeline_classes)
-    }
-    # Keep ordering in metadata even if classes_ is missing some labels.
-    for label in labels:
-        proba_map.setdefault(label, 0.0)
-
-    top_label = max(proba_map.items(), key=lambda item: item[1])
-    return {
-        "text": text,
-        "probabilities": proba_map,
-        "top_label": top_label[0],
-        "top_score": float(top_label[1]),
-        "is_empty": False,
-    }
+    return predict_texts(bundle, [build_text_input(title, description, incident_type)])[0]
 
 
 def fuse(
@@ -305,6 +541,65 @@ def fuse(
     }
 
 
+def _validation_payload(
+    bundle: Dict[str, Any], fusion: Dict[str, Any], predicted_at: str
+) -> Dict[str, Any]:
+    return {
+        "model_name": bundle["model_name"],
+        "model_version": bundle["model_version"],
+        "predicted_label": fusion["label"],
+        "label": fusion["label"],
+        "spam_score": fusion["spam_score"],
+        "real_score": fusion["real_score"],
+        "confidence_score": fusion["confidence_score"],
+        "reasons": fusion["reasons"],
+        "raw_probabilities": fusion["raw_probabilities"],
+        "context": fusion["context"],
+        "inference_status": "completed",
+        "predicted_at": predicted_at,
+    }
+
+
+def validate_reports(
+    reports: Sequence[Mapping[str, Any]],
+    *,
+    model_path: Optional[str] = None,
+    metadata_path: Optional[str] = None,
+    near_road_strict_m: float = DEFAULT_NEAR_ROAD_STRICT_M,
+    near_road_relaxed_m: float = DEFAULT_NEAR_ROAD_RELAXED_M,
+) -> List[Dict[str, Any]]:
+    """Batch :func:`validate_report`: one text-classifier pass, fusion per report.
+
+    Each report mapping uses the :func:`validate_report` keyword names
+    (``title``, ``description``, ``incident_type``, ``lat``, ``lon``,
+    ``near_road``, ``distance_to_road_m``, ``has_image``, ``image_related``).
+    """
+
+    bundle = load_validator(model_path=model_path, metadata_path=metadata_path)
+    texts = [
+        build_text_input(report.get("title"), report.get("description"), report.get("incident_type"))
+        for report in reports
+    ]
+    text_results = predict_texts(bundle, texts)
+    predicted_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    payloads = []
+    for report, text_result in zip(reports, text_results):
+        fusion = fuse(
+            text_result=text_result,
+            lat=report.get("lat"),
+            lon=report.get("lon"),
+            near_road=report.get("near_road"),
+            distance_to_road_m=report.get("distance_to_road_m"),
+            has_image=bool(report.get("has_image", False)),
+            image_related=report.get("image_related"),
+            near_road_strict_m=near_road_strict_m,
+            near_road_relaxed_m=near_road_relaxed_m,
+        )
+        payloads.append(_validation_payload(bundle, fusion, predicted_at))
+    return payloads
+
+
 def validate_report(
     *,
     title: Any,
@@ -323,34 +618,24 @@ def validate_report(
 ) -> Dict[str, Any]:
     """End-to-end report validation. Returns the SIARA-standard payload."""
 
-    bundle = load_validator(model_path=model_path, metadata_path=metadata_path)
-    text_result = predict_text(bundle, title, description, incident_type)
-    fusion = fuse(
-        text_result=text_result,
-        lat=lat,
-        lon=lon,
-        near_road=near_road,
-        distance_to_road_m=distance_to_road_m,
-        has_image=has_image,
-        image_related=image_related,
+    report = {
+        "title": title,
+        "description": description,
+        "incident_type": incident_type,
+        "lat": lat,
+        "lon": lon,
+        "near_road": near_road,
+        "distance_to_road_m": distance_to_road_m,
+        "has_image": has_image,
+        "image_related": image_related,
+    }
+    return validate_reports(
+        [report],
+        model_path=model_path,
+        metadata_path=metadata_path,
         near_road_strict_m=near_road_strict_m,
         near_road_relaxed_m=near_road_relaxed_m,
-    )
-
-    return {
-        "model_name": bundle["model_name"],
-        "model_version": bundle["model_version"],
-        "predicted_label": fusion["label"],
-        "label": fusion["label"],
-        "spam_score": fusion["spam_score"],
-        "real_score": fusion["real_score"],
-        "confidence_score": fusion["confidence_score"],
-        "reasons": fusion["reasons"],
-        "raw_probabilities": fusion["raw_probabilities"],
-        "context": fusion["context"],
-        "inference_status": "completed",
-        "predicted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-    }
+    )[0]
 
 
 __all__ = (
@@ -361,9 +646,14 @@ __all__ = (
     "DEFAULT_MODEL_VERSION",
     "DEFAULT_MODEL_PATH",
     "DEFAULT_METADATA_PATH",
+    "COMPILED_SCORER_FORMAT_VERSION",
+    "CompiledTextScorer",
     "build_text_input",
+    "compiled_scorer_path",
     "load_validator",
     "predict_text",
+    "predict_texts",
     "fuse",
     "validate_report",
+    "validate_reports",
 )
@@ -12,6 +12,20 @@ languages SIARA users actually write in.
 
 Usage:
     python train_report_validator.py [--output report_validator_model.joblib]
+    python train_report_validator.py --compile-only   # re-export the .npz scorer
+    python train_report_validator.py --stream labels.csv [more.ndjson.gz ...] [--warm-start]
+
+``--stream`` trains on moderator-labelled exports instead of the seed list:
+rows are read in chunks and fed to a stateless HashingVectorizer and an
+SGD logistic model via ``partial_fit``, so memory stays flat however many rows
+the exports hold. ``--warm-start`` continues from the previous streamed model
+(keeping its ``--n-features``/``--alpha``; conflicting values are rejected).
+Each export row needs ``label`` plus ``title``/``description``/``incident_type``
+(or a ready ``text`` column).
+
+Next to the joblib pipeline the script writes the compiled scorer
+(``report_validator_model.npz``) that ``report_validator.CompiledTextScorer``
+loads, and checks that it reproduces ``predict_proba`` on the seed texts.
 
 Run from this directory or anywhere - paths default to the local files.
 """
@@ -19,13 +33,19 @@ Run from this directory or anywhere - paths default to the local files.
 from __future__ import annotations
 
 import argparse
+import csv
+import gzip
+import itertools
 import json
 import os
+import sys
+import time
 from datetime import datetime, timezone
-from typing import Iterable, List, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
@@ -33,6 +53,8 @@ from sklearn.pipeline import Pipeline
 import joblib
 
 from report_validator import (
+    COMPILED_SCORER_FORMAT_VERSION,
+    CompiledTextScorer,
     DEFAULT_MODEL_NAME,
     DEFAULT_MODEL_PATH,
     DEFAULT_METADATA_PATH,
@@ -41,6 +63,7 @@ from report_validator import (
     DEFAULT_NEAR_ROAD_STRICT_M,
     LABELS,
     build_text_input,
+    compiled_scorer_path,
 )
 
 
@@ -211,6 +234,341 @@ def build_pipeline() -> Pipeline:
     )
 
 
+# Largest |predict_proba| difference accepted between pipeline and compiled scorer.
+COMPILED_PARITY_TOLERANCE = 1e-9
+
+
+def compile_text_scorer(pipeline: Pipeline) -> Dict[str, np.ndarray]:
+    """Flatten the fitted TF-IDF + LogisticRegression pipeline into plain arrays."""
+
+    if "tfidf" not in pipeline.named_steps:
+        raise ValueError("Only TF-IDF pipelines can be compiled")
+    tfidf = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+    if tfidf.analyzer != "word" or tfidf.tokenizer is not None or tfidf.preprocessor is not None:
+        raise ValueError("Only the default word analyzer can be compiled")
+    if tfidf.stop_words is not None:
+        raise ValueError("Stop-word lists are not supported by the compiled scorer")
+    if tfidf.strip_accents not in (None, "unicode"):
+        raise ValueError(f"Unsupported strip_accents={tfidf.strip_accents!r}")
+
+    vocabulary = tfidf.vocabulary_
+    terms = [""] * len(vocabulary)
+    for term, column in vocabulary.items():
+        terms[column] = term
+    if any("\n" in term for term in terms):
+        raise ValueError("Vocabulary terms must not contain newlines")
+
+    # Same rule LogisticRegression.predict_proba uses to pick OvR vs softmax.
+    multi_class = getattr(clf, "multi_class", "auto")
+    ovr = multi_class in ("ovr", "warn") or (
+        multi_class in ("auto", "deprecated")
+        and (len(clf.classes_) <= 2 or clf.solver == "liblinear")
+    )
+    config = {
+        "format_version": COMPILED_SCORER_FORMAT_VERSION,
+        "classes": [str(label) for label in clf.classes_],
+        "token_pattern": tfidf.token_pattern,
+        "ngram_range": list(tfidf.ngram_range),
+        "lowercase": bool(tfidf.lowercase),
+        "strip_accents": tfidf.strip_accents,
+        "binary": bool(tfidf.binary),
+        "sublinear_tf": bool(tfidf.sublinear_tf),
+        "norm": tfidf.norm,
+        "ovr": bool(ovr),
+    }
+    idf = tfidf.idf_ if tfidf.use_idf else np.ones(len(terms))
+    return {
+        "config": np.frombuffer(json.dumps(config).encode("utf-8"), dtype=np.uint8),
+        "terms": np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8),
+        "idf": np.asarray(idf, dtype=np.float64),
+        "coef": np.ascontiguousarray(np.asarray(clf.coef_, dtype=np.float64).T),
+        "intercept": np.asarray(clf.intercept_, dtype=np.float64),
+    }
+
+
+def export_compiled_scorer(
+    pipeline: Pipeline, path: str, parity_texts: Sequence[str]
+) -> Dict[str, Any]:
+    """Write the compiled scorer to ``path`` and check it against the pipeline."""
+
+    arrays = compile_text_scorer(pipeline)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        np.savez(fh, **arrays)
+
+    scorer = CompiledTextScorer.load(tmp_path)
+    expected = pipeline.predict_proba(list(parity_texts))
+    actual = scorer.predict_proba(list(parity_texts))
+    max_diff = float(np.abs(expected - actual).max()) if len(parity_texts) else 0.0
+    if list(scorer.classes_) != [str(label) for label in pipeline.classes_] or max_diff > COMPILED_PARITY_TOLERANCE:
+        os.remove(tmp_path)
+        raise ValueError(f"Compiled scorer does not match the pipeline (max diff {max_diff:.3g})")
+    os.replace(tmp_path, path)
+
+    summary = {
+        "path": os.path.basename(path),
+        "format_version": COMPILED_SCORER_FORMAT_VERSION,
+        "terms": scorer.n_terms,
+        "bytes": os.path.getsize(path),
+        "parity_texts": len(parity_texts),
+        "max_abs_proba_diff": max_diff,
+    }
+    print(
+        f"Saved compiled scorer: {path} ({summary['terms']} terms, {summary['bytes']} bytes, "
+        f"max |proba diff| {max_diff:.3g})"
+    )
+    return summary
+
+
+def compile_existing(output_path: str, metadata_path: str) -> None:
+    """Export the compiled scorer for an already trained joblib pipeline."""
+
+    pipeline = joblib.load(output_path)
+    texts, _ = build_dataset(SEED_ROWS)
+    summary = export_compiled_scorer(pipeline, compiled_scorer_path(output_path), texts)
+    if os.path.exists(metadata_path):
+        with open(metadata_path, "r", encoding="utf-8") as fh:
+            metadata = json.load(fh)
+        metadata["compiled_scorer"] = summary
+        with open(metadata_path, "w", encoding="utf-8") as fh:
+            json.dump(metadata, fh, indent=2, ensure_ascii=False)
+
+
+# --- Streaming training ------------------------------------------------------
+DEFAULT_STREAM_CHUNK_SIZE = 10000
+DEFAULT_HASH_FEATURES = 1 << 20
+DEFAULT_SGD_ALPHA = 1e-6
+
+
+def build_streaming_pipeline(n_features: int = DEFAULT_HASH_FEATURES, alpha: float = DEFAULT_SGD_ALPHA) -> Pipeline:
+    """Stateless hashing features + logistic SGD; trainable chunk by chunk."""
+
+    return Pipeline(
+        [
+            (
+                "hashing",
+                HashingVectorizer(
+                    analyzer="word",
+                    ngram_range=(1, 2),
+                    n_features=n_features,
+                    alternate_sign=False,
+                    norm="l2",
+                    strip_accents="unicode",
+                    lowercase=True,
+                ),
+            ),
+            (
+                "clf",
+                SGDClassifier(
+                    loss="log_loss",
+                    penalty="l2",
+                    alpha=alpha,
+                    random_state=42,
+                ),
+            ),
+        ]
+    )
+
+
+def _open_export(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_labeled_rows(paths: Sequence[str], counters: Dict[str, int]) -> Iterator[Tuple[str, str]]:
+    """Yield ``(text, label)`` from CSV or NDJSON/JSONL exports, one row at a time."""
+
+    for path in paths:
+        is_ndjson = path.endswith((".ndjson", ".jsonl", ".ndjson.gz", ".jsonl.gz"))
+        with _open_export(path) as fh:
+            rows: Iterable[Dict[str, Any]]
+            if is_ndjson:
+                rows = (json.loads(line) for line in fh if line.strip())
+            else:
+                rows = csv.DictReader(fh)
+            for row in rows:
+                label = str(row.get("label") or "").strip()
+                text = str(row.get("text") or "").strip() or build_text_input(
+                    row.get("title"), row.get("description"), row.get("incident_type")
+                )
+                if not text or label not in LABELS:
+                    counters["skipped"] += 1
+                    continue
+                yield text, label
+
+
+def _iter_chunks(rows: Iterable[Tuple[str, str]], size: int) -> Iterator[Tuple[List[str], List[str]]]:
+    texts: List[str] = []
+    labels: List[str] = []
+    for text, label in rows:
+        texts.append(text)
+        labels.append(label)
+        if len(texts) >= size:
+            yield texts, labels
+            texts, labels = [], []
+    if texts:
+        yield texts, labels
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def train_streaming(args: argparse.Namespace) -> None:
+    output_path = os.path.abspath(args.output)
+    metadata_path = os.path.abspath(args.metadata)
+    warm_start_path = os.path.abspath(args.warm_start) if args.warm_start else None
+
+    previous_metadata: Dict[str, Any] = {}
+    if warm_start_path:
+        pipeline = joblib.load(warm_start_path)
+        if "hashing" not in getattr(pipeline, "named_steps", {}):
+            raise SystemExit(
+                f"{warm_start_path} is not a streamed (hashing) model; "
+                "run --stream once without --warm-start first."
+            )
+        if os.path.exists(metadata_path):
+            with open(metadata_path, "r", encoding="utf-8") as fh:
+                previous_metadata = json.load(fh)
+    else:
+        pipeline = build_streaming_pipeline(
+            args.n_features if args.n_features is not None else DEFAULT_HASH_FEATURES,
+            args.alpha if args.alpha is not None else DEFAULT_SGD_ALPHA,
+        )
+    vectorizer = pipeline.named_steps["hashing"]
+    clf = pipeline.named_steps["clf"]
+    if warm_start_path:
+        # The hash width and regularisation are fixed by the loaded model:
+        # refuse a conflicting request rather than silently ignoring it.
+        conflicts = [
+            f"{flag} {requested} (model has {loaded})"
+            for flag, requested, loaded in (
+                ("--n-features", args.n_features, int(vectorizer.n_features)),
+                ("--alpha", args.alpha, float(clf.alpha)),
+            )
+            if requested is not None and requested != loaded
+        ]
+        if conflicts:
+            raise SystemExit(
+                f"--warm-start keeps the settings of {warm_start_path}; conflicting "
+                + ", ".join(conflicts)
+                + ". Drop them or train a fresh model without --warm-start."
+            )
+        print(
+            f"Warm start from {warm_start_path}: n_features={int(vectorizer.n_features)}, "
+            f"alpha={float(clf.alpha)}"
+        )
+    classes = np.array(LABELS)
+
+    # partial_fit cannot take class_weight="balanced"; weight rows by the
+    # running label frequencies instead (cumulative across warm starts).
+    label_counts = {label: 0 for label in LABELS}
+    label_counts.update((previous_metadata.get("streaming") or {}).get("label_counts") or {})
+    counters = {"skipped": 0}
+    correct = 0
+    evaluated = 0
+    rows_seen = 0
+    rng = np.random.default_rng(args.random_state)
+    started_at = time.perf_counter()
+
+    for epoch in range(args.epochs):
+        rows: Iterable[Tuple[str, str]] = iter_labeled_rows(args.stream, counters)
+        if epoch == 0 and not warm_start_path:
+            # Seed rows anchor every label before the first export chunk.
+            seed_texts, seed_labels = build_dataset(SEED_ROWS)
+            rows = itertools.chain(zip(seed_texts, seed_labels), rows)
+        for chunk_texts, chunk_labels in _iter_chunks(rows, args.chunk_size):
+            order = rng.permutation(len(chunk_texts))
+            x = vectorizer.transform([chunk_texts[i] for i in order])
+            y = np.array([chunk_labels[i] for i in order])
+
+            # Progressive validation: score each chunk before learning from it.
+            if epoch == 0 and hasattr(clf, "coef_"):
+                correct += int((clf.predict(x) == y).sum())
+                evaluated += len(y)
+
+            for label in y:
+                label_counts[label] += 1
+            total = sum(label_counts.values())
+            weights = np.array([total / (len(LABELS) * label_counts[label]) for label in y])
+            clf.partial_fit(x, y, classes=classes, sample_weight=weights)
+            rows_seen += len(y)
+            print(
+                f"epoch {epoch + 1}/{args.epochs}: {rows_seen} rows, "
+                f"{rows_seen / max(time.perf_counter() - started_at, 1e-9):.0f} rows/s, "
+                f"peak RSS {_peak_rss_mb()} MB"
+            )
+
+    if rows_seen == 0:
+        raise SystemExit("No labelled rows found in the stream inputs.")
+
+    elapsed = time.perf_counter() - started_at
+    progressive_accuracy = round(correct / evaluated, 4) if evaluated else None
+    peak_rss_mb = _peak_rss_mb()
+    print(
+        f"Trained on {rows_seen} rows ({counters['skipped']} skipped) in {elapsed:.1f} s; "
+        f"progressive accuracy {progressive_accuracy}; peak RSS {peak_rss_mb} MB"
+    )
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    joblib.dump(pipeline, output_path)
+    # The compiled scorer only covers TF-IDF pipelines; a leftover one would
+    # otherwise shadow the new model.
+    stale_compiled = compiled_scorer_path(output_path)
+    if os.path.exists(stale_compiled):
+        os.remove(stale_compiled)
+        print(f"Removed stale compiled scorer: {stale_compiled}")
+
+    previous_streaming = previous_metadata.get("streaming") or {}
+    previous_examples = int(previous_metadata.get("training_examples") or 0) if warm_start_path else 0
+    previous_runs = int(previous_streaming.get("runs") or 0) if warm_start_path else 0
+    metadata = {
+        "model_name": DEFAULT_MODEL_NAME,
+        "model_version": DEFAULT_MODEL_VERSION,
+        "labels": list(LABELS),
+        "training_date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "training_mode": "streaming",
+        "random_state": args.random_state,
+        "training_examples": previous_examples + rows_seen,
+        "thresholds": {
+            "text_high_confidence": 0.65,
+            "near_road_strict_m": DEFAULT_NEAR_ROAD_STRICT_M,
+            "near_road_relaxed_m": DEFAULT_NEAR_ROAD_RELAXED_M,
+        },
+        "input_format": "title + ' ' + description + ' ' + incident_type",
+        "score_units": "decimal probabilities in [0, 1]",
+        "streaming": {
+            "sources": [os.path.basename(path) for path in args.stream],
+            "rows_this_run": rows_seen,
+            "rows_skipped": counters["skipped"],
+            "epochs": args.epochs,
+            "chunk_size": args.chunk_size,
+            "hash_features": int(vectorizer.n_features),
+            "alpha": float(clf.alpha),
+            "label_counts": label_counts,
+            "warm_started_from": os.path.basename(warm_start_path) if warm_start_path else None,
+            "runs": previous_runs + 1,
+            "progressive_accuracy": progressive_accuracy,
+            "progressive_rows": evaluated,
+            "elapsed_seconds": round(elapsed, 2),
+            "peak_rss_mb": peak_rss_mb,
+        },
+    }
+    with open(metadata_path, "w", encoding="utf-8") as fh:
+        json.dump(metadata, fh, indent=2, ensure_ascii=False)
+
+    print(f"Saved model: {output_path}")
+    print(f"Saved metadata: {metadata_path}")
+
+
 def main(argv: Iterable[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Train SIARA report validator")
     parser.add_argument("--output", default=DEFAULT_MODEL_PATH, help="Output joblib path")
@@ -219,8 +577,41 @@ def main(argv: Iterable[str] | None = None) -> None:
     )
     parser.add_argument("--test-size", type=float, default=0.2)
     parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument(
+        "--compile-only",
+        action="store_true",
+        help="Only export the compiled scorer for the existing --output pipeline",
+    )
+    parser.add_argument(
+        "--stream",
+        nargs="+",
+        metavar="EXPORT",
+        help="Train incrementally from labelled CSV / NDJSON exports (optionally .gz)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_STREAM_CHUNK_SIZE)
+    parser.add_argument("--epochs", type=int, default=1)
+    # None = default for a fresh model; with --warm-start the loaded model's values apply.
+    parser.add_argument("--n-features", type=int, default=None, help=f"Hash width (default {DEFAULT_HASH_FEATURES})")
+    parser.add_argument("--alpha", type=float, default=None, help=f"SGD regularisation (default {DEFAULT_SGD_ALPHA})")
+    parser.add_argument(
+        "--warm-start",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="MODEL",
+        help="Continue training a previously streamed model (default: --output)",
+    )
     args = parser.parse_args(list(argv) if argv is not None else None)
 
+    if args.warm_start == "":
+        args.warm_start = args.output
+    if args.stream:
+        train_streaming(args)
+        return
+    if args.compile_only:
+        compile_existing(os.path.abspath(args.output), os.path.abspath(args.metadata))
+        return
+
     texts, labels = build_dataset(SEED_ROWS)
     if len(set(labels)) < len(LABELS):
         missing = sorted(set(LABELS) - set(labels))
@@ -255,6 +646,7 @@ def main(argv: Iterable[str] | None = None) -> None:
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     joblib.dump(pipeline, output_path)
+    compiled = export_compiled_scorer(pipeline, compiled_scorer_path(output_path), texts)
 
     metadata = {
         "model_name": DEFAULT_MODEL_NAME,
@@ -272,6 +664,7 @@ def main(argv: Iterable[str] | None = None) -> None:
         },
         "input_format": "title + ' ' + description + ' ' + incident_type",
         "score_units": "decimal probabilities in [0, 1]",
+        "compiled_scorer": compiled,
     }
     with open(metadata_path, "w", encoding="utf-8") as fh:
         json.dump(metadata, fh, indent=2, ensure_ascii=False)
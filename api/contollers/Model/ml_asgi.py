@@ -0,0 +1,246 @@
+"""ASGI deployment mode for the SIARA ML service.
+
+Under gunicorn every SSE explanation stream (/predict/stream,
+/quiz/explanation/stream, /quiz/explanation/jobs/<id>/stream) holds one of the
+``--threads`` for the whole LLM generation, up to
+OLLAMA_STREAM_READ_TIMEOUT_SECONDS. In this mode those routes run as
+coroutines on one event loop (httpx to Ollama), so hundreds of open streams
+cost sockets, not threads. The event protocol (status/chunk/done) is
+unchanged.
+
+Everything else is the unchanged Flask app, served through a2wsgi's thread
+pool. CPU-bound quiz scoring for /predict/stream runs on a small executor.
+
+Run (one process: the models are loaded once, as with gunicorn --workers 1):
+    uvicorn contollers.Model.ml_asgi:app --host 0.0.0.0 --port 8000
+
+Runtime configuration:
+- ML_ASGI_WSGI_THREADS=4 (threads serving the Flask routes)
+- ML_ASGI_SCORING_THREADS=2 (threads for /predict/stream quiz scoring)
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from a2wsgi import WSGIMiddleware
+
+from contollers.Model import ml_service
+from services.quiz_explainer import astream_quiz_explanation
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+WSGI_THREADS = _env_int("ML_ASGI_WSGI_THREADS", 4)
+SCORING_THREADS = _env_int("ML_ASGI_SCORING_THREADS", 2)
+JOB_STREAM_POLL_SECONDS = 0.25
+JOB_STREAM_HEARTBEAT_SECONDS = 15.0
+
+SSE_HEADERS = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+]
+
+JOB_STREAM_PATH = re.compile(r"^/quiz/explanation/jobs/([^/]+)/stream$")
+
+flask_app = WSGIMiddleware(ml_service.app, workers=WSGI_THREADS)
+scoring_executor = ThreadPoolExecutor(max_workers=SCORING_THREADS, thread_name_prefix="quiz-score")
+
+
+async def _read_json_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(b"".join(chunks) or b"null")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_sse(receive, send, chunks):
+    """Stream ``chunks`` (async iterator of SSE text) until done or disconnect.
+
+    Each next chunk is raced against the client disconnect, so a dropped
+    client cancels the generator (releasing its Ollama slot and HTTP stream)
+    right away instead of at the next token.
+    """
+
+    async def wait_disconnect():
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    disconnect = asyncio.ensure_future(wait_disconnect())
+    await send({"type": "http.response.start", "status": 200, "headers": SSE_HEADERS})
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(chunks.__anext__())
+            await asyncio.wait({next_chunk, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_chunk.done():
+                next_chunk.cancel()
+                try:
+                    await next_chunk
+                except (asyncio.CancelledError, StopAsyncIteration):
+                    pass
+                return
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                break
+            await send({"type": "http.response.body", "body": chunk.encode("utf-8"), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        disconnect.cancel()
+        await chunks.aclose()
+
+
+async def _predict_stream(receive, send):
+    request_started_at = time.monotonic()
+    print("[quiz-stream] request started (async)")
+    data = await _read_json_body(receive)
+    if data is None:
+        return
+
+    loop = asyncio.get_running_loop()
+    try:
+        response_payload = await loop.run_in_executor(
+            scoring_executor, ml_service.build_driver_quiz_prediction, data
+        )
+    except ml_service.QuizInputError as exc:
+        await _send_json(send, exc.payload, exc.status_code)
+        return
+
+    async def generate():
+        explanation_parts = []
+        yield ml_service.sse_event("result", {**response_payload, "explanation_text": ""})
+        async for event in astream_quiz_explanation(response_payload["quiz_result_data"]):
+            yield ml_service.predict_stream_sse(
+                event, response_payload, explanation_parts, request_started_at
+            )
+
+    await _send_sse(receive, send, generate())
+
+
+async def _quiz_explanation_stream(receive, send):
+    payload = await _read_json_body(receive)
+    if payload is None:
+        return
+
+    async def generate():
+        async for event in astream_quiz_explanation(payload):
+            event_name = event.get("event", "message")
+            yield ml_service.sse_event(event_name, {k: v for k, v in event.items() if k != "event"})
+
+    await _send_sse(receive, send, generate())
+
+
+async def _job_stream(job_id, receive, send):
+    job = ml_service.QUIZ_EXPLANATION_JOBS.get(job_id)
+    if job is None:
+        await _send_json(send, {"error": "Unknown or expired explanation job", "job_id": job_id}, 404)
+        return
+
+    async def generate():
+        index = 0
+        last_sent_at = time.monotonic()
+        while True:
+            pending, finished = job.events_since(index)
+            index += len(pending)
+            for event in pending:
+                event_name = event.get("event", "message")
+                yield ml_service.sse_event(event_name, {k: v for k, v in event.items() if k != "event"})
+                last_sent_at = time.monotonic()
+            if finished:
+                return
+            if time.monotonic() - last_sent_at >= JOB_STREAM_HEARTBEAT_SECONDS:
+                last_sent_at = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(JOB_STREAM_POLL_SECONDS)
+
+    await _send_sse(receive, send, generate())
+
+
+async def _observed(route, method, handler, receive, send):
+    """Run an async route with the request metrics the Flask hooks record for the rest."""
+
+    if not ml_service.METRICS_CONFIG["enabled"]:
+        return await handler(receive, send)
+
+    status = {"code": 500}
+
+    async def send_observed(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+        await send(message)
+
+    in_flight = ml_service.HTTP_IN_FLIGHT.labels(route)
+    in_flight.inc()
+    started_at = time.perf_counter()
+    try:
+        return await handler(receive, send_observed)
+    finally:
+        in_flight.dec()
+        ml_service.HTTP_REQUESTS.labels(route, method, status["code"]).inc()
+        ml_service.HTTP_REQUEST_SECONDS.labels(route, method).observe(time.perf_counter() - started_at)
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "http":
+        method = scope.get("method")
+        path = scope.get("path", "")
+        if method == "POST" and path == "/predict/stream":
+            return await _observed("/predict/stream", method, _predict_stream, receive, send)
+        if method == "POST" and path == "/quiz/explanation/stream":
+            return await _observed("/quiz/explanation/stream", method, _quiz_explanation_stream, receive, send)
+        if method == "GET":
+            match = JOB_STREAM_PATH.match(path)
+            if match:
+                job_id = match.group(1)
+                return await _observed(
+                    "/quiz/explanation/jobs/<job_id>/stream",
+                    method,
+                    lambda receive, send: _job_stream(job_id, receive, send),
+                    receive,
+                    send,
+                )
+    elif scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                scoring_executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    return await flask_app(scope, receive, send)
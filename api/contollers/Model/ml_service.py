@@ -1,17 +1,21 @@
-﻿from flask import Flask, Response, jsonify, request, stream_with_context
+﻿from flask import Flask, Response, g, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+import atexit
+import copy
 import json
 import joblib
 import math
 import numpy as np
 import pandas as pd
 import requests
-import shap
 import os
 import sys
+import threading
 import time
 import traceback
 import warnings
 from bisect import bisect_right
+from collections import OrderedDict
 
 # LightGBM emits a cosmetic UserWarning ("X does not have valid feature names")
 # when the model was trained with NumPy-typed feature names. The Pipeline still
@@ -45,18 +49,99 @@ if ANOMALY_DETECTION_DIR not in sys.path:
 # "unavailable" when classify_report_payload is None. Once torch/CLIP and the .pt
 # are present (Phase 2), this import succeeds and the endpoint works unchanged.
 try:
-    from report_spam_model import classify_report_payload
+    from report_spam_model import (
+        ImageTooLargeError,
+        classify_report_payload,
+        get_report_spam_batch_stats,
+        get_report_spam_cache_stats,
+    )
     _SPAM_IMPORT_ERROR = None
 except Exception as _spam_import_exc:  # ImportError (torch/clip/PIL) or load error
     classify_report_payload = None
+    get_report_spam_batch_stats = None
+    get_report_spam_cache_stats = None
+
+    class ImageTooLargeError(ValueError):
+        pass
+
     _SPAM_IMPORT_ERROR = repr(_spam_import_exc)
 from report_validator import validate_report as siara_validate_report
+from report_validator import validate_reports as siara_validate_reports
+from report_validator import build_text_input as build_report_text_input
+from report_validator import DEFAULT_NEAR_ROAD_RELAXED_M, DEFAULT_NEAR_ROAD_STRICT_M
 from services.quiz_explainer import (
     build_template_explanation,
     explain_quiz_result,
+    get_ollama_limiter,
+    get_quiz_explainer_stats,
+    queue_budget_exceeded_reason,
+    start_warm_keeper,
     stream_quiz_explanation,
     structure_quiz_explanation,
 )
+from services.occurrence_feature_store import (
+    FeatureStoreError,
+    HISTORY_COUNT_FEATURES,
+    OccurrenceFeatureStore,
+    get_feature_store_path,
+    get_feature_store_retain_days,
+)
+from services.explanation_cache import get_explanation_cache
+from services.explanation_jobs import ExplanationJobRunner, get_explanation_job_config
+from services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from services.metrics import (
+    MetricsRegistry,
+    StageTimer,
+    current_request_timings,
+    get_metrics_config,
+    note_cache,
+    start_request_timings,
+    stop_request_timings,
+)
+from services.report_dedup import build_report_dedup_index, minhash_signature
+from services.request_profiler import build_request_profiler, get_request_profiler_config
+from services.stack_sampler import build_stack_sampler
+from services.road_index import get_road_index_config, load_road_index
+from services.slow_requests import build_slow_request_log
+from services.tree_shap import ForestTreeShap
+
+# ---- Metrics (GET /metrics, Prometheus text format)
+# Per-route request counts/latency and per-stage model latency are recorded
+# inline; cache and queue figures are read from their owners at scrape time
+# (_collect_service_metrics).
+METRICS_CONFIG = get_metrics_config()
+METRICS = MetricsRegistry()
+HTTP_REQUESTS = METRICS.counter(
+    "siara_http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status")
+)
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    "siara_http_request_duration_seconds",
+    "Request handling time (streamed responses: until the stream ends).",
+    ("route", "method"),
+)
+HTTP_IN_FLIGHT = METRICS.gauge("siara_http_requests_in_flight", "Requests currently being handled.", ("route",))
+STAGE_SECONDS = METRICS.histogram(
+    "siara_stage_duration_seconds", "Latency of internal pipeline stages.", ("model", "stage")
+)
+MODEL_ROWS = METRICS.counter("siara_model_rows_total", "Rows scored per model.", ("model",))
+# Stage timings also feed each response's Server-Timing header and, with
+# debug_timing=1 (query string or JSON body), a "timing" block in the body.
+STAGES = StageTimer(STAGE_SECONDS, MODEL_ROWS)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+# Slowest recent requests per route (stages, rows, caches, redacted payload)
+# for GET /admin/slow-requests. Entries hold request payloads (coordinates
+# included), so they are only kept when that route exists
+# (REQUEST_PROFILE_SECRET).
+SLOW_REQUESTS = build_slow_request_log() if get_request_profiler_config()["enabled"] else None
+
+
+class _TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        with STAGES.time("response", "serialize"):
+            return super().dumps(obj, **kwargs)
+
+
+app.json = _TimedJSONProvider(app)
 
 # Driver mentality model artifacts
 MODEL_PATH = os.path.join(BASE_DIR, "driver-quiz-model", "driver_model.joblib")
@@ -96,7 +181,60 @@ with open(META_PATH, "r", encoding="utf-8") as f:
 
 FEATURES = meta["features"]
 ordered_labels = meta["ordered_labels"]
-explainer = shap.TreeExplainer(rf_raw)
+# Path-dependent TreeSHAP compiled from rf_raw's tree_ arrays (same values as
+# shap.TreeExplainer) — keeps the shap package out of the service.
+explainer = ForestTreeShap(rf_raw)
+
+# Quiz inputs are 11 small integer factor scores, so identical answers repeat a
+# lot; whole prediction + SHAP payloads are memoized per factor-score tuple.
+try:
+    QUIZ_PREDICTION_CACHE_SIZE = max(0, int(os.getenv("QUIZ_PREDICTION_CACHE_SIZE", "4096")))
+except ValueError:
+    QUIZ_PREDICTION_CACHE_SIZE = 4096
+
+# Upper bound on attempts per /predict/batch call. TreeSHAP on the shipped
+# forest (~250k leaves) runs at ~10 rows/s on one core, so 500 distinct rows
+# take ~50 s: well inside gunicorn's --timeout, which kills the only worker.
+try:
+    QUIZ_BATCH_MAX_ATTEMPTS = max(1, int(os.getenv("QUIZ_BATCH_MAX_ATTEMPTS", "500")))
+except ValueError:
+    QUIZ_BATCH_MAX_ATTEMPTS = 500
+
+# Upper bound on reports per /report/validate/batch call.
+try:
+    REPORT_VALIDATE_BATCH_MAX = max(1, int(os.getenv("REPORT_VALIDATE_BATCH_MAX", "2000")))
+except ValueError:
+    REPORT_VALIDATE_BATCH_MAX = 2000
+
+# Recently validated report texts; near-duplicates nearby reuse the result.
+REPORT_DEDUP = build_report_dedup_index()
+
+# Local road-segment index (GeoJSON export of gis.road_segments). When loaded,
+# report validation fills near_road / distance_to_road_m for callers that omit
+# them instead of relying on a PostGIS round trip.
+ROAD_INDEX = None
+ROAD_INDEX_ERROR = None
+_road_index_config = get_road_index_config()
+if _road_index_config["path"]:
+    try:
+        ROAD_INDEX = load_road_index(_road_index_config["path"], cell_deg=_road_index_config["cell_deg"])
+        print(
+            f"[report-validate] road index loaded ({ROAD_INDEX.n_segments} segments, "
+            f"{ROAD_INDEX.n_edges} edges) in {ROAD_INDEX.build_ms} ms",
+            flush=True,
+        )
+    except Exception as exc:  # noqa: BLE001 — validation still works with caller-supplied fields
+        ROAD_INDEX_ERROR = f"{type(exc).__name__}: {exc}"
+        print(f"[report-validate] road index load failed: {ROAD_INDEX_ERROR}", flush=True)
+
+# LLM prose for /predict is generated off the request thread; the response
+# carries an explanation_job_id that can be polled or streamed.
+QUIZ_EXPLANATION_JOBS = ExplanationJobRunner(**get_explanation_job_config())
+
+# Preload OLLAMA_MODEL and keep it resident while the quiz is in use, so the
+# first explanation after idle does not pay the model load (no-op unless
+# LLM_PROVIDER=ollama).
+start_warm_keeper()
 
 # ---- Load danger-zone multiclass severity artifacts
 DANGER_MODEL = joblib.load(MULTICLASS_MODEL_PATH)
@@ -313,6 +451,39 @@ except Exception as exc:  # noqa: BLE001 — log & disable, never crash startup
     )
     traceback.print_exc()
 
+# ---- Occurrence history-count feature store
+#
+# Keeps the five past_* count features in memory so requests may omit them.
+# Events arrive through POST /risk/occurrence/events; the store is restored
+# from OCCURRENCE_FEATURE_STORE_PATH at startup (when set) and written back on
+# shutdown or via POST /risk/occurrence/store/snapshot.
+OCCURRENCE_FEATURE_STORE = OccurrenceFeatureStore(retain_days=get_feature_store_retain_days())
+OCCURRENCE_FEATURE_STORE_PATH = get_feature_store_path()
+OCCURRENCE_FEATURE_STORE_ERROR = None
+if OCCURRENCE_FEATURE_STORE_PATH and os.path.exists(OCCURRENCE_FEATURE_STORE_PATH):
+    try:
+        _store_restore = OCCURRENCE_FEATURE_STORE.restore(OCCURRENCE_FEATURE_STORE_PATH)
+        print(
+            f"[occurrence] feature store restored ({_store_restore['segments']} segments) "
+            f"from {OCCURRENCE_FEATURE_STORE_PATH}",
+            flush=True,
+        )
+    except Exception as exc:  # noqa: BLE001 — start empty rather than crash
+        OCCURRENCE_FEATURE_STORE_ERROR = f"{type(exc).__name__}: {exc}"
+        print(f"[occurrence] feature store restore failed: {OCCURRENCE_FEATURE_STORE_ERROR}", flush=True)
+
+
+def _snapshot_occurrence_feature_store():
+    if not OCCURRENCE_FEATURE_STORE_PATH:
+        return
+    try:
+        OCCURRENCE_FEATURE_STORE.snapshot(OCCURRENCE_FEATURE_STORE_PATH)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[occurrence] feature store snapshot failed: {exc}", flush=True)
+
+
+atexit.register(_snapshot_occurrence_feature_store)
+
 
 def _occurrence_risk_level(probability):
     """Resolve risk level from the calibrated probability using manifest thresholds."""
@@ -400,13 +571,28 @@ def _occurrence_normalize_value(value):
     return value
 
 
+def _occurrence_row_context(raw, feature_dict):
+    """Segment id + scoring time for the feature store, read from the row
+    wrapper first and then from the feature dict itself."""
+    segment_id = None
+    at = None
+    for source in (raw, feature_dict):
+        if segment_id is None:
+            segment_id = _pick_value(source, "segment_id", "road_segment_id", "roadSegmentId")
+        if at is None:
+            at = _pick_value(source, "time_bucket", "target_time", "timestamp")
+    return segment_id, at
+
+
 def _occurrence_build_frame(rows):
     """Normalize rows against feature_list.json.
 
-    Returns (DataFrame, missing_by_row). For each input row, columns missing
-    from the payload become NaN, extra columns are dropped, and a per-row
-    list of missing required columns is captured so the response can carry
-    it back to the caller (helps Node spot upstream feature-builder gaps).
+    Returns (DataFrame, missing_by_row, filled_by_row). For each input row,
+    omitted history counts are first filled from the in-process feature store
+    (when the row identifies its segment), columns still missing from the
+    payload become NaN, extra columns are dropped, and a per-row list of
+    missing required columns is captured so the response can carry it back to
+    the caller (helps Node spot upstream feature-builder gaps).
     """
     columns = list(OCCURRENCE_FEATURE_LIST)
     if not columns:
@@ -415,10 +601,19 @@ def _occurrence_build_frame(rows):
         )
     normalized_rows = []
     missing_by_row = []
+    filled_by_row = []
     for raw in rows or []:
         feature_dict = _occurrence_extract_row_features(raw)
         if not isinstance(feature_dict, dict):
             raise ValueError("rows[] entries must contain a features object or be feature dicts")
+        filled = []
+        if any(feature_dict.get(name) is None for name in HISTORY_COUNT_FEATURES):
+            feature_dict = dict(feature_dict)
+            segment_id, at = _occurrence_row_context(raw, feature_dict)
+            filled = OCCURRENCE_FEATURE_STORE.fill_missing(
+                feature_dict, segment_id=segment_id, at=at
+            )
+        filled_by_row.append(filled)
         normalized = {}
         missing = []
         for col in columns:
@@ -430,7 +625,7 @@ def _occurrence_build_frame(rows):
         normalized_rows.append(normalized)
         missing_by_row.append(missing)
     frame = pd.DataFrame(normalized_rows, columns=columns)
-    return frame, missing_by_row
+    return frame, missing_by_row, filled_by_row
 
 
 def _occurrence_predict_calibrated(frame):
@@ -444,7 +639,9 @@ def _occurrence_predict_calibrated(frame):
     """
     if OCCURRENCE_CALIBRATOR is None:
         raise RuntimeError("Occurrence calibrator is not loaded")
-    calibrated = np.asarray(OCCURRENCE_CALIBRATOR.predict_proba(frame)[:, 1], dtype=float)
+    with STAGES.time("occurrence", "predict"):
+        calibrated = np.asarray(OCCURRENCE_CALIBRATOR.predict_proba(frame)[:, 1], dtype=float)
+    STAGES.rows("occurrence", len(frame))
     return calibrated, calibrated
 
 
@@ -1031,7 +1228,8 @@ def _severe_contributions(model_frame):
 
 
 def _danger_top_reasons(scored_frame, top_k=8):
-    shap_vector, base_value = _severe_contributions(scored_frame)
+    with STAGES.time("danger_severity", "contrib"):
+        shap_vector, base_value = _severe_contributions(scored_frame)
 
     row_dict = scored_frame.iloc[0].to_dict()
     order = np.argsort(np.abs(shap_vector))[::-1]
@@ -1058,13 +1256,17 @@ def _danger_top_reasons(scored_frame, top_k=8):
 
 
 def _score_danger_row(raw_row, include_quality_details=True):
-    _base_frame, model_frame, quality = _build_danger_model_frame(raw_row)
+    with STAGES.time("danger_severity", "preprocess"):
+        _base_frame, model_frame, quality = _build_danger_model_frame(raw_row)
 
-    proba = _predict_severity_proba(model_frame)
-    severity = _severity_payload_from_proba(proba)
+    with STAGES.time("danger_severity", "predict"):
+        proba = _predict_severity_proba(model_frame)
+        severity = _severity_payload_from_proba(proba)
+    STAGES.rows("danger_severity")
     danger_percent = severity["danger_percent"]
 
-    baseline_percent, baseline_key = _compute_baseline_percent(model_frame)
+    with STAGES.time("danger_severity", "baseline"):
+        baseline_percent, baseline_key = _compute_baseline_percent(model_frame)
     delta_vs_baseline = None
     if baseline_percent is not None:
         delta_vs_baseline = round(danger_percent - baseline_percent, 1)
@@ -1353,6 +1555,7 @@ def _sentinel_banner_from_reasons(reasons):
     return None
 
 
+@STAGES.timed("danger_severity", "sentinel")
 def _score_sentinel(raw_row):
     if not SENTINEL_ENABLED:
         raise RuntimeError(SENTINEL_LOAD_ERROR or "Sentinel is not available")
@@ -1459,80 +1662,154 @@ class QuizInputError(ValueError):
         self.status_code = status_code
 
 
-def build_driver_quiz_prediction(data):
+def _parse_quiz_factor_scores(data):
     missing = [f for f in FEATURES if f not in data]
     if missing:
         raise QuizInputError({"error": "Missing required features", "missing": missing}, 400)
 
     try:
-        x = pd.DataFrame([[float(data[f]) for f in FEATURES]], columns=FEATURES)
+        return tuple(float(data[f]) for f in FEATURES)
     except (TypeError, ValueError):
         raise QuizInputError({"error": "All feature values must be numeric"}, 400)
 
-    probs = model.predict_proba(x)[0]
-    pred_class = int(np.argmax(probs))
-    risk_label = ordered_labels[pred_class]
 
+def _score_driver_quiz_rows(factor_keys):
+    """Prediction + SHAP payloads for factor-score tuples (one model/SHAP pass)."""
+    x = pd.DataFrame([list(key) for key in factor_keys], columns=FEATURES)
+
+    with STAGES.time("driver_quiz", "predict"):
+        probs_all = model.predict_proba(x)
+    with STAGES.time("driver_quiz", "contrib"):
+        sv = explainer.shap_values(x.to_numpy())
+    STAGES.rows("driver_quiz", len(factor_keys))
+    if sv.shape[1:] != (len(FEATURES), len(ordered_labels)):
+        raise QuizInputError(
+            {"error": "Unexpected SHAP output shape", "shape": list(sv.shape)},
+            500,
+        )
+    expected_values = np.atleast_1d(explainer.expected_value)
     weights = np.arange(len(ordered_labels), dtype=float)
-    severity = float((probs * weights).sum())
-    risk_percent = float(np.clip(severity / weights.max() * 100.0, 0.0, 100.0))
 
-    shap_values = explainer.shap_values(x)
-    if isinstance(shap_values, list):
-        shap_for_pred = shap_values[pred_class][0]
-    else:
-        sv = np.array(shap_values)
-        if sv.ndim == 3 and sv.shape[1] == len(FEATURES) and sv.shape[2] == len(ordered_labels):
-            shap_for_pred = sv[0, :, pred_class]
-        elif sv.ndim == 2 and sv.shape[1] == len(FEATURES):
-            shap_for_pred = sv[0]
-        else:
-            raise QuizInputError(
-                {"error": "Unexpected SHAP output shape", "shape": list(sv.shape)},
-                500,
-            )
+    payloads = []
+    for row, factor_key in enumerate(factor_keys):
+        probs = probs_all[row]
+        pred_class = int(np.argmax(probs))
+        risk_label = ordered_labels[pred_class]
+
+        severity = float((probs * weights).sum())
+        risk_percent = float(np.clip(severity / weights.max() * 100.0, 0.0, 100.0))
+
+        shap_for_pred = sv[row, :, pred_class]
+        base_value_pred = float(expected_values[pred_class])
+
+        shap_per_feature = {FEATURES[i]: float(shap_for_pred[i]) for i in range(len(FEATURES))}
+        factor_scores = {feature: float(value) for feature, value in zip(FEATURES, factor_key)}
+        quiz_result_data = build_quiz_result_data(
+            risk_label=risk_label,
+            risk_percent=risk_percent,
+            shap_per_feature=shap_per_feature,
+            factor_scores=factor_scores,
+        )
+        advice_text = generate_advice_paragraph(
+            risk_label=risk_label, risk_percent=risk_percent, shap_per_feature=shap_per_feature
+        )
 
-    base_value = explainer.expected_value
-    if isinstance(base_value, (list, np.ndarray)) and len(np.atleast_1d(base_value)) == len(
-        ordered_labels
-    ):
-        base_value_pred = float(np.atleast_1d(base_value)[pred_class])
-    else:
-        base_value_pred = float(np.array(base_value).reshape(-1)[0])
-
-    shap_per_feature = {FEATURES[i]: float(shap_for_pred[i]) for i in range(len(FEATURES))}
-    factor_scores = {feature: float(x.iloc[0][feature]) for feature in FEATURES}
-    quiz_result_data = build_quiz_result_data(
-        risk_label=risk_label,
-        risk_percent=risk_percent,
-        shap_per_feature=shap_per_feature,
-        factor_scores=factor_scores,
-    )
-    advice_text = generate_advice_paragraph(
-        risk_label=risk_label, risk_percent=risk_percent, shap_per_feature=shap_per_feature
-    )
+        payloads.append(
+            {
+                "risk_label": risk_label,
+                "risk_percent": round(risk_percent, 2),
+                "risk_score": round(risk_percent, 2),
+                "class_probabilities": {
+                    ordered_labels[i]: float(round(probs[i], 6)) for i in range(len(ordered_labels))
+                },
+                "xai": {
+                    "predicted_class_index": pred_class,
+                    "base_value": base_value_pred,
+                    "shap_per_feature": shap_per_feature,
+                },
+                "advice_text": advice_text,
+                "quiz_result_data": quiz_result_data,
+            }
+        )
+    return payloads
+
+
+class QuizPredictionCache:
+    """Thread-safe LRU of quiz payloads keyed by factor-score tuple."""
+
+    def __init__(self, maxsize):
+        self.maxsize = int(maxsize)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+QUIZ_PREDICTIONS = QuizPredictionCache(QUIZ_PREDICTION_CACHE_SIZE)
+
+
+def _score_driver_quiz(factor_key):
+    """Prediction + SHAP payload for one factor-score tuple (memoized)."""
+    payload = QUIZ_PREDICTIONS.get(factor_key)
+    note_cache("quiz_prediction", payload is not None)
+    if payload is None:
+        payload = _score_driver_quiz_rows([factor_key])[0]
+        QUIZ_PREDICTIONS.put(factor_key, payload)
+    return payload
 
-    return {
-        "risk_label": risk_label,
-        "risk_percent": round(risk_percent, 2),
-        "risk_score": round(risk_percent, 2),
-        "class_probabilities": {
-            ordered_labels[i]: float(round(probs[i], 6)) for i in range(len(ordered_labels))
-        },
-        "xai": {
-            "predicted_class_index": pred_class,
-            "base_value": base_value_pred,
-            "shap_per_feature": shap_per_feature,
-        },
-        "advice_text": advice_text,
-        "quiz_result_data": quiz_result_data,
-    }
+
+def build_driver_quiz_prediction(data):
+    factor_key = _parse_quiz_factor_scores(data)
+    # Callers extend the payload, so hand out a copy of the cached entry.
+    return copy.deepcopy(_score_driver_quiz(factor_key))
 
 
 def sse_event(event_name, payload):
     return f"event: {event_name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
 
+def predict_stream_sse(event, response_payload, explanation_parts, request_started_at):
+    """Format one /predict/stream explainer event; ``done`` carries the full result."""
+    event_name = event.get("event", "message")
+    payload = {k: v for k, v in event.items() if k != "event"}
+    if event_name == "chunk":
+        explanation_parts.append(str(payload.get("content") or ""))
+    if event_name == "done":
+        explanation_text = payload.get("explanation_text") or "".join(explanation_parts).strip()
+        final_payload = {
+            **response_payload,
+            "explanation_text": explanation_text,
+            "structured_explanation": payload.get("structured_explanation")
+            or structure_quiz_explanation(explanation_text),
+        }
+        payload["result"] = final_payload
+        payload["elapsed_ms"] = int((time.monotonic() - request_started_at) * 1000)
+        print(
+            "[quiz-stream] stream completed "
+            f"in {payload['elapsed_ms']} ms"
+        )
+    return sse_event(event_name, payload)
+
+
 # -----------------------------
 # Routes
 # -----------------------------
@@ -1546,17 +1823,38 @@ def predict():
         return jsonify(exc.payload), exc.status_code
 
     quiz_result_data = response_payload["quiz_result_data"]
-    try:
-        explanation_text = explain_quiz_result(quiz_result_data)
-    except Exception as exc:
-        print(f"[quiz-explainer] Unexpected fallback: {exc}")
+    # Only queue a generation that can start within the Ollama wait budget;
+    # otherwise answer with the template now instead of growing a backlog.
+    job = None
+    fallback_reason = queue_budget_exceeded_reason(ahead=QUIZ_EXPLANATION_JOBS.pending_count())
+    if fallback_reason is None:
+        job = QUIZ_EXPLANATION_JOBS.submit(lambda: stream_quiz_explanation(quiz_result_data))
+        if job is None:
+            fallback_reason = (
+                f"{QUIZ_EXPLANATION_JOBS.max_active} explanation jobs already pending or running"
+            )
+
+    if job is None:
+        print(f"[quiz-explainer] fallback used: {fallback_reason}")
         explanation_text = build_template_explanation(quiz_result_data)
+        return jsonify(
+            {
+                **response_payload,
+                "explanation_job_id": None,
+                "explanation_status": "fallback",
+                "explanation_fallback_reason": fallback_reason,
+                "explanation_text": explanation_text,
+                "structured_explanation": structure_quiz_explanation(explanation_text),
+            }
+        )
 
     return jsonify(
         {
             **response_payload,
-            "explanation_text": explanation_text,
-            "structured_explanation": structure_quiz_explanation(explanation_text),
+            "explanation_job_id": job.job_id,
+            "explanation_status": job.status,
+            "explanation_text": None,
+            "structured_explanation": None,
         }
     )
 
@@ -1585,25 +1883,7 @@ def predict_stream():
             },
         )
         for event in stream_quiz_explanation(quiz_result_data):
-            event_name = event.get("event", "message")
-            payload = {k: v for k, v in event.items() if k != "event"}
-            if event_name == "chunk":
-                explanation_parts.append(str(payload.get("content") or ""))
-            if event_name == "done":
-                explanation_text = payload.get("explanation_text") or "".join(explanation_parts).strip()
-                final_payload = {
-                    **response_payload,
-                    "explanation_text": explanation_text,
-                    "structured_explanation": payload.get("structured_explanation")
-                    or structure_quiz_explanation(explanation_text),
-                }
-                payload["result"] = final_payload
-                payload["elapsed_ms"] = int((time.monotonic() - request_started_at) * 1000)
-                print(
-                    "[quiz-stream] stream completed "
-                    f"in {payload['elapsed_ms']} ms"
-                )
-            yield sse_event(event_name, payload)
+            yield predict_stream_sse(event, response_payload, explanation_parts, request_started_at)
 
     return Response(
         generate(),
@@ -1616,6 +1896,102 @@ def predict_stream():
     )
 
 
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """Bulk quiz scoring (historical re-scoring): one predict_proba + one SHAP pass.
+
+    Body: ``{"attempts": [{"id": ..., "features": {...}} | {...factor scores}],
+    "explanation": "none" | "template"}``. LLM explanations are never generated
+    here; ``"template"`` adds the deterministic template text per attempt.
+    """
+    started_at = time.perf_counter()
+    data = request.get_json(silent=True)
+    attempts = data.get("attempts") if isinstance(data, dict) else data
+    if not isinstance(attempts, list) or not attempts:
+        return jsonify({"error": "Expected a non-empty 'attempts' array"}), 400
+    if len(attempts) > QUIZ_BATCH_MAX_ATTEMPTS:
+        return jsonify(
+            {
+                "error": "Too many attempts in one batch",
+                "max_attempts": QUIZ_BATCH_MAX_ATTEMPTS,
+                "received": len(attempts),
+            }
+        ), 413
+
+    explanation_mode = str((data.get("explanation") if isinstance(data, dict) else None) or "none").lower()
+    if explanation_mode not in ("none", "template"):
+        return jsonify({"error": "explanation must be 'none' or 'template'"}), 400
+
+    # Parse every attempt first; bad rows are reported, not fatal to the batch.
+    row_keys = []
+    errors = {}
+    for index, attempt in enumerate(attempts):
+        features = attempt.get("features", attempt) if isinstance(attempt, dict) else None
+        if not isinstance(features, dict):
+            errors[index] = {"error": "Each attempt must be an object of factor scores"}
+            row_keys.append(None)
+            continue
+        try:
+            row_keys.append(_parse_quiz_factor_scores(features))
+        except QuizInputError as exc:
+            errors[index] = exc.payload
+            row_keys.append(None)
+
+    unique_keys = list(dict.fromkeys(key for key in row_keys if key is not None))
+    # Rows /predict already scored come from its cache; only the rest go
+    # through TreeSHAP. Batch rows are not added, so a re-scoring run does
+    # not evict the interactive entries.
+    scored = {}
+    for key in unique_keys:
+        payload = QUIZ_PREDICTIONS.get(key)
+        note_cache("quiz_prediction", payload is not None)
+        if payload is not None:
+            scored[key] = payload
+    missing_keys = [key for key in unique_keys if key not in scored]
+    if missing_keys:
+        try:
+            scored.update(zip(missing_keys, _score_driver_quiz_rows(missing_keys)))
+        except QuizInputError as exc:
+            return jsonify(exc.payload), exc.status_code
+
+    template_cache = {}
+    results = []
+    for index, (attempt, key) in enumerate(zip(attempts, row_keys)):
+        attempt_id = attempt.get("id", index) if isinstance(attempt, dict) else index
+        if key is None:
+            results.append({"id": attempt_id, "ok": False, **errors[index]})
+            continue
+        item = {"id": attempt_id, "ok": True, **copy.deepcopy(scored[key])}
+        if explanation_mode == "template":
+            if key not in template_cache:
+                template_cache[key] = build_template_explanation(item["quiz_result_data"])
+            explanation_text = template_cache[key]
+            item["explanation_text"] = explanation_text
+            item["structured_explanation"] = structure_quiz_explanation(explanation_text)
+        results.append(item)
+
+    elapsed = time.perf_counter() - started_at
+    attempts_per_second = round(len(attempts) / elapsed, 1) if elapsed > 0 else None
+    print(
+        f"[quiz-batch] scored {len(attempts)} attempts ({len(unique_keys)} unique, "
+        f"{len(missing_keys)} not cached, {len(errors)} invalid) in {elapsed * 1000:.1f} ms "
+        f"({attempts_per_second} attempts/s)",
+        flush=True,
+    )
+    return jsonify(
+        {
+            "count": len(attempts),
+            "unique_count": len(unique_keys),
+            "scored_count": len(missing_keys),
+            "error_count": len(errors),
+            "explanation": explanation_mode,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "attempts_per_second": attempts_per_second,
+            "results": results,
+        }
+    )
+
+
 @app.route("/quiz/explanation/test", methods=["GET", "POST"])
 def quiz_explanation_test():
     payload = request.get_json(silent=True) or EXAMPLE_QUIZ_EXPLAINER_PAYLOAD
@@ -1660,6 +2036,40 @@ def quiz_explanation_stream():
     )
 
 
+@app.route("/quiz/explanation/jobs/<job_id>", methods=["GET"])
+def quiz_explanation_job(job_id):
+    job = QUIZ_EXPLANATION_JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired explanation job", "job_id": job_id}), 404
+    return jsonify(job.snapshot())
+
+
+@app.route("/quiz/explanation/jobs/<job_id>/stream", methods=["GET"])
+def quiz_explanation_job_stream(job_id):
+    job = QUIZ_EXPLANATION_JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired explanation job", "job_id": job_id}), 404
+
+    @stream_with_context
+    def generate():
+        for event in job.follow():
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_name = event.get("event", "message")
+            yield sse_event(event_name, {k: v for k, v in event.items() if k != "event"})
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Connection": "keep-alive",
+        },
+    )
+
+
 @app.route("/risk/current", methods=["POST"])
 def risk_current():
     payload = request.get_json(silent=True) or {}
@@ -1784,23 +2194,105 @@ def risk_confidence():
         return jsonify({"enabled": True, "error": "Sentinel scoring failed", "details": str(exc)}), 500
 
 
+def _report_validation_fields(payload):
+    return {
+        "title": payload.get("title"),
+        "description": payload.get("description"),
+        "incident_type": payload.get("incident_type") or payload.get("incidentType"),
+        "lat": payload.get("lat"),
+        "lon": payload.get("lon") or payload.get("lng"),
+        "near_road": payload.get("near_road"),
+        "distance_to_road_m": payload.get("distance_to_road_m"),
+        "has_image": bool(payload.get("has_image", False)),
+        "image_related": payload.get("image_related"),
+    }
+
+
+def _fill_road_fields(fields):
+    """Fill near_road / distance_to_road_m from the road index when both are omitted.
+
+    Mirrors the Node PostGIS check: nearest segment within the relaxed radius,
+    ``near_road`` when it is within the strict radius. Returns the lookup
+    details, or None when the caller's values are kept.
+    """
+    if ROAD_INDEX is None or fields["near_road"] is not None or fields["distance_to_road_m"] is not None:
+        return None
+    try:
+        lat = float(fields["lat"])
+        lon = float(fields["lon"])
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    distance_m, segment_id = ROAD_INDEX.nearest(lat, lon, DEFAULT_NEAR_ROAD_RELAXED_M)
+    fields["near_road"] = distance_m is not None and distance_m <= DEFAULT_NEAR_ROAD_STRICT_M
+    fields["distance_to_road_m"] = round(distance_m, 2) if distance_m is not None else None
+    return {"source": "road_index", "segment_id": segment_id}
+
+
+def _report_dedup_key(fields):
+    """``(signature, lat, lon, context)`` for the dedup index, or None to skip it."""
+    if REPORT_DEDUP is None:
+        return None
+    text = build_report_text_input(fields["title"], fields["description"], fields["incident_type"])
+    try:
+        lat = float(fields["lat"])
+        lon = float(fields["lon"])
+    except (TypeError, ValueError):
+        return None
+    if not text or not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    # The image hint changes the fused label, so it must match too.
+    context = (fields["has_image"], fields["image_related"])
+    return minhash_signature(text), lat, lon, context
+
+
 @app.route("/report/validate", methods=["POST"])
 def report_validate():
     payload = request.get_json(silent=True) or {}
     _log_incoming("/report/validate", payload)
 
+    fields = _report_validation_fields(payload)
+    dedup_key = _report_dedup_key(fields)
+    report_id = payload.get("report_id") or payload.get("id")
+    if dedup_key is not None:
+        signature, lat, lon, context = dedup_key
+        match = REPORT_DEDUP.find(signature, lat, lon, context=context, report_id=report_id)
+        note_cache("report_dedup", match is not None)
+        if match is not None:
+            result = match["result"]
+            duplicate_of = match["duplicate_of"]
+            result["is_duplicate"] = True
+            result["duplicate_of"] = duplicate_of
+            result["reasons"] = list(result.get("reasons") or []) + [
+                f"Near-duplicate of a report validated {duplicate_of['age_seconds']:.0f} s ago "
+                f"({duplicate_of['distance_m']:.0f} m away)"
+            ]
+            print(
+                f"[report-validate] duplicate of report {duplicate_of['report_id']} "
+                f"(similarity {duplicate_of['similarity']}, {duplicate_of['distance_m']} m)",
+                flush=True,
+            )
+            return jsonify(result)
+
     try:
-        result = siara_validate_report(
-            title=payload.get("title"),
-            description=payload.get("description"),
-            incident_type=payload.get("incident_type") or payload.get("incidentType"),
-            lat=payload.get("lat"),
-            lon=payload.get("lon") or payload.get("lng"),
-            near_road=payload.get("near_road"),
-            distance_to_road_m=payload.get("distance_to_road_m"),
-            has_image=bool(payload.get("has_image", False)),
-            image_related=payload.get("image_related"),
-        )
+        road_check = _fill_road_fields(fields)
+        with STAGES.time("report_validator", "predict"):
+            result = siara_validate_report(**fields)
+        STAGES.rows("report_validator")
+        if road_check is not None:
+            result["road_check"] = road_check
+        if dedup_key is not None:
+            signature, lat, lon, context = dedup_key
+            REPORT_DEDUP.add(
+                signature,
+                lat,
+                lon,
+                result,
+                report_id=report_id,
+                context=context,
+            )
+            result["is_duplicate"] = False
         return jsonify(result)
     except FileNotFoundError as exc:
         return (
@@ -1818,6 +2310,79 @@ def report_validate():
         return jsonify({"error": "Report validation failed", "details": str(exc)}), 500
 
 
+@app.route("/report/validate/batch", methods=["POST"])
+def report_validate_batch():
+    """Bulk report validation (moderation backfills, admin incident queue).
+
+    Body: ``{"reports": [{"id": ..., "title": ..., "lat": ..., ...}]}`` with the
+    same fields as ``/report/validate``. Texts are scored in one TF-IDF +
+    classifier pass; the location/image fusion runs per report.
+    """
+    started_at = time.perf_counter()
+    data = request.get_json(silent=True)
+    reports = data.get("reports") if isinstance(data, dict) else data
+    if not isinstance(reports, list) or not reports:
+        return jsonify({"error": "Expected a non-empty 'reports' array"}), 400
+    if len(reports) > REPORT_VALIDATE_BATCH_MAX:
+        return jsonify(
+            {
+                "error": "Too many reports in one batch",
+                "max_reports": REPORT_VALIDATE_BATCH_MAX,
+                "received": len(reports),
+            }
+        ), 413
+
+    valid_rows = [index for index, report in enumerate(reports) if isinstance(report, dict)]
+    batch_fields = [_report_validation_fields(reports[index]) for index in valid_rows]
+    road_checks = [_fill_road_fields(fields) for fields in batch_fields]
+    try:
+        with STAGES.time("report_validator", "predict"):
+            validated = siara_validate_reports(batch_fields)
+        STAGES.rows("report_validator", len(batch_fields))
+    except FileNotFoundError as exc:
+        return (
+            jsonify(
+                {
+                    "error": "Report validator model is not trained",
+                    "details": str(exc),
+                }
+            ),
+            503,
+        )
+    except Exception as exc:
+        return jsonify({"error": "Report validation failed", "details": str(exc)}), 500
+
+    for result, road_check in zip(validated, road_checks):
+        if road_check is not None:
+            result["road_check"] = road_check
+    by_row = dict(zip(valid_rows, validated))
+    results = []
+    for index, report in enumerate(reports):
+        report_id = report.get("id", index) if isinstance(report, dict) else index
+        if index not in by_row:
+            results.append({"id": report_id, "ok": False, "error": "Each report must be a JSON object"})
+            continue
+        results.append({"id": report_id, "ok": True, **by_row[index]})
+
+    elapsed = time.perf_counter() - started_at
+    reports_per_second = round(len(reports) / elapsed, 1) if elapsed > 0 else None
+    error_count = len(reports) - len(valid_rows)
+    print(
+        f"[report-validate] validated {len(reports)} reports ({error_count} invalid) in "
+        f"{elapsed * 1000:.1f} ms ({reports_per_second} reports/s)",
+        flush=True,
+    )
+    return jsonify(
+        {
+            "count": len(reports),
+            "error_count": error_count,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "reports_per_second": reports_per_second,
+            "results": results,
+        }
+    )
+
+
 @app.route("/report-spam/classify", methods=["POST"])
 def report_spam_classify():
     payload = request.get_json(silent=True) or {}
@@ -1847,26 +2412,316 @@ def report_spam_classify():
         )
 
     try:
-        result = classify_report_payload(
-            text=text,
-            image_url=image_url,
-            image_path=image_path,
-            model_path=payload.get("model_path") or REPORT_SPAM_MODEL_PATH,
-            model_name=payload.get("model_name"),
-            model_version=payload.get("model_version"),
-            threshold_percent=payload.get("threshold_percent"),
-        )
+        with STAGES.time("report_spam", "predict"):
+            result = classify_report_payload(
+                text=text,
+                image_url=image_url,
+                image_path=image_path,
+                model_path=payload.get("model_path") or REPORT_SPAM_MODEL_PATH,
+                model_name=payload.get("model_name"),
+                model_version=payload.get("model_version"),
+                threshold_percent=payload.get("threshold_percent"),
+            )
+        STAGES.rows("report_spam")
+        for kind, state in ((result.get("inputs") or {}).get("embedding_cache") or {}).items():
+            note_cache(f"report_spam_embedding_{kind}", state == "hit")
         return jsonify(result)
     except FileNotFoundError as exc:
         return jsonify({"error": "Spam model file is unavailable", "details": str(exc)}), 503
     except requests.RequestException as exc:
         return jsonify({"error": "Failed to fetch report image", "details": str(exc)}), 502
+    except ImageTooLargeError as exc:
+        return jsonify({"error": str(exc)}), 413
+    except TimeoutError as exc:
+        return jsonify({"error": "Spam model is busy", "details": str(exc)}), 503
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
     except Exception as exc:
         return jsonify({"error": "Spam classification failed", "details": str(exc)}), 500
 
 
+def _metrics_route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "<unmatched>"
+
+
+def _debug_timing_requested():
+    flag = request.args.get("debug_timing")
+    if flag is None and request.is_json:
+        body = request.get_json(silent=True)
+        flag = body.get("debug_timing") if isinstance(body, dict) else None
+    return str(flag).strip().lower() in TRUE_STRINGS if flag is not None else False
+
+
+def _observability_before_request():
+    if METRICS_CONFIG["enabled"]:
+        route = _metrics_route_label()
+        g.metrics_route = route
+        g.metrics_started_at = time.perf_counter()
+        HTTP_IN_FLIGHT.labels(route).inc()
+    if SERVER_TIMING_ENABLED or SLOW_REQUESTS is not None:
+        g.request_timings = start_request_timings()
+
+
+# Probes and admin routes are never interesting as slow requests.
+_SLOW_REQUEST_SKIPPED_ROUTES = {"/", "/health", "/metrics", "<unmatched>"}
+
+
+def _record_slow_request(timings, status_code):
+    route = _metrics_route_label()
+    if route in _SLOW_REQUEST_SKIPPED_ROUTES or route.startswith("/admin/"):
+        return
+    duration_ms = timings.elapsed_ms()
+    if not SLOW_REQUESTS.admits(route, duration_ms):
+        return
+    payload = request.get_json(silent=True) if request.is_json else None
+    SLOW_REQUESTS.record(
+        route,
+        duration_ms,
+        method=request.method,
+        status=status_code,
+        timing=timings.as_dict(),
+        payload=SLOW_REQUESTS.summarize_payload(
+            payload if payload is not None else dict(request.args), request.content_length or 0
+        ),
+    )
+
+
+def _observability_after_request(response):
+    g.metrics_status = response.status_code
+    timings = g.get("request_timings")
+    if timings is None:
+        return response
+    if SLOW_REQUESTS is not None:
+        try:
+            _record_slow_request(timings, response.status_code)
+        except Exception as exc:
+            print(f"[slow-requests] failed to record {request.path}: {exc}", flush=True)
+    if not SERVER_TIMING_ENABLED:
+        return response
+    response.headers["Server-Timing"] = timings.server_timing_header()
+    if response.is_json and not response.is_streamed and _debug_timing_requested():
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body["timing"] = timings.as_dict()
+            response.set_data(json.dumps(body))
+    return response
+
+
+def _observability_teardown_request(exc):
+    if g.pop("request_timings", None) is not None:
+        stop_request_timings()
+    route = g.pop("metrics_route", None)
+    if route is None:
+        return
+    status = g.pop("metrics_status", 500 if exc is not None else 200)
+    HTTP_IN_FLIGHT.labels(route).dec()
+    HTTP_REQUESTS.labels(route, request.method, status).inc()
+    HTTP_REQUEST_SECONDS.labels(route, request.method).observe(time.perf_counter() - g.metrics_started_at)
+
+
+def _cache_samples(name, stats):
+    if not stats:
+        return []
+    hits = (stats.get("hits") or 0) + (stats.get("disk_hits") or 0)
+    misses = stats.get("misses") or 0
+    return [(name, hits, misses, hits / (hits + misses) if hits + misses else None)]
+
+
+def _collect_service_metrics():
+    """Scrape-time figures owned by other components (caches, queues)."""
+
+    caches = []
+    caches += _cache_samples(
+        "quiz_prediction", {"hits": QUIZ_PREDICTIONS.hits, "misses": QUIZ_PREDICTIONS.misses}
+    )
+    explanation_cache = get_explanation_cache()
+    if explanation_cache is not None:
+        caches += _cache_samples("quiz_explanation", explanation_cache.stats())
+    if REPORT_DEDUP is not None:
+        caches += _cache_samples("report_dedup", REPORT_DEDUP.stats())
+    if get_report_spam_cache_stats is not None:
+        caches += _cache_samples("report_spam_embedding", get_report_spam_cache_stats())
+
+    jobs = QUIZ_EXPLANATION_JOBS.stats()
+    limiter = get_ollama_limiter().stats()
+    return [
+        ("siara_cache_hits_total", "counter", "Cache hits.", [({"cache": c}, hits) for c, hits, _m, _r in caches]),
+        (
+            "siara_cache_misses_total",
+            "counter",
+            "Cache misses.",
+            [({"cache": c}, misses) for c, _h, misses, _r in caches],
+        ),
+        (
+            "siara_cache_hit_ratio",
+            "gauge",
+            "Hits / (hits + misses) since start.",
+            [({"cache": c}, ratio) for c, _h, _m, ratio in caches],
+        ),
+        (
+            "siara_explanation_jobs",
+            "gauge",
+            "Quiz explanation jobs kept, by status.",
+            [({"status": status}, jobs.get(status, 0)) for status in ("pending", "running", "done")],
+        ),
+        (
+            "siara_ollama_generations",
+            "gauge",
+            "Ollama generations admitted (active) and waiting (queued).",
+            [({"state": "active"}, limiter.get("active")), ({"state": "queued"}, limiter.get("queued"))],
+        ),
+    ]
+
+
+if METRICS_CONFIG["enabled"] or SERVER_TIMING_ENABLED or SLOW_REQUESTS is not None:
+    app.before_request(_observability_before_request)
+    app.after_request(_observability_after_request)
+    app.teardown_request(_observability_teardown_request)
+
+if METRICS_CONFIG["enabled"]:
+    METRICS.add_collector(_collect_service_metrics)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(METRICS.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+# ---- On-demand request profiling (X-Profile: 1 + X-Profile-Secret)
+REQUEST_PROFILER = build_request_profiler()
+
+
+def _profiler_authorized():
+    return REQUEST_PROFILER is not None and REQUEST_PROFILER.authorized(request.headers.get("X-Profile-Secret"))
+
+
+def _profile_before_request():
+    if request.headers.get("X-Profile") not in ("1", "true") or not _profiler_authorized():
+        return
+    capture = REQUEST_PROFILER.start()
+    if capture is None:
+        g.profile_status = "busy"
+        return
+    g.profile_capture = capture
+
+
+def _finish_profile(status_code):
+    capture = g.pop("profile_capture", None)
+    if capture is None:
+        return None
+    return REQUEST_PROFILER.finish(
+        capture,
+        {"route": _metrics_route_label(), "path": request.path, "method": request.method, "status": status_code},
+    )
+
+
+def _profile_after_request(response):
+    profile_id = _finish_profile(response.status_code)
+    if profile_id is not None:
+        response.headers["X-Profile-Id"] = profile_id
+    elif g.pop("profile_status", None) == "busy":
+        response.headers["X-Profile-Status"] = "busy"
+    return response
+
+
+def _profile_teardown_request(exc):
+    # Only reached with a capture still open when the view raised.
+    _finish_profile(500)
+
+
+if REQUEST_PROFILER is not None:
+    app.before_request(_profile_before_request)
+    app.after_request(_profile_after_request)
+    app.teardown_request(_profile_teardown_request)
+
+    @app.route("/admin/profiles", methods=["GET"])
+    def admin_profiles():
+        if not _profiler_authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        return jsonify({"profiles": REQUEST_PROFILER.list_profiles(), "keep": REQUEST_PROFILER.keep})
+
+    @app.route("/admin/profiles/<profile_id>", methods=["GET"])
+    def admin_profile(profile_id):
+        if not _profiler_authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        if request.args.get("format") == "prof":
+            path = REQUEST_PROFILER.profile_path(profile_id)
+            if path is None:
+                return jsonify({"error": "Unknown profile", "profile_id": profile_id}), 404
+            with open(path, "rb") as fh:
+                return Response(
+                    fh.read(),
+                    mimetype="application/octet-stream",
+                    headers={"Content-Disposition": f"attachment; filename={profile_id}.prof"},
+                )
+        try:
+            limit = int(request.args.get("limit", "60"))
+        except ValueError:
+            limit = 60
+        report = REQUEST_PROFILER.render_text(profile_id, sort=request.args.get("sort", "cumulative"), limit=limit)
+        if report is None:
+            return jsonify({"error": "Unknown profile", "profile_id": profile_id}), 404
+        return Response(report, mimetype="text/plain")
+
+
+# ---- Always-on stack sampling (folded hot stacks on /admin/stacks)
+# The sampler only runs when its admin route exists (REQUEST_PROFILE_SECRET).
+STACK_SAMPLER = build_stack_sampler() if REQUEST_PROFILER is not None else None
+if STACK_SAMPLER is not None:
+    STACK_SAMPLER.start()
+    print(
+        f"[stack-sampler] sampling at {STACK_SAMPLER.hz:g} Hz (max {STACK_SAMPLER.max_stacks} stacks)",
+        flush=True,
+    )
+
+if STACK_SAMPLER is not None:
+
+    @app.route("/admin/stacks", methods=["GET"])
+    def admin_stacks():
+        if not _profiler_authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        try:
+            limit = int(request.args.get("limit", "0"))
+        except ValueError:
+            limit = 0
+        if request.args.get("format") == "json":
+            response = jsonify(
+                {
+                    "stats": STACK_SAMPLER.stats(),
+                    "packages": STACK_SAMPLER.package_shares(),
+                    "folded": STACK_SAMPLER.folded(limit=limit or 50).splitlines(),
+                }
+            )
+        else:
+            response = Response(STACK_SAMPLER.folded(limit=limit), mimetype="text/plain")
+        # ?reset=1 starts a fresh window after this read (e.g. around a load test).
+        if request.args.get("reset") in ("1", "true"):
+            STACK_SAMPLER.reset()
+        return response
+
+
+# ---- Slow-request ring (GET /admin/slow-requests)
+if SLOW_REQUESTS is not None:
+
+    @app.route("/admin/slow-requests", methods=["GET"])
+    def admin_slow_requests():
+        if not _profiler_authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        payload = {"stats": SLOW_REQUESTS.stats(), "entries": SLOW_REQUESTS.entries(request.args.get("route"))}
+        if request.args.get("dump") in ("1", "true"):
+            payload["dumped_to"] = SLOW_REQUESTS.dump()
+        return jsonify(payload)
+
+    @app.route("/admin/slow-requests/<entry_id>", methods=["GET"])
+    def admin_slow_request(entry_id):
+        if not _profiler_authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        entry = SLOW_REQUESTS.get(entry_id)
+        if entry is None:
+            return jsonify({"error": "Unknown or expired entry", "id": entry_id}), 404
+        return jsonify(entry)
+
+
 @app.route("/", methods=["GET"])
 @app.route("/health", methods=["GET"])
 def health():
@@ -1889,6 +2744,19 @@ def health():
                     "occurrence": bool(OCCURRENCE_ENABLED),
                     "report_spam": classify_report_payload is not None,
                 },
+                "quiz_explainer": get_quiz_explainer_stats(),
+                "report_spam_batching": get_report_spam_batch_stats()
+                if get_report_spam_batch_stats is not None
+                else None,
+                "report_spam_embedding_cache": get_report_spam_cache_stats()
+                if get_report_spam_cache_stats is not None
+                else None,
+                "report_dedup": REPORT_DEDUP.stats() if REPORT_DEDUP is not None else None,
+                "stack_sampler": STACK_SAMPLER.stats() if STACK_SAMPLER is not None else None,
+                "slow_requests": SLOW_REQUESTS.stats() if SLOW_REQUESTS is not None else None,
+                "road_index": ROAD_INDEX.stats()
+                if ROAD_INDEX is not None
+                else ({"error": ROAD_INDEX_ERROR} if ROAD_INDEX_ERROR else None),
             }
         ),
         200,
@@ -1942,7 +2810,7 @@ def risk_occurrence_predict():
         )
 
     try:
-        frame, missing_by_row = _occurrence_build_frame(rows)
+        frame, missing_by_row, filled_by_row = _occurrence_build_frame(rows)
     except ValueError as exc:
         return (
             jsonify({"error": str(exc), "type": "InvalidRequest"}),
@@ -1995,7 +2863,9 @@ def risk_occurrence_predict():
     fallback_factors = _occurrence_global_top_factors()
 
     predictions = []
-    for raw_score, prob, missing in zip(raw_scores, calibrated, missing_by_row):
+    for raw_score, prob, missing, filled in zip(
+        raw_scores, calibrated, missing_by_row, filled_by_row
+    ):
         coerced_raw = _occurrence_coerce_value(raw_score)
         coerced_prob = _occurrence_coerce_value(prob)
         predictions.append(
@@ -2008,6 +2878,7 @@ def risk_occurrence_predict():
                 "top_factors": fallback_factors,
                 "explanation_source": "global_importance_fallback",
                 "missing_required_features": missing,
+                "feature_store_filled": filled,
             }
         )
 
@@ -2054,10 +2925,52 @@ def risk_occurrence_status():
             "selected_model": OCCURRENCE_SELECTED_MODEL,
             "calibration_method": OCCURRENCE_CALIBRATION_METHOD,
             "load_error": OCCURRENCE_LOAD_ERROR,
+            "feature_store": {
+                **OCCURRENCE_FEATURE_STORE.stats(),
+                "snapshot_path": OCCURRENCE_FEATURE_STORE_PATH,
+                "restore_error": OCCURRENCE_FEATURE_STORE_ERROR,
+            },
         }
     )
 
 
+@app.route("/risk/occurrence/events", methods=["POST"])
+def risk_occurrence_events():
+    """Ingest accident events into the history-count feature store.
+
+    Body: { "events": [{ "segment_id", "road_class", "event_time" }, ...] }
+    (a bare array is accepted too). Send each accident once.
+    """
+    payload = request.get_json(silent=True)
+    events = payload.get("events") if isinstance(payload, dict) else payload
+    if not isinstance(events, list):
+        return (
+            jsonify({"error": "events[] is required and must be a list", "type": "InvalidRequest"}),
+            400,
+        )
+    result = OCCURRENCE_FEATURE_STORE.ingest(events)
+    return jsonify({**result, "feature_store": OCCURRENCE_FEATURE_STORE.stats()})
+
+
+@app.route("/risk/occurrence/store/snapshot", methods=["POST"])
+def risk_occurrence_store_snapshot():
+    if not OCCURRENCE_FEATURE_STORE_PATH:
+        return (
+            jsonify(
+                {
+                    "error": "OCCURRENCE_FEATURE_STORE_PATH is not configured",
+                    "type": "NotConfigured",
+                }
+            ),
+            409,
+        )
+    try:
+        result = OCCURRENCE_FEATURE_STORE.snapshot(OCCURRENCE_FEATURE_STORE_PATH)
+    except (OSError, FeatureStoreError) as exc:
+        return jsonify({"error": "Feature store snapshot failed", "message": str(exc)}), 500
+    return jsonify(result)
+
+
 @app.route("/risk/occurrence/metadata", methods=["GET"])
 def risk_occurrence_metadata():
     """Returns the metadata an Admin UI / Node proxy needs without joblib payload."""
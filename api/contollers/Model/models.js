@@ -39,6 +39,8 @@ const {
   setCacheEntryWithTtl,
 } = require("../../services/risk/riskCommon");
 const {
+  getFromFlask,
+  getFromFlaskStream,
   postToFlask,
   postToFlaskStream,
   readStreamText,
@@ -1059,6 +1061,73 @@ exports.predictDriverRiskStream = async (req, res) => {
   }
 };
 
+exports.getQuizExplanationJob = async (req, res) => {
+  const jobId = encodeURIComponent(String(req.params.jobId || ""));
+
+  try {
+    const response = await getFromFlask(`/quiz/explanation/jobs/${jobId}`);
+    return res.json(response.data);
+  } catch (err) {
+    const status = err.response?.status || 500;
+    const payload = err.response?.data || { error: "Quiz explanation job lookup failed" };
+    console.error("[Node] /quiz/explanation/jobs error:", err.message);
+    return res.status(status).json(payload);
+  }
+};
+
+exports.streamQuizExplanationJob = async (req, res) => {
+  const jobId = encodeURIComponent(String(req.params.jobId || ""));
+
+  try {
+    const response = await getFromFlaskStream(`/quiz/explanation/jobs/${jobId}/stream`);
+    if (response.status >= 400) {
+      const text = await readStreamText(response.data);
+      let payload = { error: "Quiz explanation job stream failed" };
+      try {
+        payload = JSON.parse(text);
+      } catch {
+        payload.details = text || null;
+      }
+      return res.status(response.status).json(payload);
+    }
+
+    res.status(response.status);
+    res.setHeader("Content-Type", "text/event-stream; charset=utf-8");
+    res.setHeader("Cache-Control", "no-cache, no-transform");
+    res.setHeader("Connection", "keep-alive");
+    res.flushHeaders?.();
+
+    response.data.on("error", (error) => {
+      console.error("[Node] /quiz/explanation/jobs stream upstream error:", error.message);
+      if (!res.writableEnded) {
+        writeSse(res, "error", { error: "Quiz explanation stream interrupted" });
+        res.end();
+      }
+    });
+
+    req.on("close", () => {
+      if (!res.writableEnded && response.data.destroy) {
+        response.data.destroy();
+      }
+    });
+
+    return response.data.pipe(res);
+  } catch (err) {
+    const status = err.response?.status || 500;
+    const payload = err.response?.data || { error: "Quiz explanation job stream failed" };
+    console.error("[Node] /quiz/explanation/jobs stream error:", err.message);
+
+    if (res.headersSent) {
+      writeSse(res, "error", {
+        error: payload?.error || "Quiz explanation job stream failed",
+      });
+      return res.end();
+    }
+
+    return res.status(status).json(payload);
+  }
+};
+
 exports.testQuizExplanation = async (req, res) => {
   const body = req.method === "POST" && req.body && typeof req.body === "object" ? req.body : {};
 
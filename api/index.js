@@ -55,6 +55,8 @@ const {
   predictNearbyZones,
   predictRouteGuide,
   testQuizExplanation,
+  getQuizExplanationJob,
+  streamQuizExplanationJob,
   getCurrentWeather,
   getReversePlace,
   getRiskForecast24h,
@@ -276,6 +278,8 @@ app.post("/api/model/predict", predictDriverRisk);
 app.post("/api/model/predict/stream", predictDriverRiskStream);
 app.get("/api/model/quiz/explanation/test", testQuizExplanation);
 app.post("/api/model/quiz/explanation/test", testQuizExplanation);
+app.get("/api/model/quiz/explanation/jobs/:jobId", getQuizExplanationJob);
+app.get("/api/model/quiz/explanation/jobs/:jobId/stream", streamQuizExplanationJob);
 app.get("/api/weather/current", withRiskDeadline(getCurrentWeather));
 app.get("/api/location/reverse", getReversePlace);
 app.post("/api/risk/current", withRiskDeadline(predictCurrentRisk));
@@ -0,0 +1,271 @@
+"""Disk-backed cache for LLM quiz explanations.
+
+Quiz explanation prompts are deterministic (sorted-key JSON, fixed sampling
+options), so identical quiz outcomes produce near-identical explanations that
+cost seconds to minutes of local LLM time each. This cache stores the final
+explanation text per ``sha256(model, messages, options)`` as one small JSON
+file, so repeat outcomes are served without touching Ollama and survive
+process restarts.
+
+Eviction:
+- Entries older than QUIZ_EXPLANATION_CACHE_MAX_AGE_SECONDS are dropped on
+  read and during pruning.
+- When the directory grows past QUIZ_EXPLANATION_CACHE_MAX_MB, the least
+  recently used entries (file mtime, refreshed on every hit) are removed.
+
+Runtime configuration:
+- QUIZ_EXPLANATION_CACHE_ENABLED=1
+- QUIZ_EXPLANATION_CACHE_DIR=<directory> (default: <tmp>/siara-quiz-explanations)
+- QUIZ_EXPLANATION_CACHE_MAX_MB=64
+- QUIZ_EXPLANATION_CACHE_MAX_AGE_SECONDS=2592000 (30 days)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from services.metrics import note_cache
+
+
+DEFAULT_MAX_MB = 64.0
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600
+CACHE_FORMAT_VERSION = 1
+ENTRY_SUFFIX = ".json"
+
+
+def get_explanation_cache_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    try:
+        max_mb = float(source.get("QUIZ_EXPLANATION_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+    except (TypeError, ValueError):
+        max_mb = DEFAULT_MAX_MB
+    try:
+        max_age_seconds = float(
+            source.get("QUIZ_EXPLANATION_CACHE_MAX_AGE_SECONDS", str(DEFAULT_MAX_AGE_SECONDS))
+        )
+    except (TypeError, ValueError):
+        max_age_seconds = DEFAULT_MAX_AGE_SECONDS
+
+    enabled_raw = str(source.get("QUIZ_EXPLANATION_CACHE_ENABLED", "1")).strip().lower()
+    directory = str(source.get("QUIZ_EXPLANATION_CACHE_DIR", "") or "").strip() or os.path.join(
+        tempfile.gettempdir(), "siara-quiz-explanations"
+    )
+    return {
+        "enabled": enabled_raw not in ("0", "false", "no", "off"),
+        "directory": os.path.abspath(directory),
+        "max_bytes": int(max(0.0, max_mb) * 1024 * 1024),
+        "max_age_seconds": max(0.0, max_age_seconds),
+    }
+
+
+def explanation_cache_key(model: str, messages: List[Dict[str, str]], options: Mapping[str, Any]) -> str:
+    """Stable hash of everything that determines the generated explanation."""
+
+    material = json.dumps(
+        {"model": model, "messages": messages, "options": dict(options)},
+        ensure_ascii=True,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """One JSON file per explanation under ``directory``; safe across threads."""
+
+    def __init__(self, directory: str, *, max_bytes: int, max_age_seconds: float) -> None:
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.max_age_seconds = float(max_age_seconds)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        # Approximate directory size; recomputed whenever the cache is pruned.
+        self._approx_bytes: Optional[int] = None
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{ENTRY_SUFFIX}")
+
+    def _expired(self, created_at: Any, now: float) -> bool:
+        if self.max_age_seconds <= 0:
+            return False
+        try:
+            return now - float(created_at) > self.max_age_seconds
+        except (TypeError, ValueError):
+            return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._read(key)
+        note_cache("quiz_explanation", entry is not None)
+        return entry
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        except (OSError, ValueError):
+            self._discard(path)
+            with self._lock:
+                self._misses += 1
+            return None
+
+        now = time.time()
+        text = entry.get("explanation_text") if isinstance(entry, dict) else None
+        if (
+            not isinstance(text, str)
+            or not text.strip()
+            or entry.get("format_version") != CACHE_FORMAT_VERSION
+            or self._expired(entry.get("created_at"), now)
+        ):
+            self._discard(path)
+            with self._lock:
+                self._misses += 1
+            return None
+
+        try:
+            # mtime doubles as the LRU timestamp.
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        explanation_text: str,
+        *,
+        model: str,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        text = str(explanation_text or "").strip()
+        if not text:
+            return
+        entry = {
+            "format_version": CACHE_FORMAT_VERSION,
+            "key": key,
+            "model": model,
+            "created_at": time.time(),
+            "explanation_text": text,
+            "metadata": dict(metadata or {}),
+        }
+        encoded = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                fh.write(encoded)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            print(f"[quiz-explainer] explanation cache write failed: {exc}")
+            self._discard(tmp_path)
+            return
+
+        with self._lock:
+            self._writes += 1
+            if self._approx_bytes is not None:
+                self._approx_bytes += len(encoded)
+            needs_prune = self._approx_bytes is None or self._approx_bytes > self.max_bytes
+        if needs_prune:
+            self.prune()
+
+    def prune(self) -> Dict[str, int]:
+        """Drop expired entries, then least recently used ones above ``max_bytes``."""
+
+        now = time.time()
+        entries: List[Tuple[float, int, str]] = []
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # mtime >= created_at (it only moves forward on hits), so an mtime
+            # past max_age means the entry itself is expired.
+            if self.max_age_seconds > 0 and now - stat.st_mtime > self.max_age_seconds:
+                removed += self._discard(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        kept = len(entries)
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if self._discard(path):
+                    removed += 1
+                    kept -= 1
+                    total -= size
+
+        with self._lock:
+            self._approx_bytes = total
+            self._evictions += removed
+        return {"entries": kept, "bytes": total, "evicted": removed}
+
+    def _discard(self, path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "approx_bytes": self._approx_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+            }
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHE_INSTANCE: Optional[ExplanationCache] = None
+_CACHE_SIGNATURE: Optional[Tuple[Any, ...]] = None
+
+
+def get_explanation_cache() -> Optional[ExplanationCache]:
+    """Shared cache for the current env configuration, or None when disabled."""
+
+    global _CACHE_INSTANCE, _CACHE_SIGNATURE
+    config = get_explanation_cache_config()
+    if not config["enabled"]:
+        return None
+    signature = (config["directory"], config["max_bytes"], config["max_age_seconds"])
+    with _CACHE_LOCK:
+        if _CACHE_INSTANCE is None or _CACHE_SIGNATURE != signature:
+            _CACHE_INSTANCE = ExplanationCache(
+                config["directory"],
+                max_bytes=config["max_bytes"],
+                max_age_seconds=config["max_age_seconds"],
+            )
+            _CACHE_SIGNATURE = signature
+        return _CACHE_INSTANCE
@@ -0,0 +1,224 @@
+"""Background quiz explanation jobs.
+
+``/predict`` returns the deterministic quiz score straight away and hands the
+LLM prose to a small worker pool. Each job records the same status/chunk/done
+events that ``stream_quiz_explanation`` yields, so clients can either poll the
+final state or subscribe and replay the event stream from the start.
+
+Runtime configuration:
+- QUIZ_EXPLANATION_JOB_WORKERS=2 (background generation threads; generations
+  still go through the Ollama concurrency limiter)
+- QUIZ_EXPLANATION_JOB_TTL_SECONDS=900 (finished jobs are kept this long)
+- QUIZ_EXPLANATION_JOB_MAX=1000 (oldest finished jobs are dropped beyond this)
+- QUIZ_EXPLANATION_JOB_MAX_ACTIVE=8 (pending + running jobs; ``submit``
+  refuses new jobs beyond this so callers answer with the template instead)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generator, Iterable, List, Mapping, Optional, Tuple
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_TTL_SECONDS = 900
+DEFAULT_MAX_JOBS = 1000
+DEFAULT_MAX_ACTIVE = 8
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+
+
+def get_explanation_job_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    try:
+        workers = int(source.get("QUIZ_EXPLANATION_JOB_WORKERS", str(DEFAULT_WORKERS)))
+    except (TypeError, ValueError):
+        workers = DEFAULT_WORKERS
+    try:
+        ttl_seconds = float(source.get("QUIZ_EXPLANATION_JOB_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
+    except (TypeError, ValueError):
+        ttl_seconds = DEFAULT_TTL_SECONDS
+    try:
+        max_jobs = int(source.get("QUIZ_EXPLANATION_JOB_MAX", str(DEFAULT_MAX_JOBS)))
+    except (TypeError, ValueError):
+        max_jobs = DEFAULT_MAX_JOBS
+    try:
+        max_active = int(source.get("QUIZ_EXPLANATION_JOB_MAX_ACTIVE", str(DEFAULT_MAX_ACTIVE)))
+    except (TypeError, ValueError):
+        max_active = DEFAULT_MAX_ACTIVE
+    return {
+        "workers": max(1, workers),
+        "ttl_seconds": max(1.0, ttl_seconds),
+        "max_jobs": max(1, max_jobs),
+        "max_active": max(1, max_active),
+    }
+
+
+class ExplanationJob:
+    """Event log plus final state for one explanation generation."""
+
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.status = JOB_PENDING
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._cond = threading.Condition()
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        with self._cond:
+            self.events.append(event)
+            if event.get("event") == "done":
+                self.result = {key: value for key, value in event.items() if key != "event"}
+            self._cond.notify_all()
+
+    def _finish(self, error: Optional[str] = None) -> None:
+        with self._cond:
+            self.status = JOB_DONE
+            self.finished_at = time.time()
+            self.error = error
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            result = dict(self.result or {})
+            payload = {
+                "job_id": self.job_id,
+                "status": self.status,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+                "explanation_text": result.get("explanation_text"),
+                "structured_explanation": result.get("structured_explanation"),
+                "fallback": result.get("fallback"),
+                "cached": result.get("cached", False),
+                "metadata": result.get("metadata"),
+            }
+            if self.error:
+                payload["error"] = self.error
+            return payload
+
+    def events_since(self, index: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Non-blocking read: events after ``index`` and whether the job ended."""
+
+        with self._cond:
+            pending = self.events[index:]
+            return pending, self.status == JOB_DONE and index + len(pending) >= len(self.events)
+
+    def follow(self, heartbeat_seconds: float = 15.0) -> Generator[Optional[Dict[str, Any]], None, None]:
+        """Replay recorded events, then follow live ones until the job ends.
+
+        Yields None as a heartbeat when nothing happened for
+        ``heartbeat_seconds`` so callers can keep idle connections alive.
+        """
+
+        index = 0
+        while True:
+            with self._cond:
+                if index >= len(self.events) and self.status != JOB_DONE:
+                    self._cond.wait(heartbeat_seconds)
+                pending = self.events[index:]
+                index += len(pending)
+                finished = self.status == JOB_DONE and index >= len(self.events)
+            if not pending and not finished:
+                yield None
+            for event in pending:
+                yield event
+            if finished:
+                return
+
+
+class ExplanationJobRunner:
+    """Submits explanation generators to a thread pool and keeps their jobs."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        ttl_seconds: float,
+        max_jobs: int,
+        max_active: int = DEFAULT_MAX_ACTIVE,
+    ) -> None:
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_jobs = int(max_jobs)
+        self.max_active = int(max_active)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quiz-explain")
+        self._jobs: "OrderedDict[str, ExplanationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._rejected = 0
+
+    def submit(self, make_events: Callable[[], Iterable[Dict[str, Any]]]) -> Optional[ExplanationJob]:
+        """Queue a job, or return None when ``max_active`` jobs are already
+        pending or running (the executor queue itself is unbounded)."""
+
+        job = ExplanationJob(uuid.uuid4().hex)
+        with self._lock:
+            if self._active >= self.max_active:
+                self._rejected += 1
+                return None
+            self._active += 1
+            self._prune_locked()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, make_events)
+        return job
+
+    def pending_count(self) -> int:
+        """Jobs queued but not started yet (their generations are not in the limiter)."""
+
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == JOB_PENDING)
+
+    def get(self, job_id: str) -> Optional[ExplanationJob]:
+        with self._lock:
+            self._prune_locked()
+            return self._jobs.get(job_id)
+
+    def _run(self, job: ExplanationJob, make_events: Callable[[], Iterable[Dict[str, Any]]]) -> None:
+        job.status = JOB_RUNNING
+        error = None
+        try:
+            for event in make_events():
+                job._append(event)
+        except Exception as exc:
+            error = f"Explanation job failed: {exc}"
+            print(f"[quiz-explainer] job {job.job_id} failed: {exc}")
+        finally:
+            job._finish(error)
+            with self._lock:
+                self._active -= 1
+
+    def _prune_locked(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl_seconds:
+                del self._jobs[job_id]
+        # Jobs are kept in submission order; drop the oldest finished ones.
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            for job_id, job in list(self._jobs.items()):
+                if excess <= 0:
+                    break
+                if job.finished_at is not None:
+                    del self._jobs[job_id]
+                    excess -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {JOB_PENDING: 0, JOB_RUNNING: 0, JOB_DONE: 0}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                "jobs": len(self._jobs),
+                **counts,
+                "max_active": self.max_active,
+                "rejected": self._rejected,
+            }
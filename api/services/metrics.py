@@ -0,0 +1,418 @@
+"""In-process metrics served in the Prometheus text exposition format.
+
+The service used to report timings only through ad-hoc ``print`` lines. This
+module keeps counters, gauges and fixed-bucket histograms in memory, keyed by
+label values, and renders them for ``GET /metrics``. Recording is a dict
+lookup plus one short lock, so instrumenting every request and model stage
+costs microseconds.
+
+Values that already live elsewhere (cache hit counts, queue depths) are not
+copied on every request: collectors registered with ``add_collector`` read
+them at scrape time.
+
+``StageTimer`` also collects the stages and row counts of the current request
+(``RequestTimings``, bound with ``start_request_timings``), which the service
+returns as a ``Server-Timing`` header; ``note_cache`` adds cache hits/misses.
+
+Runtime configuration:
+- METRICS_ENABLED=1 (0 removes the /metrics route and the request hooks)
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+
+# Seconds; covers sub-millisecond model stages up to multi-second LLM calls.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_REQUEST_TIMINGS: ContextVar[Optional["RequestTimings"]] = ContextVar("siara_request_timings", default=None)
+
+# (name, type, help, [(labels, value), ...]) rows produced by a collector.
+CollectedMetric = Tuple[str, str, str, List[Tuple[Mapping[str, Any], float]]]
+
+
+def get_metrics_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    enabled_raw = str(source.get("METRICS_ENABLED", "1")).strip().lower()
+    return {"enabled": enabled_raw not in ("0", "false", "no", "off")}
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _label_map(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(self._label_map(key), child))
+        return lines
+
+    def _render_child(self, labels: Dict[str, str], child: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(child.get())}"]
+
+
+class _Value:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    def get(self) -> float:
+        with self._lock:
+            return self._value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    @contextmanager
+    def track_inprogress(self, *values: Any) -> Iterator[None]:
+        child = self.labels(*values)
+        child.inc()
+        try:
+            yield
+        finally:
+            child.dec()
+
+
+class _HistogramValue:
+    __slots__ = ("_upper_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]) -> None:
+        self._upper_bounds = upper_bounds
+        # One slot per bucket plus the +Inf overflow; cumulated at render time.
+        self._counts = [0] * (len(upper_bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    @contextmanager
+    def time(self, *values: Any) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block, in seconds."""
+
+        child = self.labels(*values)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            child.observe(time.perf_counter() - started_at)
+
+    def timed(self, *values: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of ``time``."""
+
+        def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+            child = self.labels(*values)
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                started_at = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    child.observe(time.perf_counter() - started_at)
+
+            return wrapper
+
+        return decorate
+
+    def _render_child(self, labels: Dict[str, str], child: _HistogramValue) -> List[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            bucket_labels = {**labels, "le": _format_value(bound)}
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors; renders the text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[CollectedMetric]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                collected = list(collector())
+            except Exception as exc:
+                lines.append(f"# collector {getattr(collector, '__name__', 'collector')} failed: {exc}")
+                continue
+            for name, kind, help_text, samples in collected:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(float(value))}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimings:
+    """Stage durations, row counts and cache lookups of one request, in first-seen order."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}
+        self.rows: Dict[str, int] = {}
+        self.caches: Dict[str, Dict[str, int]] = {}
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def add_rows(self, model: str, count: int) -> None:
+        self.rows[model] = self.rows.get(model, 0) + int(count)
+
+    def add_cache(self, cache: str, hit: bool) -> None:
+        entry = self.caches.setdefault(cache, {"hits": 0, "misses": 0})
+        entry["hits" if hit else "misses"] += 1
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started_at) * 1000.0, 2)
+
+    def server_timing_header(self) -> str:
+        """``name;dur=<ms>`` entries (repeated stages summed) plus ``total``."""
+
+        entries = [f"{name};dur={seconds * 1000.0:.2f}" for name, (seconds, _count) in self.stages.items()]
+        entries.append(f"total;dur={self.elapsed_ms():.2f}")
+        return ", ".join(entries)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": self.elapsed_ms(),
+            "stages": {
+                name: {"ms": round(seconds * 1000.0, 3), "calls": count}
+                for name, (seconds, count) in self.stages.items()
+            },
+            "rows": dict(self.rows),
+            "caches": {cache: dict(counts) for cache, counts in self.caches.items()},
+        }
+
+
+def start_request_timings() -> RequestTimings:
+    """Bind a fresh ``RequestTimings`` to the current context."""
+
+    timings = RequestTimings()
+    _REQUEST_TIMINGS.set(timings)
+    return timings
+
+
+def stop_request_timings() -> None:
+    # Not a token reset: streamed WSGI responses may finish on another thread.
+    _REQUEST_TIMINGS.set(None)
+
+
+def current_request_timings() -> Optional[RequestTimings]:
+    return _REQUEST_TIMINGS.get()
+
+
+def note_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup on the current request (no-op outside one)."""
+
+    timings = _REQUEST_TIMINGS.get()
+    if timings is not None:
+        timings.add_cache(cache, hit)
+
+
+class StageTimer:
+    """Times ``(model, stage)`` blocks into a histogram and the current request.
+
+    Row counts go to a ``(model,)`` counter and the current request too.
+    Request entries are named ``<model>.<stage>`` (a valid Server-Timing token).
+    """
+
+    def __init__(self, histogram: Histogram, rows_counter: Counter) -> None:
+        self.histogram = histogram
+        self.rows_counter = rows_counter
+
+    @contextmanager
+    def time(self, model: str, stage: str) -> Iterator[None]:
+        child = self.histogram.labels(model, stage)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            child.observe(elapsed)
+            timings = _REQUEST_TIMINGS.get()
+            if timings is not None:
+                timings.add_stage(f"{model}.{stage}", elapsed)
+
+    def timed(self, model: str, stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.time(model, stage):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def rows(self, model: str, count: int = 1) -> None:
+        self.rows_counter.labels(model).inc(count)
+        timings = _REQUEST_TIMINGS.get()
+        if timings is not None:
+            timings.add_rows(model, count)
@@ -0,0 +1,537 @@
+"""In-process rolling-count feature store for the occurrence model.
+
+Five of the 23 ``occurrence_beta_v1`` features are accident history counts:
+
+- past_segment_positive_count
+- past_segment_positive_count_7d
+- past_segment_positive_count_30d
+- past_road_class_positive_count
+- past_segment_hourofweek_count
+
+Node used to assemble them with PostGIS ``count(*)`` queries for every
+request. This store ingests accident events incrementally and answers the same
+questions from plain counters plus a short window of recent event times, so the
+Flask service can fill them in when a request omits them.
+
+Every count uses the same bounds as Node's ``loadTrainedPastSegmentCounts`` /
+``loadTrainedPastRoadClassCount``: only events strictly before the scored
+instant ``at`` are counted, and the 7d/30d windows are ``[at - 7d, at)`` /
+``[at - 30d, at)``. Events recorded at or after ``at`` (late ingestion, or
+re-scoring a past time bucket) therefore never leak into the features.
+
+Layout:
+- All-time counters per segment, per (segment, hour-of-week) and per
+  lower-cased road class (only keys with at least one event; others resolve
+  to 0). ``how = sunday_based_weekday * 24 + hour`` (UTC), matching
+  ``trainedTimePartsFromBucket`` on the Node side.
+- Recent event times per segment and per road class, as sorted
+  epoch-microsecond ``array('q')`` lists. Only the last
+  ``OCCURRENCE_FEATURE_STORE_RETAIN_DAYS`` before the newest ingested event
+  (the horizon) are kept, so memory and snapshots stay bounded whatever the
+  history length. The 7d/30d windows are binary searches in these lists, and
+  "before ``at``" totals are the counters minus the recent events at or after
+  ``at``.
+- A count whose bounds reach behind the horizon cannot be answered exactly;
+  it is left out, so the model sees it as missing (all-time counts need
+  ``at`` after the horizon, the 7d/30d windows ``at - 30d``).
+
+Runtime configuration:
+- OCCURRENCE_FEATURE_STORE_PATH=<path to .npz snapshot> (optional; restored at
+  startup and written by the snapshot endpoint / on shutdown)
+- OCCURRENCE_FEATURE_STORE_RETAIN_DAYS=45 (at least 30, the longest window)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+HISTORY_COUNT_FEATURES = (
+    "past_segment_positive_count",
+    "past_segment_positive_count_7d",
+    "past_segment_positive_count_30d",
+    "past_road_class_positive_count",
+    "past_segment_hourofweek_count",
+)
+
+HOURS_PER_WEEK = 168
+MICROS_PER_HOUR = 3600 * 1_000_000
+MICROS_PER_DAY = 24 * MICROS_PER_HOUR
+WINDOW_DAYS = (7, 30)
+DEFAULT_RETAIN_DAYS = 45.0
+SNAPSHOT_FORMAT_VERSION = 3
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TIME_TYPECODE = "q"
+
+
+class FeatureStoreError(ValueError):
+    """Raised for malformed events or snapshot files."""
+
+
+def get_feature_store_path(env: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    source = env or os.environ
+    path = str(source.get("OCCURRENCE_FEATURE_STORE_PATH", "") or "").strip()
+    return os.path.abspath(path) if path else None
+
+
+def get_feature_store_retain_days(env: Optional[Mapping[str, str]] = None) -> float:
+    source = env or os.environ
+    try:
+        days = float(source.get("OCCURRENCE_FEATURE_STORE_RETAIN_DAYS", str(DEFAULT_RETAIN_DAYS)))
+    except (TypeError, ValueError):
+        days = DEFAULT_RETAIN_DAYS
+    return max(float(max(WINDOW_DAYS)), days)
+
+
+def parse_event_time(value: Any) -> datetime:
+    """Accept ISO-8601 strings or epoch seconds / milliseconds; return UTC."""
+
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        seconds = float(value)
+        if not np.isfinite(seconds):
+            raise FeatureStoreError("event time must be finite")
+        # Anything past year ~2286 in seconds is a millisecond timestamp.
+        if abs(seconds) > 1e10:
+            seconds /= 1000.0
+        parsed = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    elif isinstance(value, str) and value.strip():
+        text = value.strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError as exc:
+            raise FeatureStoreError(f"invalid event time: {value!r}") from exc
+    else:
+        raise FeatureStoreError("event time is required")
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def hour_of_week(moment: datetime) -> int:
+    """Sunday-based hour-of-week (0..167), the convention the model was trained on."""
+
+    sunday_based_weekday = (moment.weekday() + 1) % 7
+    return sunday_based_weekday * 24 + moment.hour
+
+
+def _epoch_micros(moment: datetime) -> int:
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+def _hours_of_week(micros: np.ndarray) -> np.ndarray:
+    """``hour_of_week`` for epoch-microsecond times (1970-01-01 was a Thursday)."""
+
+    hours = micros // MICROS_PER_HOUR
+    return ((hours // 24 + 4) % 7) * 24 + hours % 24
+
+
+def _normalize_segment_id(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _normalize_road_class(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    return text or None
+
+
+class OccurrenceFeatureStore:
+    """Thread-safe counter store for the occurrence history features."""
+
+    def __init__(self, *, retain_days: float = DEFAULT_RETAIN_DAYS) -> None:
+        self.retain_days = max(float(max(WINDOW_DAYS)), float(retain_days))
+        self._retain_micros = int(self.retain_days * MICROS_PER_DAY)
+        self._lock = threading.Lock()
+        self._segment_totals: Dict[str, int] = {}
+        self._segment_how_totals: Dict[Tuple[str, int], int] = {}
+        self._road_class_totals: Dict[str, int] = {}
+        self._segment_recent: Dict[str, array] = {}
+        self._road_class_recent: Dict[str, array] = {}
+        # Newest ingested event time; recent lists hold every event from
+        # ``_horizon = _newest - retain`` on (older ones are pruned lazily).
+        self._newest: Optional[int] = None
+        self._horizon: Optional[int] = None
+        self._pruned_horizon: Optional[int] = None
+        self._events_ingested = 0
+        self._last_event_at: Optional[str] = None
+
+    # ---- ingestion
+    def ingest(self, events: Iterable[Mapping[str, Any]]) -> Dict[str, int]:
+        """Add accident events. Each event needs an event time plus a segment id
+        and/or road class: ``{"segment_id", "road_class", "event_time"}``.
+
+        Events are counted as given; de-duplication is the caller's job (send
+        each accident once, e.g. by polling on a monotonically increasing id).
+        Events may arrive in any order.
+        """
+
+        parsed: List[Tuple[Optional[str], Optional[str], datetime]] = []
+        rejected = 0
+        for event in events or []:
+            if not isinstance(event, Mapping):
+                rejected += 1
+                continue
+            segment_id = _normalize_segment_id(
+                event.get("segment_id", event.get("road_segment_id"))
+            )
+            road_class = _normalize_road_class(event.get("road_class"))
+            raw_time = event.get("event_time", event.get("timestamp"))
+            if segment_id is None and road_class is None:
+                rejected += 1
+                continue
+            try:
+                moment = parse_event_time(raw_time)
+            except FeatureStoreError:
+                rejected += 1
+                continue
+            parsed.append((segment_id, road_class, moment))
+
+        with self._lock:
+            for segment_id, road_class, moment in parsed:
+                self._add_locked(segment_id, road_class, _epoch_micros(moment), hour_of_week(moment))
+                self._last_event_at = moment.isoformat()
+            self._prune_locked()
+
+        return {"accepted": len(parsed), "rejected": rejected}
+
+    def _add_locked(self, segment_id: Optional[str], road_class: Optional[str], micros: int, how: int) -> None:
+        if self._newest is None or micros > self._newest:
+            self._newest = micros
+            self._horizon = micros - self._retain_micros
+        recent = micros >= self._horizon
+        if segment_id is not None:
+            self._segment_totals[segment_id] = self._segment_totals.get(segment_id, 0) + 1
+            how_key = (segment_id, how)
+            self._segment_how_totals[how_key] = self._segment_how_totals.get(how_key, 0) + 1
+            if recent:
+                # In-order arrival (the common case) makes insort an append.
+                insort(self._segment_recent.setdefault(segment_id, array(_TIME_TYPECODE)), micros)
+        if road_class is not None:
+            self._road_class_totals[road_class] = self._road_class_totals.get(road_class, 0) + 1
+            if recent:
+                insort(self._road_class_recent.setdefault(road_class, array(_TIME_TYPECODE)), micros)
+        self._events_ingested += 1
+
+    def _prune_locked(self, force: bool = False) -> None:
+        """Drop recent times behind the horizon, at most once per day of advance."""
+
+        horizon = self._horizon
+        if horizon is None:
+            return
+        if not force and self._pruned_horizon is not None and horizon - self._pruned_horizon < MICROS_PER_DAY:
+            return
+        for groups in (self._segment_recent, self._road_class_recent):
+            for key in list(groups):
+                times = groups[key]
+                stale = bisect_left(times, horizon)
+                if stale == len(times):
+                    del groups[key]
+                elif stale:
+                    del times[:stale]
+        self._pruned_horizon = horizon
+
+    # ---- lookups
+    def is_populated(self) -> bool:
+        """Whether any event has been ingested or restored from a snapshot."""
+
+        with self._lock:
+            return self._events_ingested > 0
+
+    @staticmethod
+    def _count_before(times: Optional[array], end: int, start: Optional[int] = None) -> int:
+        """Events in ``[start, end)`` (``start=None``: everything before ``end``)."""
+
+        if not times:
+            return 0
+        count = bisect_left(times, end)
+        if start is not None:
+            count -= bisect_left(times, start)
+        return max(0, count)
+
+    def counts_for(
+        self,
+        *,
+        segment_id: Any = None,
+        road_class: Any = None,
+        at: Any = None,
+    ) -> Dict[str, int]:
+        """Return the history-count features for one segment at time ``at``.
+
+        Only events strictly before ``at`` are counted. Segment-level counts
+        are only returned when ``segment_id`` is given, the road-class count
+        only when ``road_class`` is given, and none whose bounds reach behind
+        the retention horizon.
+        """
+
+        moment = parse_event_time(at) if at is not None else datetime.now(timezone.utc)
+        end = _epoch_micros(moment)
+        how = hour_of_week(moment)
+        seg_key = _normalize_segment_id(segment_id)
+        class_key = _normalize_road_class(road_class)
+
+        counts: Dict[str, int] = {}
+        with self._lock:
+            horizon = self._horizon
+            totals_known = horizon is None or end >= horizon
+            windows_known = horizon is None or end - max(WINDOW_DAYS) * MICROS_PER_DAY >= horizon
+            if seg_key is not None:
+                times = self._segment_recent.get(seg_key)
+                if totals_known:
+                    later = self._later_than(times, end)
+                    counts["past_segment_positive_count"] = self._segment_totals.get(seg_key, 0) - len(later)
+                    counts["past_segment_hourofweek_count"] = self._segment_how_totals.get(
+                        (seg_key, how), 0
+                    ) - int((_hours_of_week(later) == how).sum())
+                if windows_known:
+                    for days in WINDOW_DAYS:
+                        counts[f"past_segment_positive_count_{days}d"] = self._count_before(
+                            times, end, end - days * MICROS_PER_DAY
+                        )
+            if class_key is not None and totals_known:
+                counts["past_road_class_positive_count"] = self._road_class_totals.get(class_key, 0) - len(
+                    self._later_than(self._road_class_recent.get(class_key), end)
+                )
+        return counts
+
+    @staticmethod
+    def _later_than(times: Optional[array], end: int) -> np.ndarray:
+        """Recent event times at or after ``end`` (usually none)."""
+
+        if not times:
+            return np.zeros(0, dtype=np.int64)
+        return np.frombuffer(times, dtype=np.int64)[bisect_left(times, end) :]
+
+    def fill_missing(
+        self,
+        features: Dict[str, Any],
+        *,
+        segment_id: Any = None,
+        at: Any = None,
+    ) -> List[str]:
+        """Fill omitted (absent or null) history counts in ``features`` in place.
+
+        Returns the list of feature names that were filled. Values the caller
+        sent explicitly are never overwritten. Until the store holds events
+        (ingested or restored) nothing is filled: an empty store cannot tell
+        "no accidents" from "never fed", and the model handles the missing
+        counts better than a made-up zero history.
+        """
+
+        wanted = [name for name in HISTORY_COUNT_FEATURES if features.get(name) is None]
+        if not wanted or not self.is_populated():
+            return []
+        road_class = features.get("road_class")
+        try:
+            counts = self.counts_for(segment_id=segment_id, road_class=road_class, at=at)
+        except FeatureStoreError:
+            return []
+        filled = []
+        for name in wanted:
+            if name in counts:
+                features[name] = counts[name]
+                filled.append(name)
+        return filled
+
+    # ---- persistence
+    @staticmethod
+    def _pack(keys: List[Any], groups: Mapping[Any, array]) -> Tuple[np.ndarray, np.ndarray]:
+        """``(offsets, times)``: CSR layout of the sorted time lists of ``keys``."""
+
+        lengths = np.asarray([len(groups.get(key) or ()) for key in keys], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        parts = [np.frombuffer(groups[key], dtype=np.int64) for key in keys if groups.get(key)]
+        times = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        return offsets, times
+
+    def snapshot(self, path: str) -> Dict[str, Any]:
+        """Write the store to ``path`` (``.npz``) atomically."""
+
+        resolved = os.path.abspath(path)
+        directory = os.path.dirname(resolved)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{resolved}.tmp"
+        with self._lock:
+            self._prune_locked(force=True)
+            segment_ids = list(self._segment_totals)
+            segment_row = {segment_id: row for row, segment_id in enumerate(segment_ids)}
+            how_keys = list(self._segment_how_totals)
+            road_classes = list(self._road_class_totals)
+            segment_offsets, segment_times = self._pack(segment_ids, self._segment_recent)
+            road_class_offsets, road_class_times = self._pack(road_classes, self._road_class_recent)
+            arrays = {
+                "format_version": np.asarray([SNAPSHOT_FORMAT_VERSION], dtype=np.int64),
+                "events_ingested": np.asarray([self._events_ingested], dtype=np.int64),
+                "newest": np.asarray([-1 if self._newest is None else self._newest], dtype=np.int64),
+                "has_newest": np.asarray([self._newest is not None], dtype=bool),
+                "segment_ids": np.asarray(segment_ids, dtype=np.str_),
+                "segment_totals": np.asarray([self._segment_totals[key] for key in segment_ids], dtype=np.int64),
+                "how_rows": np.asarray([segment_row[key[0]] for key in how_keys], dtype=np.int64),
+                "how_values": np.asarray([key[1] for key in how_keys], dtype=np.int64),
+                "how_totals": np.asarray([self._segment_how_totals[key] for key in how_keys], dtype=np.int64),
+                "segment_offsets": segment_offsets,
+                "segment_times": segment_times,
+                "road_classes": np.asarray(road_classes, dtype=np.str_),
+                "road_class_totals": np.asarray(
+                    [self._road_class_totals[key] for key in road_classes], dtype=np.int64
+                ),
+                "road_class_offsets": road_class_offsets,
+                "road_class_times": road_class_times,
+                "last_event_at": np.asarray([self._last_event_at or ""], dtype=np.str_),
+            }
+        # np.savez appends .npz unless the name already ends with it; write via a
+        # file handle so the temporary name is kept verbatim.
+        with open(tmp_path, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp_path, resolved)
+        return {"path": resolved, "segments": len(segment_ids), "road_classes": len(road_classes)}
+
+    @staticmethod
+    def _unpack(keys: List[str], offsets: np.ndarray, times: np.ndarray) -> Dict[str, array]:
+        if offsets.shape != (len(keys) + 1,) or (len(keys) and offsets[-1] != len(times)):
+            raise FeatureStoreError("snapshot arrays have inconsistent shapes")
+        return {
+            key: array(_TIME_TYPECODE, np.sort(times[offsets[row] : offsets[row + 1]]).tobytes())
+            for row, key in enumerate(keys)
+            if offsets[row + 1] > offsets[row]
+        }
+
+    def restore(self, path: str) -> Dict[str, Any]:
+        """Replace the store contents with the snapshot at ``path``."""
+
+        resolved = os.path.abspath(path)
+        try:
+            with np.load(resolved, allow_pickle=False) as data:
+                version = int(data["format_version"][0])
+                if version == 2:
+                    restored = self._restore_event_times(data)
+                elif version == SNAPSHOT_FORMAT_VERSION:
+                    restored = self._restore_counters(data)
+                else:
+                    # Format 1 kept day buckets without event times, which cannot
+                    # answer "strictly before at"; re-ingest the events instead.
+                    raise FeatureStoreError(f"unsupported snapshot format {version}")
+        except KeyError as exc:
+            raise FeatureStoreError(f"snapshot is missing {exc}") from exc
+
+        with self._lock:
+            (
+                self._segment_totals,
+                self._segment_how_totals,
+                self._road_class_totals,
+                self._segment_recent,
+                self._road_class_recent,
+                self._newest,
+                self._events_ingested,
+                self._last_event_at,
+            ) = restored
+            self._horizon = None if self._newest is None else self._newest - self._retain_micros
+            self._pruned_horizon = None
+            self._prune_locked()
+        return {"path": resolved, "segments": len(self._segment_totals), "road_classes": len(self._road_class_totals)}
+
+    def _restore_counters(self, data: Any) -> Tuple[Any, ...]:
+        segment_ids = [str(key) for key in data["segment_ids"].tolist()]
+        road_classes = [str(key) for key in data["road_classes"].tolist()]
+        segment_totals = dict(zip(segment_ids, data["segment_totals"].tolist()))
+        how_totals = {
+            (segment_ids[row], how): count
+            for row, how, count in zip(
+                data["how_rows"].tolist(), data["how_values"].tolist(), data["how_totals"].tolist()
+            )
+        }
+        road_class_totals = dict(zip(road_classes, data["road_class_totals"].tolist()))
+        segment_recent = self._unpack(
+            segment_ids,
+            np.asarray(data["segment_offsets"], dtype=np.int64),
+            np.asarray(data["segment_times"], dtype=np.int64),
+        )
+        road_class_recent = self._unpack(
+            road_classes,
+            np.asarray(data["road_class_offsets"], dtype=np.int64),
+            np.asarray(data["road_class_times"], dtype=np.int64),
+        )
+        newest = int(data["newest"][0]) if bool(data["has_newest"][0]) else None
+        return (
+            segment_totals,
+            how_totals,
+            road_class_totals,
+            segment_recent,
+            road_class_recent,
+            newest,
+            int(data["events_ingested"][0]),
+            str(data["last_event_at"][0]) or None,
+        )
+
+    def _restore_event_times(self, data: Any) -> Tuple[Any, ...]:
+        """Fold a format-2 snapshot (every event time) into counters."""
+
+        segment_ids = [str(key) for key in data["segment_ids"].tolist()]
+        road_classes = [str(key) for key in data["road_classes"].tolist()]
+        segments = self._unpack(
+            segment_ids,
+            np.asarray(data["segment_offsets"], dtype=np.int64),
+            np.asarray(data["segment_times"], dtype=np.int64),
+        )
+        by_class = self._unpack(
+            road_classes,
+            np.asarray(data["road_class_offsets"], dtype=np.int64),
+            np.asarray(data["road_class_times"], dtype=np.int64),
+        )
+        newest_candidates = [times[-1] for times in list(segments.values()) + list(by_class.values())]
+        newest = max(newest_candidates) if newest_candidates else None
+        horizon = None if newest is None else newest - self._retain_micros
+
+        def recent(times: array) -> array:
+            return times if horizon is None else array(_TIME_TYPECODE, times[bisect_left(times, horizon) :])
+
+        how_totals: Dict[Tuple[str, int], int] = {}
+        for segment_id, times in segments.items():
+            hows, counts = np.unique(_hours_of_week(np.frombuffer(times, dtype=np.int64)), return_counts=True)
+            for how, count in zip(hows.tolist(), counts.tolist()):
+                how_totals[(segment_id, how)] = count
+        return (
+            {segment_id: len(times) for segment_id, times in segments.items()},
+            how_totals,
+            {road_class: len(times) for road_class, times in by_class.items()},
+            {segment_id: recent(times) for segment_id, times in segments.items()},
+            {road_class: recent(times) for road_class, times in by_class.items()},
+            newest,
+            int(data["events_ingested"][0]),
+            str(data["last_event_at"][0]) or None,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lists = list(self._segment_recent.values()) + list(self._road_class_recent.values())
+            return {
+                "populated": self._events_ingested > 0,
+                "segments": len(self._segment_totals),
+                "road_classes": len(self._road_class_totals),
+                "events_ingested": self._events_ingested,
+                "last_event_at": self._last_event_at,
+                "retain_days": self.retain_days,
+                "horizon": None
+                if self._horizon is None
+                else (_EPOCH + timedelta(microseconds=self._horizon)).isoformat(),
+                "recent_events": int(sum(len(times) for times in lists)),
+                "array_bytes": int(sum(len(times) * times.itemsize for times in lists)),
+            }
@@ -11,18 +11,45 @@ Runtime configuration:
 - OLLAMA_BASE_URL=http://localhost:11434
 - OLLAMA_TIMEOUT_SECONDS=60
 - OLLAMA_STREAM_READ_TIMEOUT_SECONDS=300
+- OLLAMA_MAX_CONCURRENCY=1 (generations allowed to hit Ollama at once; the
+  rest wait in a FIFO queue)
+- OLLAMA_QUEUE_WAIT_BUDGET_SECONDS=45 (queued requests that would wait longer
+  fall back to the template explanation)
+- OLLAMA_KEEP_ALIVE=30m (how long Ollama keeps the model, and the evaluated
+  SYSTEM_PROMPT prefix in its KV cache, resident between requests)
+- OLLAMA_WARM_KEEPER=1 (preload the model at start and keep it loaded)
+- OLLAMA_WARM_PING_SECONDS=240 (keep-alive ping interval)
+- OLLAMA_WARM_IDLE_WINDOW_SECONDS=43200 (stop pinging after this long without
+  explanations, letting Ollama unload the model)
+- OLLAMA_WARM_HOURS= (optional local-hour range such as ``6-23`` during which
+  the model is always kept warm)
+- QUIZ_PROMPT_JSON_STYLE=compact (single-line result JSON; ``indented`` keeps
+  the old pretty-printed payload for before/after prompt-eval comparisons)
+
+Generated explanations are cached on disk per (model, prompt, options); see
+``services.explanation_cache`` for the QUIZ_EXPLANATION_CACHE_* settings.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
+import threading
 import time
-from typing import Any, Dict, Generator, Iterable, List, Mapping, Optional
+from collections import deque
+from typing import Any, AsyncGenerator, Dict, Generator, Iterable, List, Mapping, Optional, Tuple
 
 import requests
 
+try:  # only needed by the asyncio stream path (contollers/Model/ml_asgi.py)
+    import httpx
+except ImportError:
+    httpx = None
+
+from services.explanation_cache import explanation_cache_key, get_explanation_cache
+
 
 DEFAULT_PROVIDER = "ollama"
 DEFAULT_MODEL = "gemma3:4b"
@@ -30,6 +57,20 @@ DEFAULT_BASE_URL = "http://localhost:11434"
 DEFAULT_TIMEOUT_SECONDS = 60
 DEFAULT_STREAM_READ_TIMEOUT_SECONDS = 300
 DEFAULT_CONNECT_TIMEOUT_SECONDS = 10
+DEFAULT_KEEP_ALIVE = "30m"
+DEFAULT_PROMPT_JSON_STYLE = "compact"
+PROMPT_STATS_WINDOW = 200
+DEFAULT_WARM_PING_SECONDS = 240
+DEFAULT_WARM_IDLE_WINDOW_SECONDS = 12 * 3600
+WARM_RETRY_SECONDS = 15.0
+DEFAULT_MAX_CONCURRENCY = 1
+DEFAULT_QUEUE_WAIT_BUDGET_SECONDS = 45
+QUEUE_STATUS_INTERVAL_SECONDS = 1.0
+ASYNC_QUEUE_POLL_SECONDS = 0.25
+OLLAMA_OPTIONS = {
+    "temperature": 0.2,
+    "top_p": 0.9,
+}
 
 
 class QuizExplainerError(RuntimeError):
@@ -40,6 +81,10 @@ class OllamaUnavailableError(QuizExplainerError):
     """Raised when the local Ollama service cannot produce an explanation."""
 
 
+class OllamaBusyError(OllamaUnavailableError):
+    """Raised when a generation slot is not available within the wait budget."""
+
+
 SYSTEM_PROMPT = """You are SIARA's driver quiz result explainer.
 
 The Python backend has already computed the quiz risk label and score using deterministic scoring logic. You must explain only the provided structured result. Never calculate, recalculate, adjust, override, infer, or dispute the score, risk label, factor scores, probabilities, or ranking.
@@ -85,6 +130,20 @@ def get_quiz_explainer_config(env: Optional[Mapping[str, str]] = None) -> Dict[s
         connect_timeout_seconds = float(connect_timeout_raw)
     except (TypeError, ValueError):
         connect_timeout_seconds = DEFAULT_CONNECT_TIMEOUT_SECONDS
+    try:
+        max_concurrency = int(source.get("OLLAMA_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY)))
+    except (TypeError, ValueError):
+        max_concurrency = DEFAULT_MAX_CONCURRENCY
+    try:
+        queue_wait_budget_seconds = float(
+            source.get("OLLAMA_QUEUE_WAIT_BUDGET_SECONDS", str(DEFAULT_QUEUE_WAIT_BUDGET_SECONDS))
+        )
+    except (TypeError, ValueError):
+        queue_wait_budget_seconds = DEFAULT_QUEUE_WAIT_BUDGET_SECONDS
+
+    prompt_json_style = str(source.get("QUIZ_PROMPT_JSON_STYLE", DEFAULT_PROMPT_JSON_STYLE)).strip().lower()
+    if prompt_json_style not in ("compact", "indented"):
+        prompt_json_style = DEFAULT_PROMPT_JSON_STYLE
 
     return {
         "provider": source.get("LLM_PROVIDER", DEFAULT_PROVIDER).strip().lower() or DEFAULT_PROVIDER,
@@ -93,9 +152,414 @@ def get_quiz_explainer_config(env: Optional[Mapping[str, str]] = None) -> Dict[s
         "timeout_seconds": max(1.0, timeout_seconds),
         "stream_read_timeout_seconds": max(1.0, stream_read_timeout_seconds),
         "connect_timeout_seconds": max(1.0, connect_timeout_seconds),
+        "max_concurrency": max(1, max_concurrency),
+        "queue_wait_budget_seconds": max(0.0, queue_wait_budget_seconds),
+        "keep_alive": str(source.get("OLLAMA_KEEP_ALIVE", DEFAULT_KEEP_ALIVE)).strip() or DEFAULT_KEEP_ALIVE,
+        "prompt_json_style": prompt_json_style,
     }
 
 
+class _PromptStats:
+    """Rolling prompt-eval / time-to-first-token samples per prompt JSON style."""
+
+    def __init__(self, window: int = PROMPT_STATS_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+
+    def record(
+        self,
+        style: str,
+        *,
+        prompt_eval_count: Optional[int],
+        prompt_eval_ms: Optional[float],
+        ttft_ms: Optional[float],
+    ) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(style, deque(maxlen=self._window))
+            samples.append((prompt_eval_count, prompt_eval_ms, ttft_ms))
+
+    def snapshot(self) -> Dict[str, Any]:
+        def mean(values: List[Optional[float]]) -> Optional[float]:
+            present = [float(v) for v in values if v is not None]
+            return round(sum(present) / len(present), 1) if present else None
+
+        with self._lock:
+            return {
+                style: {
+                    "samples": len(samples),
+                    "mean_prompt_eval_count": mean([sample[0] for sample in samples]),
+                    "mean_prompt_eval_ms": mean([sample[1] for sample in samples]),
+                    "mean_time_to_first_token_ms": mean([sample[2] for sample in samples]),
+                }
+                for style, samples in self._samples.items()
+            }
+
+
+PROMPT_STATS = _PromptStats()
+
+
+def _record_prompt_metrics(style: str, chunk: Mapping[str, Any], ttft_ms: Optional[float]) -> Dict[str, Any]:
+    """Log and aggregate Ollama's prompt-eval counters; returns extra metadata."""
+
+    prompt_eval_count = chunk.get("prompt_eval_count")
+    prompt_eval_ns = chunk.get("prompt_eval_duration")
+    prompt_eval_ms = round(prompt_eval_ns / 1e6, 1) if isinstance(prompt_eval_ns, (int, float)) else None
+    PROMPT_STATS.record(
+        style,
+        prompt_eval_count=prompt_eval_count,
+        prompt_eval_ms=prompt_eval_ms,
+        ttft_ms=ttft_ms,
+    )
+    print(
+        f"[quiz-explainer] prompt eval {prompt_eval_count} tokens in {prompt_eval_ms} ms, "
+        f"first token after {ttft_ms} ms ({style} prompt)"
+    )
+    return {
+        "prompt_json_style": style,
+        "prompt_eval_ms": prompt_eval_ms,
+        "time_to_first_token_ms": ttft_ms,
+    }
+
+
+def get_quiz_explainer_stats() -> Dict[str, Any]:
+    return {"model": get_model_warm_state(), "prompt": PROMPT_STATS.snapshot()}
+
+
+class _QueueTicket:
+    __slots__ = ("granted", "enqueued_at")
+
+    def __init__(self) -> None:
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class OllamaConcurrencyLimiter:
+    """FIFO admission for Ollama generations.
+
+    At most ``max_concurrency`` tickets are granted at once; the rest wait in
+    arrival order. Wait estimates use a moving average of recent generation
+    durations (unknown until the first generation completes).
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._cond = threading.Condition()
+        self._waiting: deque = deque()
+        self._active = 0
+        self._avg_generation_seconds: Optional[float] = None
+
+    def enqueue(self) -> _QueueTicket:
+        ticket = _QueueTicket()
+        with self._cond:
+            self._waiting.append(ticket)
+            self._grant_locked()
+        return ticket
+
+    def _grant_locked(self) -> None:
+        granted = False
+        while self._active < self.max_concurrency and self._waiting:
+            self._waiting.popleft().granted = True
+            self._active += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def wait(self, ticket: _QueueTicket, timeout: float) -> bool:
+        with self._cond:
+            if not ticket.granted and timeout > 0:
+                self._cond.wait_for(lambda: ticket.granted, timeout)
+            return ticket.granted
+
+    def position(self, ticket: _QueueTicket) -> int:
+        """1-based position in the wait queue; 0 once the ticket is granted."""
+
+        with self._cond:
+            if ticket.granted:
+                return 0
+            try:
+                return self._waiting.index(ticket) + 1
+            except ValueError:
+                return 0
+
+    def estimated_wait_for_new(self, ahead: int = 0) -> Optional[float]:
+        """Expected wait of a generation enqueued now behind ``ahead`` more that
+        will enqueue first (e.g. background jobs not yet started)."""
+
+        with self._cond:
+            free_slots = self.max_concurrency - self._active
+            position = len(self._waiting) + max(0, int(ahead)) + 1 - free_slots
+        return self.estimated_wait_seconds(position)
+
+    def estimated_wait_seconds(self, position: int) -> Optional[float]:
+        if position <= 0:
+            return 0.0
+        average = self._avg_generation_seconds
+        if average is None:
+            return None
+        return average * position / self.max_concurrency
+
+    def release(self, ticket: _QueueTicket, generation_seconds: Optional[float] = None) -> None:
+        """Give the slot back (or leave the queue if it was never granted)."""
+
+        with self._cond:
+            if ticket.granted:
+                ticket.granted = False
+                self._active = max(0, self._active - 1)
+            else:
+                try:
+                    self._waiting.remove(ticket)
+                except ValueError:
+                    pass
+            if generation_seconds is not None and generation_seconds > 0:
+                previous = self._avg_generation_seconds
+                self._avg_generation_seconds = (
+                    generation_seconds if previous is None else 0.7 * previous + 0.3 * generation_seconds
+                )
+            self._grant_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "queued": len(self._waiting),
+                "avg_generation_seconds": self._avg_generation_seconds,
+            }
+
+
+_CLIENT_LOCK = threading.Lock()
+_SESSION: Optional[requests.Session] = None
+_LIMITER: Optional[OllamaConcurrencyLimiter] = None
+
+
+def _get_ollama_session(config: Mapping[str, Any]) -> requests.Session:
+    """Shared keep-alive session so generations reuse pooled connections."""
+
+    global _SESSION
+    with _CLIENT_LOCK:
+        if _SESSION is None:
+            pool_size = max(4, int(config["max_concurrency"]) * 2)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def get_ollama_limiter(config: Optional[Mapping[str, Any]] = None) -> OllamaConcurrencyLimiter:
+    global _LIMITER
+    with _CLIENT_LOCK:
+        if _LIMITER is None:
+            resolved = config or get_quiz_explainer_config()
+            _LIMITER = OllamaConcurrencyLimiter(resolved["max_concurrency"])
+        return _LIMITER
+
+
+def _parse_warm_hours(value: str) -> Optional[Tuple[int, int]]:
+    """``"6-23"`` -> (6, 23): local hours during which the model is always kept warm."""
+
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        start_text, end_text = text.split("-", 1)
+        start, end = int(start_text), int(end_text)
+    except ValueError:
+        print(f"[quiz-explainer] ignoring invalid OLLAMA_WARM_HOURS={text!r}")
+        return None
+    if not (0 <= start <= 23 and 0 <= end <= 24):
+        return None
+    return start, end
+
+
+class OllamaWarmKeeper:
+    """Background preload + keep-alive pings for ``OLLAMA_MODEL``.
+
+    The model is loaded at service start and pinged every ``ping_seconds``
+    while explanations were requested within ``idle_window_seconds`` (or the
+    local time falls inside ``warm_hours``). Outside that window pings stop
+    and Ollama unloads the model after its own keep_alive. Each cycle
+    refreshes the warm/cold state from ``/api/ps`` so ``/health`` never
+    blocks on Ollama.
+    """
+
+    def __init__(
+        self,
+        config: Mapping[str, Any],
+        *,
+        ping_seconds: float,
+        idle_window_seconds: float,
+        warm_hours: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self.config = dict(config)
+        self.ping_seconds = max(5.0, float(ping_seconds))
+        self.idle_window_seconds = max(0.0, float(idle_window_seconds))
+        self.warm_hours = warm_hours
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_activity = time.time()
+        self._state: Dict[str, Any] = {
+            "state": "unknown",
+            "checked_at": None,
+            "last_ping_at": None,
+            "last_load_ms": None,
+            "expires_at": None,
+            "last_error": None,
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="ollama-warm-keeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def note_activity(self) -> None:
+        """A real generation just used the model, so it is warm now."""
+
+        with self._lock:
+            self._last_activity = time.time()
+            self._state["state"] = "warm"
+            self._state["checked_at"] = self._last_activity
+
+    def _within_window(self, now: float) -> bool:
+        if now - self._last_activity <= self.idle_window_seconds:
+            return True
+        if self.warm_hours is not None:
+            start, end = self.warm_hours
+            hour = time.localtime(now).tm_hour
+            return start <= hour < end if start <= end else hour >= start or hour < end
+        return False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delay = self.ping_seconds
+            try:
+                if self._within_window(time.time()):
+                    self.ping()
+                else:
+                    self.refresh_state()
+            except Exception as exc:  # keep the thread alive across Ollama restarts
+                self._set_state(state="unknown", last_error=str(exc))
+                # Ollama may still be starting (compose / Spaces); retry sooner.
+                delay = min(self.ping_seconds, WARM_RETRY_SECONDS)
+            self._stop.wait(delay)
+
+    def ping(self) -> None:
+        """Load the model (no-op when resident) and extend its keep_alive."""
+
+        started_at = time.monotonic()
+        response = _get_ollama_session(self.config).post(
+            f"{self.config['base_url']}/api/chat",
+            json={
+                "model": self.config["model"],
+                "messages": [],
+                "stream": False,
+                "keep_alive": self.config["keep_alive"],
+            },
+            timeout=(self.config["connect_timeout_seconds"], self.config["stream_read_timeout_seconds"]),
+        )
+        response.raise_for_status()
+        load_ms = int((time.monotonic() - started_at) * 1000)
+        was_cold = self.state()["state"] != "warm"
+        self._set_state(state="warm", last_ping_at=time.time(), last_load_ms=load_ms, last_error=None)
+        if was_cold:
+            print(f"[quiz-explainer] model {self.config['model']} preloaded in {load_ms} ms")
+        self.refresh_state()
+
+    def refresh_state(self) -> None:
+        response = _get_ollama_session(self.config).get(
+            f"{self.config['base_url']}/api/ps",
+            timeout=self.config["connect_timeout_seconds"],
+        )
+        response.raise_for_status()
+        loaded = {}
+        for entry in response.json().get("models") or []:
+            for key in ("name", "model"):
+                if entry.get(key):
+                    loaded[entry[key]] = entry
+        entry = loaded.get(self.config["model"])
+        self._set_state(
+            state="warm" if entry is not None else "cold",
+            expires_at=entry.get("expires_at") if entry is not None else None,
+            last_error=None,
+        )
+
+    def _set_state(self, **updates: Any) -> None:
+        with self._lock:
+            self._state.update(updates)
+            self._state["checked_at"] = time.time()
+
+    def state(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return {
+                "model": self.config["model"],
+                **self._state,
+                "keep_warm": self._within_window(now),
+                "idle_seconds": round(now - self._last_activity, 1),
+                "idle_window_seconds": self.idle_window_seconds,
+                "ping_seconds": self.ping_seconds,
+            }
+
+
+_WARM_KEEPER: Optional[OllamaWarmKeeper] = None
+
+
+def start_warm_keeper(env: Optional[Mapping[str, str]] = None) -> Optional[OllamaWarmKeeper]:
+    """Start the warm-keeper once (Ollama provider only, OLLAMA_WARM_KEEPER=1)."""
+
+    global _WARM_KEEPER
+    source = env or os.environ
+    config = get_quiz_explainer_config(source)
+    enabled = str(source.get("OLLAMA_WARM_KEEPER", "1")).strip().lower() not in ("0", "false", "no", "off")
+    if config["provider"] != "ollama" or not enabled:
+        return None
+    try:
+        ping_seconds = float(source.get("OLLAMA_WARM_PING_SECONDS", str(DEFAULT_WARM_PING_SECONDS)))
+    except (TypeError, ValueError):
+        ping_seconds = DEFAULT_WARM_PING_SECONDS
+    try:
+        idle_window_seconds = float(
+            source.get("OLLAMA_WARM_IDLE_WINDOW_SECONDS", str(DEFAULT_WARM_IDLE_WINDOW_SECONDS))
+        )
+    except (TypeError, ValueError):
+        idle_window_seconds = DEFAULT_WARM_IDLE_WINDOW_SECONDS
+
+    with _CLIENT_LOCK:
+        if _WARM_KEEPER is None:
+            _WARM_KEEPER = OllamaWarmKeeper(
+                config,
+                ping_seconds=ping_seconds,
+                idle_window_seconds=idle_window_seconds,
+                warm_hours=_parse_warm_hours(source.get("OLLAMA_WARM_HOURS", "")),
+            )
+            _WARM_KEEPER.start()
+            print(
+                f"[quiz-explainer] warm-keeper started for {config['model']} "
+                f"(ping every {_WARM_KEEPER.ping_seconds:g} s, idle window {idle_window_seconds:g} s)"
+            )
+        return _WARM_KEEPER
+
+
+def get_model_warm_state() -> Dict[str, Any]:
+    keeper = _WARM_KEEPER
+    if keeper is None:
+        return {"state": "disabled"}
+    return keeper.state()
+
+
+def _note_llm_activity() -> None:
+    keeper = _WARM_KEEPER
+    if keeper is not None:
+        keeper.note_activity()
+
+
 def _clean_text(value: Any, fallback: str = "Not provided") -> str:
     text = str(value or "").replace("_", " ").strip()
     return text if text else fallback
@@ -129,8 +593,17 @@ def _join_factor_labels(items: Iterable[Any], empty_text: str) -> str:
     return "; ".join(labels) if labels else empty_text
 
 
-def build_quiz_explanation_prompt(result_data: Mapping[str, Any]) -> List[Dict[str, str]]:
-    """Build Ollama chat messages from already-computed structured quiz data."""
+def build_quiz_explanation_prompt(
+    result_data: Mapping[str, Any],
+    *,
+    json_style: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Build Ollama chat messages from already-computed structured quiz data.
+
+    The system prompt and instruction line are a byte-identical prefix across
+    requests, so Ollama can reuse their KV cache while the model stays loaded;
+    only the single-line result JSON is evaluated per request.
+    """
 
     compact_payload = {
         "overall_risk_label": result_data.get("overall_risk_label"),
@@ -143,10 +616,16 @@ def build_quiz_explanation_prompt(result_data: Mapping[str, Any]) -> List[Dict[s
         "advice_focus": _as_list(result_data.get("advice_focus")),
     }
 
+    style = json_style or get_quiz_explainer_config()["prompt_json_style"]
+    if style == "indented":
+        payload_json = json.dumps(compact_payload, ensure_ascii=True, indent=2, sort_keys=True)
+    else:
+        payload_json = json.dumps(compact_payload, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
+
     user_prompt = (
         "Explain this already-computed SIARA driver quiz result. "
         "Use only the provided structured data and do not perform scoring.\n\n"
-        f"{json.dumps(compact_payload, ensure_ascii=True, indent=2, sort_keys=True)}"
+        f"{payload_json}"
     )
 
     return [
@@ -174,19 +653,35 @@ def call_ollama_chat(
         "model": resolved_model,
         "messages": messages,
         "stream": False,
-        "options": {
-            "temperature": 0.2,
-            "top_p": 0.9,
-        },
+        "options": OLLAMA_OPTIONS,
+        "keep_alive": config["keep_alive"],
     }
 
+    limiter = get_ollama_limiter(config)
+    ticket = limiter.enqueue()
+    generation_seconds: Optional[float] = None
     try:
-        response = requests.post(url, json=payload, timeout=resolved_timeout)
+        budget_seconds = config["queue_wait_budget_seconds"]
+        estimated_wait = limiter.estimated_wait_seconds(limiter.position(ticket))
+        if estimated_wait is not None and estimated_wait > budget_seconds:
+            raise OllamaBusyError(
+                f"Estimated Ollama queue wait {estimated_wait:.0f} s exceeds {budget_seconds:g} s"
+            )
+        if not limiter.wait(ticket, budget_seconds):
+            raise OllamaBusyError(
+                f"No Ollama slot within {budget_seconds:g} seconds "
+                f"(queue position {limiter.position(ticket)})"
+            )
+        generation_started_at = time.monotonic()
+        response = _get_ollama_session(config).post(url, json=payload, timeout=resolved_timeout)
         response.raise_for_status()
+        generation_seconds = time.monotonic() - generation_started_at
     except requests.Timeout as exc:
         raise OllamaUnavailableError(f"Ollama request timed out after {resolved_timeout} seconds") from exc
     except requests.RequestException as exc:
         raise OllamaUnavailableError(f"Ollama request failed: {exc}") from exc
+    finally:
+        limiter.release(ticket, generation_seconds)
 
     try:
         body = response.json()
@@ -197,6 +692,9 @@ def call_ollama_chat(
     if not isinstance(content, str) or not content.strip():
         raise OllamaUnavailableError("Ollama returned an empty chat message")
 
+    _record_prompt_metrics(config["prompt_json_style"], body, None)
+    _note_llm_activity()
+
     return content.strip()
 
 
@@ -227,61 +725,120 @@ SECTION_ALIASES = {
 }
 
 
-def _normalize_section_heading(value: str) -> Optional[str]:
-    text = re.sub(r"[*_`#>]+", "", str(value or "")).strip()
-    text = re.sub(r"^\s*[-+*]\s+", "", text)
-    text = re.sub(r"^\s*\d+[\).:-]\s*", "", text)
-    text = re.sub(r"[:.]\s*$", "", text)
-    normalized = re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
-    for key, aliases in SECTION_ALIASES.items():
-        if normalized in {re.sub(r"[^a-z0-9]+", " ", alias).strip() for alias in aliases}:
-            return key
-    return None
+SECTION_KEYS = ("summary", "risk_factors", "protective_factors", "advice", "disclaimer")
 
+_HEADING_MARKUP_RE = re.compile(r"[*_`#>]+")
+_BULLET_RE = re.compile(r"^\s*[-+*]\s+")
+_NUMBER_PREFIX_RE = re.compile(r"^\s*\d+[\).:-]\s*")
+_TRAILING_PUNCT_RE = re.compile(r"[:.]\s*$")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_INLINE_HEADING_RE = re.compile(
+    r"^\s*(?:\*\*)?\s*(?:\d+[\).:-]\s*)?([A-Za-z][A-Za-z\-\s]+?)(?:\*\*)?\s*[:\-]\s+(.+)$"
+)
+_INLINE_MARKUP_RE = re.compile(r"[*_`]+")
 
-def structure_quiz_explanation(explanation_text: Any) -> Dict[str, Any]:
-    """Parse the expected five-section explanation text into UI-friendly fields."""
+# Normalized alias -> section key, built once instead of per heading check.
+_SECTION_BY_ALIAS = {
+    _NON_ALNUM_RE.sub(" ", alias).strip(): key
+    for key, aliases in SECTION_ALIASES.items()
+    for alias in aliases
+}
 
-    text = str(explanation_text or "").replace("\r\n", "\n").replace("\r", "\n").strip()
-    sections: Dict[str, List[str]] = {
-        "summary": [],
-        "risk_factors": [],
-        "protective_factors": [],
-        "advice": [],
-        "disclaimer": [],
-    }
-    current_key: Optional[str] = None
 
-    for raw_line in text.split("\n"):
+def _normalize_section_heading(value: str) -> Optional[str]:
+    text = _HEADING_MARKUP_RE.sub("", str(value or "")).strip()
+    text = _BULLET_RE.sub("", text)
+    text = _NUMBER_PREFIX_RE.sub("", text)
+    text = _TRAILING_PUNCT_RE.sub("", text)
+    normalized = _NON_ALNUM_RE.sub(" ", text.lower()).strip()
+    return _SECTION_BY_ALIAS.get(normalized)
+
+
+class SectionStreamParser:
+    """Incremental version of ``structure_quiz_explanation``.
+
+    ``feed`` consumes raw chunks (split anywhere, even mid-line) and returns
+    the sections completed by them: a section is complete once the next
+    heading starts. ``finish`` flushes the trailing line and the last open
+    section. ``structured`` is the same dict ``structure_quiz_explanation``
+    returns for the concatenated text.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._sections: Dict[str, List[str]] = {key: [] for key in SECTION_KEYS}
+        self._current_key: Optional[str] = None
+        self._emitted: Dict[str, str] = {}
+
+    def feed(self, chunk: Any) -> List[Tuple[str, str]]:
+        self._buffer += str(chunk or "").replace("\r\n", "\n").replace("\r", "\n")
+        if "\n" not in self._buffer:
+            return []
+        *lines, self._buffer = self._buffer.split("\n")
+        completed: List[Tuple[str, str]] = []
+        for line in lines:
+            completed.extend(self._consume_line(line))
+        return completed
+
+    def finish(self) -> List[Tuple[str, str]]:
+        completed = self._consume_line(self._buffer)
+        self._buffer = ""
+        if self._current_key:
+            completed.extend(self._complete(self._current_key))
+        return completed
+
+    @property
+    def structured(self) -> Dict[str, Any]:
+        return {key: "\n".join(value).strip() for key, value in self._sections.items()}
+
+    def _complete(self, key: str) -> List[Tuple[str, str]]:
+        text = "\n".join(self._sections[key]).strip()
+        if not text or self._emitted.get(key) == text:
+            return []
+        self._emitted[key] = text
+        return [(key, text)]
+
+    def _start_section(self, key: str) -> List[Tuple[str, str]]:
+        completed = self._complete(self._current_key) if self._current_key else []
+        self._current_key = key
+        return completed
+
+    def _consume_line(self, raw_line: str) -> List[Tuple[str, str]]:
         line = raw_line.strip()
         if not line:
-            continue
+            return []
 
         heading = _normalize_section_heading(line)
         if heading:
-            current_key = heading
-            continue
+            return self._start_section(heading)
 
-        inline_heading = re.match(
-            r"^\s*(?:\*\*)?\s*(?:\d+[\).:-]\s*)?([A-Za-z][A-Za-z\-\s]+?)(?:\*\*)?\s*[:\-]\s+(.+)$",
-            line,
-        )
+        completed: List[Tuple[str, str]] = []
+        inline_heading = _INLINE_HEADING_RE.match(line)
         if inline_heading:
             heading = _normalize_section_heading(inline_heading.group(1))
             if heading:
-                current_key = heading
+                completed = self._start_section(heading)
                 line = inline_heading.group(2).strip()
 
-        if current_key:
-            cleaned = re.sub(r"[*_`]+", "", line).strip()
-            cleaned = re.sub(r"^\s*[-+*]\s+", "", cleaned)
+        if self._current_key:
+            cleaned = _INLINE_MARKUP_RE.sub("", line).strip()
+            cleaned = _BULLET_RE.sub("", cleaned)
             if cleaned:
-                sections[current_key].append(cleaned)
+                self._sections[self._current_key].append(cleaned)
+        return completed
 
-    return {
-        key: "\n".join(value).strip()
-        for key, value in sections.items()
-    }
+
+def structure_quiz_explanation(explanation_text: Any) -> Dict[str, Any]:
+    """Parse the expected five-section explanation text into UI-friendly fields."""
+
+    parser = SectionStreamParser()
+    parser.feed(explanation_text)
+    parser.finish()
+    return parser.structured
+
+
+def _section_events(completed: Iterable[Tuple[str, str]], **extra: Any) -> List[Dict[str, Any]]:
+    return [_stream_event("section", section=key, content=text, **extra) for key, text in completed]
 
 
 def _template_fallback_events(
@@ -306,6 +863,8 @@ def _template_fallback_events(
         content=explanation_text,
         fallback=True,
     )
+    sections = SectionStreamParser()
+    yield from _section_events(sections.feed(explanation_text) + sections.finish(), fallback=True)
     yield _stream_event(
         "status",
         status="done",
@@ -315,12 +874,270 @@ def _template_fallback_events(
     yield _stream_event(
         "done",
         explanation_text=explanation_text,
-        structured_explanation=structure_quiz_explanation(explanation_text),
+        structured_explanation=sections.structured,
         fallback=True,
         metadata={"generation_duration_ms": elapsed_ms},
     )
 
 
+def _cached_replay_events(
+    entry: Mapping[str, Any],
+    *,
+    started_at: float,
+) -> Generator[Dict[str, Any], None, None]:
+    explanation_text = str(entry.get("explanation_text") or "")
+    elapsed_ms = int((time.monotonic() - started_at) * 1000)
+    print(f"[quiz-explainer] cache hit, replayed in {elapsed_ms} ms")
+    yield _stream_event(
+        "status",
+        status="generating",
+        message="Generating explanation...",
+        cached=True,
+    )
+    # Replay line by line so clients render through the same chunk/section path.
+    sections = SectionStreamParser()
+    for line in explanation_text.splitlines(keepends=True):
+        yield _stream_event("chunk", content=line, cached=True)
+        yield from _section_events(sections.feed(line), cached=True)
+    yield from _section_events(sections.finish(), cached=True)
+    yield _stream_event(
+        "status",
+        status="done",
+        message="Explanation ready.",
+        cached=True,
+    )
+    metadata = dict(entry.get("metadata") or {})
+    metadata["generation_duration_ms"] = elapsed_ms
+    metadata["cache_hit"] = True
+    yield _stream_event(
+        "done",
+        explanation_text=explanation_text,
+        structured_explanation=sections.structured,
+        fallback=False,
+        cached=True,
+        metadata=metadata,
+    )
+
+
+def _queue_status(
+    limiter: OllamaConcurrencyLimiter,
+    ticket: _QueueTicket,
+    budget_seconds: float,
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """One admission check: ``granted``, ``over_budget`` or ``waiting`` + event.
+
+    Over budget is reported as soon as the queue is known to be too long:
+    either the budget has elapsed or the estimated remaining wait exceeds it.
+    """
+
+    position = limiter.position(ticket)
+    if position == 0:
+        return "granted", None
+    waited = time.monotonic() - ticket.enqueued_at
+    estimated_wait = limiter.estimated_wait_seconds(position)
+    if waited >= budget_seconds or (
+        estimated_wait is not None and waited + estimated_wait > budget_seconds
+    ):
+        print(
+            f"[quiz-explainer] queue wait budget exceeded at position {position} "
+            f"after {waited:.1f} s"
+        )
+        return "over_budget", None
+    return "waiting", _stream_event(
+        "status",
+        status="queued",
+        message="Waiting for the local language model...",
+        queue_position=position,
+        estimated_wait_seconds=None if estimated_wait is None else round(estimated_wait, 1),
+    )
+
+
+def _queue_wait_events(
+    limiter: OllamaConcurrencyLimiter,
+    ticket: _QueueTicket,
+    *,
+    budget_seconds: float,
+) -> Generator[Dict[str, Any], None, bool]:
+    """Yield ``queued`` status events until the ticket is granted (True) or
+    the wait budget is known to be exceeded (False)."""
+
+    while True:
+        state, event = _queue_status(limiter, ticket, budget_seconds)
+        if state != "waiting":
+            return state == "granted"
+        yield event
+        remaining = budget_seconds - (time.monotonic() - ticket.enqueued_at)
+        if limiter.wait(ticket, min(QUEUE_STATUS_INTERVAL_SECONDS, remaining)):
+            return True
+
+
+def _ollama_stream_request(
+    result_data: Mapping[str, Any],
+    config: Mapping[str, Any],
+    *,
+    model: Optional[str],
+    base_url: Optional[str],
+) -> Dict[str, Any]:
+    resolved_model = model or config["model"]
+    resolved_base_url = (base_url or config["base_url"]).rstrip("/")
+    messages = build_quiz_explanation_prompt(result_data, json_style=config["prompt_json_style"])
+    return {
+        "model": resolved_model,
+        "url": f"{resolved_base_url}/api/chat",
+        "cache_key": explanation_cache_key(resolved_model, messages, OLLAMA_OPTIONS),
+        "prompt_json_style": config["prompt_json_style"],
+        "payload": {
+            "model": resolved_model,
+            "messages": messages,
+            "stream": True,
+            "options": OLLAMA_OPTIONS,
+            "keep_alive": config["keep_alive"],
+        },
+    }
+
+
+class _OllamaStreamReader:
+    """Turns Ollama's NDJSON chat stream into explainer events.
+
+    Shared by the threaded and asyncio stream paths so both emit the same
+    status/chunk/done protocol. ``finished`` flips once the done event has
+    been produced (the explanation is cached at that point).
+    """
+
+    def __init__(
+        self,
+        *,
+        started_at: float,
+        model: str,
+        cache_key: str,
+        cache: Any,
+        prompt_json_style: str,
+        write_cache: bool = True,
+    ) -> None:
+        self.started_at = started_at
+        self.generation_started_at = time.monotonic()
+        self.time_to_first_token_ms: Optional[float] = None
+        self.prompt_json_style = prompt_json_style
+        self.model = model
+        self.cache_key = cache_key
+        self.cache = cache
+        # False leaves the (blocking) cache write to the caller via store_cache().
+        self.write_cache = write_cache
+        self._cache_entry: Optional[Tuple[str, Dict[str, Any]]] = None
+        self.parts: List[str] = []
+        self.sections = SectionStreamParser()
+        self.first_token_received = False
+        self.finished = False
+        self.generation_seconds: Optional[float] = None
+
+    def feed(self, raw_line: str) -> List[Dict[str, Any]]:
+        if not raw_line:
+            return []
+        try:
+            chunk = json.loads(raw_line)
+        except ValueError as exc:
+            raise OllamaUnavailableError("Ollama returned an invalid JSON stream chunk") from exc
+
+        events: List[Dict[str, Any]] = []
+        content = chunk.get("message", {}).get("content")
+        if isinstance(content, str) and content:
+            if not self.first_token_received:
+                self.first_token_received = True
+                self.time_to_first_token_ms = round((time.monotonic() - self.generation_started_at) * 1000, 1)
+                print("[quiz-explainer] first token received")
+                events.append(
+                    _stream_event(
+                        "status",
+                        status="generating",
+                        message="Generating explanation...",
+                    )
+                )
+            self.parts.append(content)
+            events.append(_stream_event("chunk", content=content))
+            events.extend(_section_events(self.sections.feed(content)))
+
+        if chunk.get("done") is True:
+            events.extend(self._finish(chunk))
+        return events
+
+    def _finish(self, chunk: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        metadata = {
+            key: chunk[key]
+            for key in (
+                "total_duration",
+                "load_duration",
+                "prompt_eval_count",
+                "prompt_eval_duration",
+                "eval_count",
+                "eval_duration",
+            )
+            if key in chunk
+        }
+        metadata["generation_duration_ms"] = int((time.monotonic() - self.started_at) * 1000)
+        metadata.update(_record_prompt_metrics(self.prompt_json_style, chunk, self.time_to_first_token_ms))
+        explanation_text = "".join(self.parts).strip()
+        if not explanation_text:
+            raise OllamaUnavailableError("Ollama streamed an empty explanation")
+        self.generation_seconds = time.monotonic() - self.generation_started_at
+        self.finished = True
+        _note_llm_activity()
+        print(
+            "[quiz-explainer] stream completed "
+            f"in {metadata['generation_duration_ms']} ms"
+        )
+        self._cache_entry = (
+            explanation_text,
+            {key: metadata[key] for key in ("prompt_eval_count", "eval_count") if key in metadata},
+        )
+        if self.write_cache:
+            self.store_cache()
+        return [
+            *_section_events(self.sections.finish()),
+            _stream_event(
+                "status",
+                status="finalizing",
+                message="Finalizing response...",
+            ),
+            _stream_event(
+                "done",
+                explanation_text=explanation_text,
+                # Parsed incrementally while streaming; no second pass.
+                structured_explanation=self.sections.structured,
+                fallback=False,
+                metadata=metadata,
+            ),
+        ]
+
+    def store_cache(self) -> None:
+        """Write the finished explanation to the cache (file I/O; blocking)."""
+
+        if self.cache is None or self._cache_entry is None:
+            return
+        explanation_text, metadata = self._cache_entry
+        self._cache_entry = None
+        self.cache.put(self.cache_key, explanation_text, model=self.model, metadata=metadata)
+
+
+def _queue_budget_reason(config: Mapping[str, Any]) -> str:
+    return f"Ollama queue wait budget of {config['queue_wait_budget_seconds']:g} s exceeded"
+
+
+def queue_budget_exceeded_reason(ahead: int = 0) -> Optional[str]:
+    """Fallback reason when a generation started now would wait past the budget.
+
+    ``ahead`` counts generations that will reach the limiter first. None when it
+    fits (or no estimate is available yet).
+    """
+
+    config = get_quiz_explainer_config()
+    if config["provider"] != "ollama":
+        return None
+    estimated_wait = get_ollama_limiter(config).estimated_wait_for_new(ahead)
+    if estimated_wait is not None and estimated_wait > config["queue_wait_budget_seconds"]:
+        return _queue_budget_reason(config)
+    return None
+
+
 def stream_quiz_explanation(
     result_data: Mapping[str, Any],
     *,
@@ -347,114 +1164,224 @@ def stream_quiz_explanation(
         )
         return
 
-    resolved_model = model or config["model"]
-    resolved_base_url = (base_url or config["base_url"]).rstrip("/")
-    url = f"{resolved_base_url}/api/chat"
-    messages = build_quiz_explanation_prompt(result_data)
-    payload = {
-        "model": resolved_model,
-        "messages": messages,
-        "stream": True,
-        "options": {
-            "temperature": 0.2,
-            "top_p": 0.9,
-        },
-    }
+    ollama_request = _ollama_stream_request(result_data, config, model=model, base_url=base_url)
+    cache = get_explanation_cache()
+    cached_entry = cache.get(ollama_request["cache_key"]) if cache is not None else None
+    if cached_entry is not None:
+        yield from _cached_replay_events(cached_entry, started_at=started_at)
+        return
+
     request_timeout = (
         config["connect_timeout_seconds"],
         config["stream_read_timeout_seconds"],
     )
-    explanation_parts: List[str] = []
-    first_token_received = False
 
+    limiter = get_ollama_limiter(config)
+    ticket = limiter.enqueue()
+    reader: Optional[_OllamaStreamReader] = None
     try:
-        yield _stream_event(
-            "status",
-            status="loading_model",
-            message="Loading local language model...",
-        )
-        print("[quiz-explainer] Ollama connection started")
-        with requests.post(url, json=payload, stream=True, timeout=request_timeout) as response:
-            response.raise_for_status()
-            for raw_line in response.iter_lines(decode_unicode=True):
-                if not raw_line:
-                    continue
-                try:
-                    chunk = json.loads(raw_line)
-                except ValueError as exc:
-                    raise OllamaUnavailableError("Ollama returned an invalid JSON stream chunk") from exc
-
-                content = chunk.get("message", {}).get("content")
-                if isinstance(content, str) and content:
-                    if not first_token_received:
-                        first_token_received = True
-                        print("[quiz-explainer] first token received")
-                        yield _stream_event(
-                            "status",
-                            status="generating",
-                            message="Generating explanation...",
-                        )
-                    explanation_parts.append(content)
-                    yield _stream_event("chunk", content=content)
-
-                if chunk.get("done") is True:
-                    metadata = {
-                        key: chunk[key]
-                        for key in (
-                            "total_duration",
-                            "load_duration",
-                            "prompt_eval_count",
-                            "eval_count",
-                        )
-                        if key in chunk
-                    }
-                    metadata["generation_duration_ms"] = int((time.monotonic() - started_at) * 1000)
-                    explanation_text = "".join(explanation_parts).strip()
-                    if not explanation_text:
-                        raise OllamaUnavailableError("Ollama streamed an empty explanation")
-                    yield _stream_event(
-                        "status",
-                        status="finalizing",
-                        message="Finalizing response...",
-                    )
-                    print(
-                        "[quiz-explainer] stream completed "
-                        f"in {metadata['generation_duration_ms']} ms"
-                    )
-                    yield _stream_event(
-                        "done",
-                        explanation_text=explanation_text,
-                        structured_explanation=structure_quiz_explanation(explanation_text),
-                        fallback=False,
-                        metadata=metadata,
-                    )
-                    return
-
-        raise OllamaUnavailableError("Ollama stream ended without a final done chunk")
-    except requests.Timeout as exc:
-        yield from _template_fallback_events(
-            result_data,
-            reason=f"Ollama stream timed out: {exc}",
-            started_at=started_at,
+        granted = yield from _queue_wait_events(
+            limiter, ticket, budget_seconds=config["queue_wait_budget_seconds"]
         )
-    except requests.RequestException as exc:
-        yield from _template_fallback_events(
-            result_data,
-            reason=f"Ollama stream failed: {exc}",
+        if not granted:
+            yield from _template_fallback_events(
+                result_data,
+                reason=_queue_budget_reason(config),
+                started_at=started_at,
+            )
+            return
+        reader = _OllamaStreamReader(
             started_at=started_at,
+            model=ollama_request["model"],
+            cache_key=ollama_request["cache_key"],
+            cache=cache,
+            prompt_json_style=ollama_request["prompt_json_style"],
         )
-    except QuizExplainerError as exc:
-        yield from _template_fallback_events(
-            result_data,
-            reason=str(exc),
-            started_at=started_at,
+        try:
+            yield _stream_event(
+                "status",
+                status="loading_model",
+                message="Loading local language model...",
+            )
+            print("[quiz-explainer] Ollama connection started")
+            with _get_ollama_session(config).post(
+                ollama_request["url"],
+                json=ollama_request["payload"],
+                stream=True,
+                timeout=request_timeout,
+            ) as response:
+                response.raise_for_status()
+                for raw_line in response.iter_lines(decode_unicode=True):
+                    for event in reader.feed(raw_line):
+                        yield event
+                    if reader.finished:
+                        return
+
+            raise OllamaUnavailableError("Ollama stream ended without a final done chunk")
+        except requests.Timeout as exc:
+            yield from _template_fallback_events(
+                result_data,
+                reason=f"Ollama stream timed out: {exc}",
+                started_at=started_at,
+            )
+        except requests.RequestException as exc:
+            yield from _template_fallback_events(
+                result_data,
+                reason=f"Ollama stream failed: {exc}",
+                started_at=started_at,
+            )
+        except QuizExplainerError as exc:
+            yield from _template_fallback_events(
+                result_data,
+                reason=str(exc),
+                started_at=started_at,
+            )
+        except Exception as exc:
+            yield from _template_fallback_events(
+                result_data,
+                reason=f"Unexpected stream failure: {exc}",
+                started_at=started_at,
+            )
+    finally:
+        limiter.release(ticket, reader.generation_seconds if reader is not None else None)
+
+
+_ASYNC_CLIENTS: Dict[int, Any] = {}
+
+
+def _get_async_ollama_client(config: Mapping[str, Any]) -> Any:
+    """Pooled ``httpx.AsyncClient`` for the running event loop."""
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(id(loop))
+    if client is None or client.is_closed:
+        pool_size = max(4, int(config["max_concurrency"]) * 2)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
         )
-    except Exception as exc:
-        yield from _template_fallback_events(
-            result_data,
-            reason=f"Unexpected stream failure: {exc}",
+        _ASYNC_CLIENTS[id(loop)] = client
+    return client
+
+
+async def astream_quiz_explanation(
+    result_data: Mapping[str, Any],
+    *,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """asyncio twin of ``stream_quiz_explanation`` (same events, no thread held).
+
+    Uses ``httpx`` for Ollama and shares the FIFO limiter, explanation cache
+    and template fallback with the threaded path.
+    """
+
+    started_at = time.monotonic()
+    config = get_quiz_explainer_config()
+    print("[quiz-explainer] request started (async)")
+
+    yield _stream_event(
+        "status",
+        status="starting",
+        message="Preparing explanation...",
+    )
+
+    fallback_reason = None
+    if config["provider"] != "ollama":
+        fallback_reason = f"LLM provider is {config['provider']}"
+    elif httpx is None:
+        fallback_reason = "httpx is not installed (required for the async stream)"
+    if fallback_reason:
+        for event in _template_fallback_events(result_data, reason=fallback_reason, started_at=started_at):
+            yield event
+        return
+
+    ollama_request = _ollama_stream_request(result_data, config, model=model, base_url=base_url)
+    cache = get_explanation_cache()
+    # Cache reads/writes are file I/O: keep them off the event loop so other
+    # streams on this process are not stalled.
+    loop = asyncio.get_running_loop()
+    cached_entry = (
+        await loop.run_in_executor(None, cache.get, ollama_request["cache_key"]) if cache is not None else None
+    )
+    if cached_entry is not None:
+        for event in _cached_replay_events(cached_entry, started_at=started_at):
+            yield event
+        return
+
+    request_timeout = httpx.Timeout(
+        config["stream_read_timeout_seconds"],
+        connect=config["connect_timeout_seconds"],
+    )
+
+    limiter = get_ollama_limiter(config)
+    ticket = limiter.enqueue()
+    reader: Optional[_OllamaStreamReader] = None
+    try:
+        # The limiter is shared with the gunicorn/WSGI threads, so admission is
+        # polled instead of awaited; status events stay ~1 s apart.
+        last_status_at = 0.0
+        while True:
+            state, event = _queue_status(limiter, ticket, config["queue_wait_budget_seconds"])
+            if state == "granted":
+                break
+            if state == "over_budget":
+                for fallback_event in _template_fallback_events(
+                    result_data,
+                    reason=_queue_budget_reason(config),
+                    started_at=started_at,
+                ):
+                    yield fallback_event
+                return
+            if time.monotonic() - last_status_at >= QUEUE_STATUS_INTERVAL_SECONDS:
+                last_status_at = time.monotonic()
+                yield event
+            await asyncio.sleep(ASYNC_QUEUE_POLL_SECONDS)
+
+        reader = _OllamaStreamReader(
             started_at=started_at,
+            model=ollama_request["model"],
+            cache_key=ollama_request["cache_key"],
+            cache=cache,
+            prompt_json_style=ollama_request["prompt_json_style"],
+            write_cache=False,
         )
+        try:
+            yield _stream_event(
+                "status",
+                status="loading_model",
+                message="Loading local language model...",
+            )
+            print("[quiz-explainer] Ollama connection started (async)")
+            client = _get_async_ollama_client(config)
+            async with client.stream(
+                "POST",
+                ollama_request["url"],
+                json=ollama_request["payload"],
+                timeout=request_timeout,
+            ) as response:
+                response.raise_for_status()
+                async for raw_line in response.aiter_lines():
+                    events = reader.feed(raw_line)
+                    if reader.finished:
+                        await loop.run_in_executor(None, reader.store_cache)
+                    for event in events:
+                        yield event
+                    if reader.finished:
+                        return
+
+            raise OllamaUnavailableError("Ollama stream ended without a final done chunk")
+        except httpx.TimeoutException as exc:
+            fallback_reason = f"Ollama stream timed out: {exc!r}"
+        except httpx.HTTPError as exc:
+            fallback_reason = f"Ollama stream failed: {exc}"
+        except QuizExplainerError as exc:
+            fallback_reason = str(exc)
+        except Exception as exc:
+            fallback_reason = f"Unexpected stream failure: {exc}"
+        for event in _template_fallback_events(result_data, reason=fallback_reason, started_at=started_at):
+            yield event
+    finally:
+        limiter.release(ticket, reader.generation_seconds if reader is not None else None)
 
 
 def build_template_explanation(result_data: Mapping[str, Any]) -> str:
@@ -496,9 +1423,16 @@ def explain_quiz_result(result_data: Mapping[str, Any]) -> str:
     if config["provider"] != "ollama":
         return build_template_explanation(result_data)
 
+    messages = build_quiz_explanation_prompt(result_data, json_style=config["prompt_json_style"])
+    cache = get_explanation_cache()
+    cache_key = explanation_cache_key(config["model"], messages, OLLAMA_OPTIONS)
+    if cache is not None:
+        cached_entry = cache.get(cache_key)
+        if cached_entry is not None:
+            return cached_entry["explanation_text"]
+
     try:
-        messages = build_quiz_explanation_prompt(result_data)
-        return call_ollama_chat(
+        explanation_text = call_ollama_chat(
             messages,
             model=config["model"],
             base_url=config["base_url"],
@@ -507,3 +1441,7 @@ def explain_quiz_result(result_data: Mapping[str, Any]) -> str:
     except QuizExplainerError as exc:
         print(f"[quiz-explainer] Falling back to template explanation: {exc}")
         return build_template_explanation(result_data)
+
+    if cache is not None:
+        cache.put(cache_key, explanation_text, model=config["model"])
+    return explanation_text
@@ -421,6 +421,7 @@ async function callSpamClassifier({ text, imageUrl }) {
 }
 
 async function callReportValidator({
+  reportId,
   title,
   description,
   incidentType,
@@ -434,6 +435,7 @@ async function callReportValidator({
   const response = await axios.post(
     `${DEFAULT_ML_SERVICE_BASE_URL.replace(/\/$/, "")}/report/validate`,
     {
+      report_id: reportId || null,
       title: title || null,
       description: description || null,
       incident_type: incidentType || null,
@@ -538,6 +540,7 @@ async function refreshReportSpamAnalysis(reportId) {
 
   try {
     const validatorResponse = await callReportValidator({
+      reportId,
       title: reportRow.title,
       description: reportRow.description,
       incidentType: reportRow.incident_type,
@@ -566,6 +569,7 @@ async function refreshReportSpamAnalysis(reportId) {
       confidence: normalizedPrediction.confidence_score,
       modelVersion: normalizedPrediction.model_version,
       reasons: validatorResponse?.reasons || [],
+      duplicateOf: validatorResponse?.duplicate_of?.report_id ?? null,
     });
 
     if (!normalizedPrediction.isComplete) {
@@ -0,0 +1,325 @@
+"""Near-duplicate detection for citizen report validation.
+
+During incident spikes the same event is reported many times with lightly
+edited text. Each validated report text (``build_text_input``) is indexed as a
+MinHash signature over character shingles, bucketed with LSH bands, so a new
+report only compares against the few earlier reports that share a band. A
+candidate is a duplicate when its estimated Jaccard similarity reaches the
+threshold, it lies within the radius of the earlier report's coordinates and
+its image flags match; the earlier validation result is then reused.
+
+Entries expire after the time window (and the oldest are dropped beyond the
+entry cap), so the index only covers recent reports.
+
+Runtime configuration:
+- REPORT_DEDUP_ENABLED=1
+- REPORT_DEDUP_WINDOW_SECONDS=1800
+- REPORT_DEDUP_RADIUS_M=150
+- REPORT_DEDUP_SIMILARITY=0.8 (estimated Jaccard over 4-character shingles)
+- REPORT_DEDUP_MAX_ENTRIES=20000
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_WINDOW_SECONDS = 1800.0
+DEFAULT_RADIUS_M = 150.0
+DEFAULT_SIMILARITY = 0.8
+DEFAULT_MAX_ENTRIES = 20000
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+# 16 bands x 4 rows: pairs above ~0.5 similarity almost always share a band.
+LSH_BANDS = 16
+EARTH_RADIUS_M = 6371008.8
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_PERM_RNG = np.random.default_rng(20260428)
+_PERM_A = _PERM_RNG.integers(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _PERM_RNG.integers(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def get_report_dedup_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    try:
+        window_seconds = float(source.get("REPORT_DEDUP_WINDOW_SECONDS", str(DEFAULT_WINDOW_SECONDS)))
+    except (TypeError, ValueError):
+        window_seconds = DEFAULT_WINDOW_SECONDS
+    try:
+        radius_m = float(source.get("REPORT_DEDUP_RADIUS_M", str(DEFAULT_RADIUS_M)))
+    except (TypeError, ValueError):
+        radius_m = DEFAULT_RADIUS_M
+    try:
+        similarity = float(source.get("REPORT_DEDUP_SIMILARITY", str(DEFAULT_SIMILARITY)))
+    except (TypeError, ValueError):
+        similarity = DEFAULT_SIMILARITY
+    try:
+        max_entries = int(source.get("REPORT_DEDUP_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+    except (TypeError, ValueError):
+        max_entries = DEFAULT_MAX_ENTRIES
+
+    enabled_raw = str(source.get("REPORT_DEDUP_ENABLED", "1")).strip().lower()
+    return {
+        "enabled": enabled_raw not in ("0", "false", "no", "off"),
+        "window_seconds": max(1.0, window_seconds),
+        "radius_m": max(0.0, radius_m),
+        "similarity": min(1.0, max(0.0, similarity)),
+        "max_entries": max(1, max_entries),
+    }
+
+
+def normalize_report_text(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+
+    normalized = unicodedata.normalize("NFKD", str(text or "").lower())
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+    return " ".join(_NON_WORD_RE.sub(" ", normalized).split())
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """``NUM_PERM`` MinHash values over the text's character shingles."""
+
+    normalized = normalize_report_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    ) % _MERSENNE_PRIME
+    # a * x + b stays below 2**63 because a, x < 2**31.
+    values = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2.0) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class _DedupEntry:
+    __slots__ = ("entry_id", "bands", "lat", "lon", "context", "result", "report_id", "created_at")
+
+    def __init__(
+        self,
+        entry_id: int,
+        bands: List[Tuple[int, bytes]],
+        lat: float,
+        lon: float,
+        context: Hashable,
+        result: Dict[str, Any],
+        report_id: Any,
+        created_at: float,
+    ) -> None:
+        self.entry_id = entry_id
+        self.bands = bands
+        self.lat = lat
+        self.lon = lon
+        self.context = context
+        self.result = result
+        self.report_id = report_id
+        self.created_at = created_at
+
+
+class ReportDedupIndex:
+    """Time-windowed MinHash/LSH index of recently validated reports; thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float,
+        radius_m: float,
+        similarity: float,
+        max_entries: int,
+    ) -> None:
+        self.window_seconds = float(window_seconds)
+        self.radius_m = float(radius_m)
+        self.similarity = float(similarity)
+        self.max_entries = int(max_entries)
+        self._rows_per_band = NUM_PERM // LSH_BANDS
+        self._entries: "OrderedDict[int, _DedupEntry]" = OrderedDict()
+        # Live entry ids are contiguous (FIFO eviction), so signatures live in
+        # a ring indexed by entry_id % capacity and compare in one gather.
+        self._capacity = self.max_entries + 1
+        self._signatures = np.zeros((self._capacity, NUM_PERM), dtype=np.uint32)
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        # report_id -> entry_id, so a re-validated report replaces its entry.
+        self._by_report: Dict[Any, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        rows = self._rows_per_band
+        return [(band, signature[band * rows : (band + 1) * rows].tobytes()) for band in range(LSH_BANDS)]
+
+    def _drop_locked(self, entry: _DedupEntry) -> None:
+        self._entries.pop(entry.entry_id, None)
+        if entry.report_id is not None and self._by_report.get(entry.report_id) == entry.entry_id:
+            del self._by_report[entry.report_id]
+        for key in entry.bands:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(entry.entry_id)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._buckets[key]
+
+    def _evict_locked(self, now: float) -> None:
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            # Replaced entries leave gaps in the id range, so also keep the
+            # live ids within one signature-ring span.
+            if (
+                now - entry.created_at <= self.window_seconds
+                and len(self._entries) <= self.max_entries
+                and self._next_id - 1 - entry.entry_id < self._capacity
+            ):
+                break
+            self._drop_locked(entry)
+
+    def find(
+        self,
+        signature: np.ndarray,
+        lat: float,
+        lon: float,
+        *,
+        context: Hashable = None,
+        report_id: Any = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Best earlier match within the radius, or None.
+
+        Entries of ``report_id`` itself are skipped, so re-validating a report
+        (manual reclassify, edit, retry) scores it afresh instead of matching
+        its own earlier result.
+
+        Returns ``{"result": <copy of the earlier validation>, "duplicate_of":
+        {...}}`` where ``duplicate_of`` carries the earlier report id,
+        estimated similarity, distance and age.
+        """
+
+        now = time.time()
+        with self._lock:
+            self._evict_locked(now)
+            candidate_ids = set()
+            for key in self._band_keys(signature):
+                candidate_ids.update(self._buckets.get(key, ()))
+
+            best: Optional[Tuple[float, float, _DedupEntry]] = None
+            if candidate_ids:
+                ids = np.fromiter(candidate_ids, dtype=np.int64, count=len(candidate_ids))
+                matches = (self._signatures[ids % self._capacity] == signature).sum(axis=1)
+                for row in np.flatnonzero(matches >= self.similarity * NUM_PERM):
+                    entry = self._entries.get(int(ids[row]))
+                    if entry is None or entry.context != context:
+                        continue
+                    if report_id is not None and entry.report_id == report_id:
+                        continue
+                    similarity = float(matches[row]) / NUM_PERM
+                    distance_m = _haversine_m(lat, lon, entry.lat, entry.lon)
+                    if distance_m > self.radius_m:
+                        continue
+                    if best is None or (similarity, -distance_m) > (best[0], -best[1]):
+                        best = (similarity, distance_m, entry)
+
+            if best is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            similarity, distance_m, entry = best
+            return {
+                "result": copy.deepcopy(entry.result),
+                "duplicate_of": {
+                    "report_id": entry.report_id,
+                    "similarity": round(similarity, 4),
+                    "distance_m": round(distance_m, 1),
+                    "age_seconds": round(now - entry.created_at, 1),
+                },
+            }
+
+    def add(
+        self,
+        signature: np.ndarray,
+        lat: float,
+        lon: float,
+        result: Dict[str, Any],
+        *,
+        report_id: Any = None,
+        context: Hashable = None,
+    ) -> None:
+        now = time.time()
+        bands = self._band_keys(signature)
+        with self._lock:
+            previous = self._by_report.get(report_id) if report_id is not None else None
+            if previous is not None and previous in self._entries:
+                self._drop_locked(self._entries[previous])
+            entry = _DedupEntry(
+                self._next_id,
+                bands,
+                float(lat),
+                float(lon),
+                context,
+                copy.deepcopy(result),
+                report_id,
+                now,
+            )
+            self._signatures[entry.entry_id % self._capacity] = signature
+            self._next_id += 1
+            self._entries[entry.entry_id] = entry
+            if report_id is not None:
+                self._by_report[report_id] = entry.entry_id
+            for key in bands:
+                self._buckets.setdefault(key, []).append(entry.entry_id)
+            self._evict_locked(now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict_locked(time.time())
+            return {
+                "entries": len(self._entries),
+                "buckets": len(self._buckets),
+                "hits": self._hits,
+                "misses": self._misses,
+                "window_seconds": self.window_seconds,
+                "radius_m": self.radius_m,
+                "similarity": self.similarity,
+            }
+
+
+def build_report_dedup_index(env: Optional[Mapping[str, str]] = None) -> Optional[ReportDedupIndex]:
+    """Index for the env configuration, or None when deduplication is disabled."""
+
+    config = get_report_dedup_config(env)
+    if not config["enabled"]:
+        return None
+    return ReportDedupIndex(
+        window_seconds=config["window_seconds"],
+        radius_m=config["radius_m"],
+        similarity=config["similarity"],
+        max_entries=config["max_entries"],
+    )
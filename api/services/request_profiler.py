@@ -0,0 +1,175 @@
+"""On-demand cProfile capture for single ML requests.
+
+A request sent with ``X-Profile: 1`` and the matching ``X-Profile-Secret``
+header runs under ``cProfile``. The stats are written to a bounded ring of
+``.prof`` files (plus a small JSON sidecar with the route, status and
+duration), and the response carries ``X-Profile-Id``. The admin routes list
+the ring and return one profile as a pstats text report or the raw file for
+``snakeviz`` / ``python -m pstats``.
+
+Only one request is profiled at a time. On Python 3.12+ cProfile hooks
+``sys.monitoring``, which sees every thread, so a profile taken while other
+requests run also contains their calls; profile on an otherwise idle staging
+instance for a clean call tree.
+
+Runtime configuration:
+- REQUEST_PROFILE_SECRET=<shared secret> (unset: profiling and the admin
+  routes are disabled)
+- REQUEST_PROFILE_DIR=<tmp>/siara-profiles
+- REQUEST_PROFILE_KEEP=20 (newest profiles kept; older files are deleted)
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Mapping, Optional
+
+
+DEFAULT_KEEP = 20
+PROFILE_SUFFIX = ".prof"
+META_SUFFIX = ".json"
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+# <UTC yyyymmddThhmmss><ms>-<random>: sorts in creation order.
+_PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{9}-[0-9a-f]{8}$")
+
+
+def get_request_profiler_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    directory = str(source.get("REQUEST_PROFILE_DIR", "") or "").strip()
+    try:
+        keep = int(source.get("REQUEST_PROFILE_KEEP", str(DEFAULT_KEEP)))
+    except (TypeError, ValueError):
+        keep = DEFAULT_KEEP
+    secret = str(source.get("REQUEST_PROFILE_SECRET", "") or "")
+    return {
+        "enabled": bool(secret),
+        "secret": secret,
+        "directory": os.path.abspath(directory) if directory else os.path.join(tempfile.gettempdir(), "siara-profiles"),
+        "keep": max(1, keep),
+    }
+
+
+class ProfileCapture:
+    """One in-progress profile; ``RequestProfiler.finish`` stops and stores it."""
+
+    def __init__(self, profile_id: str) -> None:
+        self.profile_id = profile_id
+        self.started_at = time.perf_counter()
+        self.profiler = cProfile.Profile()
+
+
+class RequestProfiler:
+    """Secret-gated per-request cProfile capture with a bounded file ring."""
+
+    def __init__(self, *, secret: str, directory: str, keep: int = DEFAULT_KEEP) -> None:
+        self.directory = directory
+        self.keep = int(keep)
+        self._secret = secret.encode("utf-8")
+        self._busy = threading.Lock()
+        self._ring_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def authorized(self, provided: Optional[str]) -> bool:
+        return bool(provided) and hmac.compare_digest(str(provided).encode("utf-8"), self._secret)
+
+    def start(self) -> Optional[ProfileCapture]:
+        """Begin profiling the calling request, or None when another profile is running."""
+
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            now = time.time()
+            stamp = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}{int(now * 1000) % 1000:03d}"
+            capture = ProfileCapture(f"{stamp}-{uuid.uuid4().hex[:8]}")
+            capture.profiler.enable()
+        except Exception:
+            self._busy.release()
+            raise
+        return capture
+
+    def finish(self, capture: ProfileCapture, metadata: Mapping[str, Any]) -> str:
+        """Stop ``capture``, write it to the ring and return its id."""
+
+        try:
+            capture.profiler.disable()
+        finally:
+            self._busy.release()
+        elapsed_ms = round((time.perf_counter() - capture.started_at) * 1000.0, 2)
+
+        base = os.path.join(self.directory, capture.profile_id)
+        capture.profiler.dump_stats(base + PROFILE_SUFFIX)
+        with open(base + META_SUFFIX, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"profile_id": capture.profile_id, "elapsed_ms": elapsed_ms, "created_at": time.time(), **metadata},
+                fh,
+            )
+        self._trim()
+        return capture.profile_id
+
+    def _trim(self) -> None:
+        with self._ring_lock:
+            profile_ids = self._profile_ids()
+            for profile_id in profile_ids[: max(0, len(profile_ids) - self.keep)]:
+                for suffix in (PROFILE_SUFFIX, META_SUFFIX):
+                    try:
+                        os.remove(os.path.join(self.directory, profile_id + suffix))
+                    except OSError:
+                        pass
+
+    def _profile_ids(self) -> List[str]:
+        """Stored ids, oldest first (ids start with a UTC timestamp)."""
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(
+            name[: -len(PROFILE_SUFFIX)]
+            for name in names
+            if name.endswith(PROFILE_SUFFIX) and _PROFILE_ID_RE.match(name[: -len(PROFILE_SUFFIX)])
+        )
+
+    def profile_path(self, profile_id: str) -> Optional[str]:
+        if not _PROFILE_ID_RE.match(str(profile_id or "")):
+            return None
+        path = os.path.join(self.directory, profile_id + PROFILE_SUFFIX)
+        return path if os.path.exists(path) else None
+
+    def metadata(self, profile_id: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.directory, profile_id + META_SUFFIX), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {"profile_id": profile_id}
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        return [self.metadata(profile_id) for profile_id in reversed(self._profile_ids())]
+
+    def render_text(self, profile_id: str, *, sort: str = "cumulative", limit: int = 60) -> Optional[str]:
+        path = self.profile_path(profile_id)
+        if path is None:
+            return None
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.strip_dirs().sort_stats(sort if sort in SORT_KEYS else "cumulative").print_stats(max(1, int(limit)))
+        return output.getvalue()
+
+
+def build_request_profiler(env: Optional[Mapping[str, str]] = None) -> Optional[RequestProfiler]:
+    """Profiler for the env configuration, or None when no secret is set."""
+
+    config = get_request_profiler_config(env)
+    if not config["enabled"]:
+        return None
+    return RequestProfiler(secret=config["secret"], directory=config["directory"], keep=config["keep"])
@@ -22,11 +22,55 @@ const ML_AUTH_HEADERS = ML_SERVICE_TOKEN
   ? { Authorization: `Bearer ${ML_SERVICE_TOKEN}` }
   : {};
 
+// Calls slower than this are logged with the ML service's Server-Timing
+// stage breakdown (preprocess / predict / baseline / contrib / sentinel ...),
+// so the time can be attributed to network vs. a specific model stage.
+const SLOW_LOG_MS = Number(process.env.ML_SERVICE_SLOW_LOG_MS || 1500);
+
+function parseServerTiming(header) {
+  const stages = {};
+  for (const entry of String(header || "").split(",")) {
+    const [name, ...params] = entry.trim().split(";");
+    const dur = params.map((param) => param.trim()).find((param) => param.startsWith("dur="));
+    if (name && dur) {
+      stages[name] = Number(dur.slice(4));
+    }
+  }
+  return stages;
+}
+
+function logIfSlow(method, path, startedAt, response) {
+  const elapsedMs = Date.now() - startedAt;
+  if (elapsedMs < SLOW_LOG_MS) {
+    return;
+  }
+  const stages = parseServerTiming(response?.headers?.["server-timing"]);
+  const serverMs = stages.total;
+  console.warn(`[Node][ml-timing] ${method} ${path} took ${elapsedMs} ms`, {
+    server_ms: serverMs ?? null,
+    network_ms: serverMs === undefined ? null : Math.round(elapsedMs - serverMs),
+    stages,
+  });
+}
+
 async function postToFlask(path, body, deadline = null) {
-  return axios.post(`${ML_SERVICE_BASE_URL}${path}`, body, {
+  const startedAt = Date.now();
+  const response = await axios.post(`${ML_SERVICE_BASE_URL}${path}`, body, {
+    timeout: flaskTimeoutFor(deadline, TIMEOUT_MS),
+    headers: ML_AUTH_HEADERS,
+  });
+  logIfSlow("POST", path, startedAt, response);
+  return response;
+}
+
+async function getFromFlask(path, deadline = null) {
+  const startedAt = Date.now();
+  const response = await axios.get(`${ML_SERVICE_BASE_URL}${path}`, {
     timeout: flaskTimeoutFor(deadline, TIMEOUT_MS),
     headers: ML_AUTH_HEADERS,
   });
+  logIfSlow("GET", path, startedAt, response);
+  return response;
 }
 
 function writeSse(res, event, payload) {
@@ -46,6 +90,18 @@ async function postToFlaskStream(path, body) {
   });
 }
 
+async function getFromFlaskStream(path) {
+  return axios.get(`${ML_SERVICE_BASE_URL}${path}`, {
+    responseType: "stream",
+    timeout: STREAM_TIMEOUT_MS,
+    validateStatus: () => true,
+    headers: {
+      Accept: "text/event-stream",
+      ...ML_AUTH_HEADERS,
+    },
+  });
+}
+
 async function readStreamText(stream) {
   const chunks = [];
   for await (const chunk of stream) {
@@ -58,6 +114,9 @@ module.exports = {
   ML_SERVICE_BASE_URL,
   TIMEOUT_MS,
   STREAM_TIMEOUT_MS,
+  getFromFlask,
+  getFromFlaskStream,
+  parseServerTiming,
   postToFlask,
   postToFlaskStream,
   readStreamText,
@@ -0,0 +1,212 @@
+"""In-process nearest-road lookup for report location checks.
+
+``fuse`` in ``report_validator.py`` needs ``near_road`` and
+``distance_to_road_m``. Node computes them with a PostGIS ``ST_DWithin`` /
+``ST_Distance`` query against ``gis.road_segments``. This module answers the
+same question from a local GeoJSON export of that table, so ``/report/validate``
+can fill the fields itself when a caller omits them (and batch validation runs
+without a database).
+
+Layout:
+- Every polyline is split into straight edges stored as flat lon/lat arrays,
+  with the owning segment id per edge.
+- A uniform lon/lat grid (``ROAD_INDEX_CELL_DEG``) maps each cell to the edges
+  whose bounding box touches it, in CSR form (sorted cell keys, offsets, edge
+  ids), so a lookup only reads the few cells around the query radius.
+- Distances use a local equirectangular projection centred on the query point
+  (under 0.5 % off the geodesic distance at report-check radii).
+
+Runtime configuration:
+- ROAD_SEGMENTS_PATH=<GeoJSON FeatureCollection of LineString/MultiLineString,
+  optionally .gz> (unset: the index is disabled)
+- ROAD_INDEX_CELL_DEG=0.01
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_CELL_DEG = 0.01
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEG_LAT = EARTH_RADIUS_M * math.pi / 180.0
+# Cell keys pack (ix, iy) into one int64.
+_KEY_STRIDE = 1 << 32
+
+
+class RoadIndexError(ValueError):
+    """Raised when a road-segment export cannot be parsed."""
+
+
+def get_road_index_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    path = str(source.get("ROAD_SEGMENTS_PATH", "") or "").strip()
+    try:
+        cell_deg = float(source.get("ROAD_INDEX_CELL_DEG", str(DEFAULT_CELL_DEG)))
+    except (TypeError, ValueError):
+        cell_deg = DEFAULT_CELL_DEG
+    return {
+        "path": os.path.abspath(path) if path else None,
+        "cell_deg": cell_deg if cell_deg > 0 else DEFAULT_CELL_DEG,
+    }
+
+
+def _feature_segment_id(feature: Mapping[str, Any], index: int) -> Any:
+    properties = feature.get("properties") or {}
+    for value in (feature.get("id"), properties.get("id"), properties.get("segment_id")):
+        if value is not None:
+            return value
+    return index
+
+
+def _feature_lines(geometry: Mapping[str, Any]) -> List[List[List[float]]]:
+    kind = geometry.get("type")
+    if kind == "LineString":
+        return [geometry.get("coordinates") or []]
+    if kind == "MultiLineString":
+        return list(geometry.get("coordinates") or [])
+    return []
+
+
+class RoadSegmentIndex:
+    """Uniform-grid index over road polyline edges; read-only after build."""
+
+    def __init__(self, features: Iterable[Mapping[str, Any]], *, cell_deg: float = DEFAULT_CELL_DEG) -> None:
+        started_at = time.perf_counter()
+        self.cell_deg = float(cell_deg)
+
+        segment_ids: List[Any] = []
+        starts: List[np.ndarray] = []
+        ends: List[np.ndarray] = []
+        edge_segments: List[np.ndarray] = []
+        for index, feature in enumerate(features):
+            geometry = feature.get("geometry") or {}
+            segment_row = len(segment_ids)
+            added = False
+            for line in _feature_lines(geometry):
+                points = np.asarray([point[:2] for point in line], dtype=np.float64)
+                if points.ndim != 2 or len(points) < 2:
+                    continue
+                starts.append(points[:-1])
+                ends.append(points[1:])
+                edge_segments.append(np.full(len(points) - 1, segment_row, dtype=np.int64))
+                added = True
+            if added:
+                segment_ids.append(_feature_segment_id(feature, index))
+
+        if not segment_ids:
+            raise RoadIndexError("No LineString/MultiLineString features in the road export")
+
+        start = np.concatenate(starts)
+        end = np.concatenate(ends)
+        # Edge endpoints as lon/lat columns: (n_edges,) each.
+        self._ax, self._ay = start[:, 0].copy(), start[:, 1].copy()
+        self._bx, self._by = end[:, 0].copy(), end[:, 1].copy()
+        self._edge_segment = np.concatenate(edge_segments)
+        self._segment_ids = segment_ids
+
+        self._build_grid()
+        self.build_ms = round((time.perf_counter() - started_at) * 1000.0, 1)
+
+    def _cell(self, value: np.ndarray) -> np.ndarray:
+        return np.floor(value / self.cell_deg).astype(np.int64)
+
+    def _keys(self, ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+        return ix * _KEY_STRIDE + iy
+
+    def _build_grid(self) -> None:
+        ix0 = self._cell(np.minimum(self._ax, self._bx))
+        ix1 = self._cell(np.maximum(self._ax, self._bx))
+        iy0 = self._cell(np.minimum(self._ay, self._by))
+        iy1 = self._cell(np.maximum(self._ay, self._by))
+        widths = ix1 - ix0 + 1
+        counts = widths * (iy1 - iy0 + 1)
+
+        # Expand every edge into the cells of its bounding box.
+        edge_ids = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+        local = np.arange(len(edge_ids), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = ix0[edge_ids] + local % widths[edge_ids]
+        cell_y = iy0[edge_ids] + local // widths[edge_ids]
+        keys = self._keys(cell_x, cell_y)
+
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self._cell_edges = edge_ids[order]
+        self._cell_keys, first = np.unique(keys, return_index=True)
+        self._cell_offsets = np.append(first, len(keys))
+
+    @property
+    def n_segments(self) -> int:
+        return len(self._segment_ids)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self._ax)
+
+    def nearest(self, lat: float, lon: float, max_distance_m: float) -> Tuple[Optional[float], Any]:
+        """``(distance_m, segment_id)`` of the closest edge within the radius, else ``(None, None)``."""
+
+        meters_per_deg_lon = METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6)
+        dlat = max_distance_m / METERS_PER_DEG_LAT
+        dlon = max_distance_m / meters_per_deg_lon
+        ix = np.arange(int(math.floor((lon - dlon) / self.cell_deg)), int(math.floor((lon + dlon) / self.cell_deg)) + 1)
+        iy = np.arange(int(math.floor((lat - dlat) / self.cell_deg)), int(math.floor((lat + dlat) / self.cell_deg)) + 1)
+        wanted = self._keys(np.repeat(ix, len(iy)), np.tile(iy, len(ix)))
+
+        slots = np.searchsorted(self._cell_keys, wanted)
+        present = slots < len(self._cell_keys)
+        slots, wanted = slots[present], wanted[present]
+        slots = slots[self._cell_keys[slots] == wanted]
+        if not len(slots):
+            return None, None
+        edges = np.unique(
+            np.concatenate([self._cell_edges[self._cell_offsets[s] : self._cell_offsets[s + 1]] for s in slots])
+        )
+
+        # Local metric frame centred on the query point.
+        ax = (self._ax[edges] - lon) * meters_per_deg_lon
+        ay = (self._ay[edges] - lat) * METERS_PER_DEG_LAT
+        dx = (self._bx[edges] - lon) * meters_per_deg_lon - ax
+        dy = (self._by[edges] - lat) * METERS_PER_DEG_LAT - ay
+        length_sq = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(length_sq > 0.0, -(ax * dx + ay * dy) / length_sq, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        distances = np.hypot(ax + t * dx, ay + t * dy)
+
+        best = int(np.argmin(distances))
+        distance = float(distances[best])
+        if distance > max_distance_m:
+            return None, None
+        return distance, self._segment_ids[int(self._edge_segment[edges[best]])]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segments": self.n_segments,
+            "edges": self.n_edges,
+            "cells": int(len(self._cell_keys)),
+            "cell_deg": self.cell_deg,
+            "build_ms": self.build_ms,
+        }
+
+
+def load_road_index(path: str, *, cell_deg: float = DEFAULT_CELL_DEG) -> RoadSegmentIndex:
+    """Build the index from a GeoJSON FeatureCollection (``.geojson`` or ``.geojson.gz``)."""
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        try:
+            collection = json.load(fh)
+        except ValueError as exc:
+            raise RoadIndexError(f"Invalid GeoJSON in {path}: {exc}") from exc
+    features = collection.get("features") if isinstance(collection, dict) else None
+    if not isinstance(features, list):
+        raise RoadIndexError(f"{path} is not a GeoJSON FeatureCollection")
+    return RoadSegmentIndex(features, cell_deg=cell_deg)
@@ -0,0 +1,274 @@
+"""Per-route ring of the slowest recent requests, with replayable payloads.
+
+Every finished request is offered to ``SlowRequestLog``. For each route it
+keeps the ``SLOW_REQUEST_LOG_SIZE`` slowest requests seen in the last
+``SLOW_REQUEST_WINDOW_SECONDS``; entries older than the window are dropped,
+which frees their slots for newer requests. Whether a request qualifies is
+decided from its duration alone, so the payload summary below is only built
+for the few requests that are actually kept.
+
+An entry holds the route, status, duration, the request's stage breakdown,
+model row counts and cache hits/misses (``RequestTimings.as_dict()``), and a
+payload summary:
+- ``sha256``: hash of the canonical JSON body, to spot repeated payloads;
+- ``shape``: the body's structure (keys, list lengths, value types);
+- ``redacted``: the body with free text and identifiers replaced by
+  ``"<redacted:N>"`` (numbers, flags and short codes are kept), so numeric
+  rows can be replayed as-is. It is left out past
+  ``SLOW_REQUEST_MAX_PAYLOAD_BYTES`` or with ``SLOW_REQUEST_PAYLOAD=shape``.
+
+``dump`` writes the current ring to a JSON file in ``SLOW_REQUEST_DUMP_DIR``.
+
+Runtime configuration:
+- SLOW_REQUEST_LOG_SIZE=10 (entries kept per route; 0 disables the log;
+  ml_service only builds it when REQUEST_PROFILE_SECRET is set)
+- SLOW_REQUEST_WINDOW_SECONDS=900
+- SLOW_REQUEST_MIN_MS=0 (faster requests are never recorded)
+- SLOW_REQUEST_PAYLOAD=redacted (or shape)
+- SLOW_REQUEST_MAX_PAYLOAD_BYTES=65536
+- SLOW_REQUEST_DUMP_DIR=<tmp>/siara-slow-requests
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Mapping, Optional
+
+
+DEFAULT_SIZE = 10
+DEFAULT_WINDOW_SECONDS = 900.0
+DEFAULT_MAX_PAYLOAD_BYTES = 65536
+# Strings under these keys (any depth) never leave the process.
+REDACTED_KEYS = frozenset(
+    {
+        "title",
+        "description",
+        "text",
+        "comment",
+        "message",
+        "image_url",
+        "image_path",
+        "image",
+        "image_base64",
+        "email",
+        "phone",
+        "name",
+        "address",
+        "user_id",
+        "reporter_id",
+        "token",
+        "secret",
+        "password",
+    }
+)
+# Longer strings elsewhere are treated as free text.
+MAX_KEPT_STRING = 64
+_SHAPE_MAX_DEPTH = 6
+
+
+def get_slow_request_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    try:
+        size = int(source.get("SLOW_REQUEST_LOG_SIZE", str(DEFAULT_SIZE)))
+    except (TypeError, ValueError):
+        size = DEFAULT_SIZE
+    try:
+        window_seconds = float(source.get("SLOW_REQUEST_WINDOW_SECONDS", str(DEFAULT_WINDOW_SECONDS)))
+    except (TypeError, ValueError):
+        window_seconds = DEFAULT_WINDOW_SECONDS
+    try:
+        min_ms = float(source.get("SLOW_REQUEST_MIN_MS", "0"))
+    except (TypeError, ValueError):
+        min_ms = 0.0
+    try:
+        max_payload_bytes = int(source.get("SLOW_REQUEST_MAX_PAYLOAD_BYTES", str(DEFAULT_MAX_PAYLOAD_BYTES)))
+    except (TypeError, ValueError):
+        max_payload_bytes = DEFAULT_MAX_PAYLOAD_BYTES
+    directory = str(source.get("SLOW_REQUEST_DUMP_DIR", "") or "").strip()
+    payload_mode = str(source.get("SLOW_REQUEST_PAYLOAD", "redacted") or "").strip().lower()
+    return {
+        "enabled": size > 0,
+        "size": max(1, size),
+        "window_seconds": max(1.0, window_seconds),
+        "min_ms": max(0.0, min_ms),
+        "keep_payload": payload_mode != "shape",
+        "max_payload_bytes": max(0, max_payload_bytes),
+        "dump_dir": os.path.abspath(directory)
+        if directory
+        else os.path.join(tempfile.gettempdir(), "siara-slow-requests"),
+    }
+
+
+def payload_shape(value: Any, depth: int = 0) -> Any:
+    """Structure of a JSON value: dict keys, list lengths (first item's shape), type names."""
+
+    if depth >= _SHAPE_MAX_DEPTH:
+        return "..."
+    if isinstance(value, dict):
+        return {str(key): payload_shape(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, list):
+        return {"list": len(value), "item": payload_shape(value[0], depth + 1) if value else None}
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+def redact_payload(value: Any, key: Optional[str] = None) -> Any:
+    if isinstance(value, dict):
+        return {item_key: redact_payload(item, str(item_key)) for item_key, item in value.items()}
+    if isinstance(value, list):
+        return [redact_payload(item, key) for item in value]
+    if isinstance(value, str) and (
+        (key is not None and key.lower() in REDACTED_KEYS) or len(value) > MAX_KEPT_STRING
+    ):
+        return f"<redacted:{len(value)}>"
+    return value
+
+
+class SlowRequestLog:
+    """Slowest requests per route over a rolling window; thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        size: int = DEFAULT_SIZE,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        min_ms: float = 0.0,
+        keep_payload: bool = True,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+        dump_dir: Optional[str] = None,
+    ) -> None:
+        self.size = int(size)
+        self.window_seconds = float(window_seconds)
+        self.min_ms = float(min_ms)
+        self.keep_payload = bool(keep_payload)
+        self.max_payload_bytes = int(max_payload_bytes)
+        self.dump_dir = dump_dir or os.path.join(tempfile.gettempdir(), "siara-slow-requests")
+        self._routes: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._offered = 0
+        self._recorded = 0
+
+    def _evict_locked(self, route: str, now: float) -> List[Dict[str, Any]]:
+        entries = [entry for entry in self._routes.get(route, ()) if now - entry["at"] <= self.window_seconds]
+        self._routes[route] = entries
+        return entries
+
+    def admits(self, route: str, duration_ms: float) -> bool:
+        """Whether a request this slow would enter the ring for ``route``."""
+
+        with self._lock:
+            self._offered += 1
+            if duration_ms < self.min_ms:
+                return False
+            entries = self._evict_locked(route, time.time())
+            return len(entries) < self.size or duration_ms > min(entry["duration_ms"] for entry in entries)
+
+    def summarize_payload(self, payload: Any, raw_bytes: int) -> Dict[str, Any]:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        summary: Dict[str, Any] = {
+            "sha256": hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+            "bytes": int(raw_bytes),
+            "shape": payload_shape(payload),
+        }
+        if self.keep_payload:
+            redacted = redact_payload(payload)
+            if len(json.dumps(redacted, default=str)) <= self.max_payload_bytes:
+                summary["redacted"] = redacted
+            else:
+                summary["redacted_omitted"] = "too large"
+        return summary
+
+    def record(
+        self,
+        route: str,
+        duration_ms: float,
+        *,
+        method: str,
+        status: int,
+        timing: Mapping[str, Any],
+        payload: Mapping[str, Any],
+    ) -> Optional[str]:
+        """Add a request that passed ``admits``; returns its entry id if it still fits."""
+
+        now = time.time()
+        entry = {
+            "id": uuid.uuid4().hex[:12],
+            "route": route,
+            "method": method,
+            "status": int(status),
+            "duration_ms": round(float(duration_ms), 2),
+            "at": now,
+            "timing": dict(timing),
+            "payload": dict(payload),
+        }
+        with self._lock:
+            entries = self._evict_locked(route, now)
+            if len(entries) >= self.size:
+                fastest = min(range(len(entries)), key=lambda index: entries[index]["duration_ms"])
+                if entries[fastest]["duration_ms"] >= entry["duration_ms"]:
+                    return None
+                entries.pop(fastest)
+            entries.append(entry)
+            self._recorded += 1
+        return entry["id"]
+
+    def entries(self, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Kept entries, slowest first (optionally for one route)."""
+
+        now = time.time()
+        with self._lock:
+            routes = [route] if route is not None else list(self._routes)
+            rows = [entry for name in routes for entry in self._evict_locked(name, now)]
+        return sorted(rows, key=lambda entry: entry["duration_ms"], reverse=True)
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        for entry in self.entries():
+            if entry["id"] == entry_id:
+                return entry
+        return None
+
+    def dump(self) -> str:
+        """Write the current entries to ``dump_dir`` and return the file path."""
+
+        os.makedirs(self.dump_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        path = os.path.join(self.dump_dir, f"slow-requests-{stamp}-{uuid.uuid4().hex[:6]}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"dumped_at": time.time(), "entries": self.entries()}, fh, default=str)
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            kept = {route: len(self._evict_locked(route, now)) for route in list(self._routes)}
+            return {
+                "size_per_route": self.size,
+                "window_seconds": self.window_seconds,
+                "min_ms": self.min_ms,
+                "offered": self._offered,
+                "recorded": self._recorded,
+                "kept": {route: count for route, count in kept.items() if count},
+            }
+
+
+def build_slow_request_log(env: Optional[Mapping[str, str]] = None) -> Optional[SlowRequestLog]:
+    """Log for the env configuration, or None when disabled."""
+
+    config = get_slow_request_config(env)
+    if not config["enabled"]:
+        return None
+    return SlowRequestLog(
+        size=config["size"],
+        window_seconds=config["window_seconds"],
+        min_ms=config["min_ms"],
+        keep_payload=config["keep_payload"],
+        max_payload_bytes=config["max_payload_bytes"],
+        dump_dir=config["dump_dir"],
+    )
@@ -0,0 +1,242 @@
+"""Always-on sampling profiler with aggregated folded stacks.
+
+A daemon thread wakes ``STACK_SAMPLER_HZ`` times per second, reads
+``sys._current_frames()`` and folds every other thread's Python stack into a
+``module:function;...;module:function`` key whose counter it bumps. Stacks are
+not copied or symbolised per sample beyond one label lookup per code object,
+and the table is bounded (``STACK_SAMPLER_MAX_STACKS``; later new stacks are
+counted under ``[other]``), so memory stays flat under any traffic.
+
+Threads parked in a blocking wait (thread-pool queue, socket, selector,
+condition) are counted as idle and kept out of the hot-stack table, so the
+output shows where CPU goes. The text form is the folded format that
+``flamegraph.pl`` and speedscope read; the JSON form adds self/inclusive
+sample shares per top-level package (pandas, lightgbm, sklearn, json, ...).
+
+The sampler times its own work, so ``stats()["overhead_percent"]`` is the
+measured share of one core spent sampling.
+
+Runtime configuration:
+- STACK_SAMPLER_HZ=50 (0 disables the sampler; ml_service only starts it
+  when REQUEST_PROFILE_SECRET is set)
+- STACK_SAMPLER_MAX_STACKS=5000
+- STACK_SAMPLER_MAX_DEPTH=64
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+
+DEFAULT_HZ = 50.0
+DEFAULT_MAX_STACKS = 5000
+DEFAULT_MAX_DEPTH = 64
+OTHER_STACK = "[other]"
+
+# Leaf frames that mean "blocked, not burning CPU".
+_IDLE_LEAVES = {
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+    ("selectors", "select"),
+    ("socket", "accept"),
+    ("socket", "readinto"),
+    ("ssl", "read"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+
+def get_stack_sampler_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    source = env or os.environ
+    try:
+        hz = float(source.get("STACK_SAMPLER_HZ", str(DEFAULT_HZ)))
+    except (TypeError, ValueError):
+        hz = DEFAULT_HZ
+    try:
+        max_stacks = int(source.get("STACK_SAMPLER_MAX_STACKS", str(DEFAULT_MAX_STACKS)))
+    except (TypeError, ValueError):
+        max_stacks = DEFAULT_MAX_STACKS
+    try:
+        max_depth = int(source.get("STACK_SAMPLER_MAX_DEPTH", str(DEFAULT_MAX_DEPTH)))
+    except (TypeError, ValueError):
+        max_depth = DEFAULT_MAX_DEPTH
+    return {
+        "enabled": hz > 0,
+        "hz": min(max(hz, 0.0), 1000.0),
+        "max_stacks": max(1, max_stacks),
+        "max_depth": max(1, max_depth),
+    }
+
+
+def _package_of(label: str) -> str:
+    return label.split(":", 1)[0].split(".", 1)[0]
+
+
+class StackSampler:
+    """Background ``sys._current_frames()`` sampler; thread-safe reads."""
+
+    def __init__(self, *, hz: float = DEFAULT_HZ, max_stacks: int = DEFAULT_MAX_STACKS, max_depth: int = DEFAULT_MAX_DEPTH) -> None:
+        self.hz = float(hz)
+        self.interval = 1.0 / self.hz
+        self.max_stacks = int(max_stacks)
+        self.max_depth = int(max_depth)
+        self._labels: Dict[Any, Tuple[str, bool]] = {}
+        self._stacks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reset_counters_locked()
+
+    def _reset_counters_locked(self) -> None:
+        self._stacks = {}
+        self._samples = 0
+        self._busy_samples = 0
+        self._idle_samples = 0
+        self._sampling_seconds = 0.0
+        self._since = time.time()
+        self._since_monotonic = time.monotonic()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _label(self, frame: Any) -> Tuple[str, bool]:
+        code = frame.f_code
+        cached = self._labels.get(code)
+        if cached is None:
+            module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+            cached = (f"{module}:{code.co_name}", (module, code.co_name) in _IDLE_LEAVES)
+            self._labels[code] = cached
+        return cached
+
+    def _fold(self, frame: Any) -> Tuple[Optional[str], bool]:
+        leaf_label, idle = self._label(frame)
+        if idle:
+            return None, True
+        labels = [leaf_label]
+        frame = frame.f_back
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(self._label(frame)[0])
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels), False
+
+    def sample_once(self) -> None:
+        started_at = time.perf_counter()
+        own_id = threading.get_ident()
+        folded: List[str] = []
+        idle = 0
+        frames = sys._current_frames()
+        for thread_id, frame in frames.items():
+            if thread_id == own_id:
+                continue
+            stack, is_idle = self._fold(frame)
+            if is_idle:
+                idle += 1
+            else:
+                folded.append(stack)
+        # Drop the frame references now rather than holding them until the next tick.
+        frames = frame = None
+
+        with self._lock:
+            for stack in folded:
+                if stack in self._stacks:
+                    self._stacks[stack] += 1
+                elif len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] = 1
+                else:
+                    self._stacks[OTHER_STACK] = self._stacks.get(OTHER_STACK, 0) + 1
+            self._samples += 1
+            self._busy_samples += len(folded)
+            self._idle_samples += idle
+            self._sampling_seconds += time.perf_counter() - started_at
+
+    def _run(self) -> None:
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception as exc:  # noqa: BLE001 — never take the service down
+                print(f"[stack-sampler] sample failed: {exc}", flush=True)
+            next_at += self.interval
+            delay = next_at - time.monotonic()
+            if delay <= 0:
+                # Fell behind (GIL contention); skip missed ticks instead of bursting.
+                next_at = time.monotonic()
+                continue
+            self._stop.wait(delay)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset_counters_locked()
+
+    def folded(self, limit: Optional[int] = None) -> str:
+        """Folded stacks (``frame;frame;frame count`` per line), hottest first."""
+
+        with self._lock:
+            rows = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+        if limit:
+            rows = rows[: int(limit)]
+        return "".join(f"{stack} {count}\n" for stack, count in rows)
+
+    def package_shares(self) -> Dict[str, Dict[str, float]]:
+        """Self (leaf frame) and inclusive (anywhere on the stack) sample share per package."""
+
+        with self._lock:
+            rows = list(self._stacks.items())
+            total = self._busy_samples
+        self_counts: Dict[str, int] = {}
+        inclusive_counts: Dict[str, int] = {}
+        for stack, count in rows:
+            if stack == OTHER_STACK:
+                continue
+            labels = stack.split(";")
+            leaf_package = _package_of(labels[-1])
+            self_counts[leaf_package] = self_counts.get(leaf_package, 0) + count
+            for package in {_package_of(label) for label in labels}:
+                inclusive_counts[package] = inclusive_counts.get(package, 0) + count
+        if not total:
+            return {"self": {}, "inclusive": {}}
+        return {
+            "self": {
+                package: round(count / total, 4)
+                for package, count in sorted(self_counts.items(), key=lambda item: item[1], reverse=True)
+            },
+            "inclusive": {
+                package: round(count / total, 4)
+                for package, count in sorted(inclusive_counts.items(), key=lambda item: item[1], reverse=True)
+            },
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            wall_seconds = max(time.monotonic() - self._since_monotonic, 1e-9)
+            return {
+                "hz": self.hz,
+                "since": self._since,
+                "samples": self._samples,
+                "busy_thread_samples": self._busy_samples,
+                "idle_thread_samples": self._idle_samples,
+                "stacks": len(self._stacks),
+                "max_stacks": self.max_stacks,
+                "mean_sample_us": round(self._sampling_seconds / self._samples * 1e6, 1) if self._samples else None,
+                "overhead_percent": round(self._sampling_seconds / wall_seconds * 100.0, 3),
+            }
+
+
+def build_stack_sampler(env: Optional[Mapping[str, str]] = None) -> Optional[StackSampler]:
+    """Sampler for the env configuration (not yet started), or None when disabled."""
+
+    config = get_stack_sampler_config(env)
+    if not config["enabled"]:
+        return None
+    return StackSampler(hz=config["hz"], max_stacks=config["max_stacks"], max_depth=config["max_depth"])
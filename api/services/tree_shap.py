@@ -0,0 +1,265 @@
+"""Path-dependent TreeSHAP for scikit-learn random forests, on ``tree_`` arrays.
+
+Used by the driver-quiz model (``driver_model_raw.joblib``) so the ML service
+does not need the ``shap`` package. The values match
+``shap.TreeExplainer(forest).shap_values(X)`` for a ``RandomForestClassifier``
+(probability space, averaged over trees; shape ``(n_samples, n_features,
+n_classes)``).
+
+Formulation: every leaf ``l`` contributes along its root path ``P`` (unique
+features, duplicates merged). For a feature ``j`` on the path, ``z_j`` is the
+product of cover ratios of the edges splitting on ``j`` and ``o_j(x)`` is 1
+when ``x`` satisfies every split on ``j`` (an interval ``lo < x_j <= hi``).
+TreeSHAP's EXTEND/UNWIND recursion sums Shapley weights
+``w(k, d) = k! (d - k - 1)! / d!`` over subsets of ``P``; since
+``w(k, d) = integral_0^1 t^k (1 - t)^(d - k - 1) dt`` that sum collapses to
+
+    phi_i(x) += v_l * (o_i - z_i) * integral_0^1 prod_{j in P, j != i} (z_j + (o_j - z_j) t) dt
+
+(the "Linear TreeSHAP" form). The integrand has degree < n_features, so an
+n_features/2-point Gauss-Legendre rule integrates it exactly. Features off the
+path contribute a factor of 1 (``z = o = 1``).
+
+Since ``o_j`` is 0 or 1, each factor is either ``a_j = z_j + (1 - z_j) t`` or
+``b_j = z_j (1 - t)``, so per leaf and quadrature node the full product is
+``exp(sum_j log b_j + sum_j o_j log(a_j / b_j))`` — a small matrix product —
+and leaving feature ``i`` out is one more product with ``1 / a_i`` or
+``1 / b_i``. ``log(a / b)`` and ``1 / a`` take about
+``(2 * n_features + 1) * n_nodes * 8`` bytes per leaf (~290 MB for the
+shipped 265k-leaf forest). By default they are precompiled for every leaf,
+sized from the model at load time; ``TREE_SHAP_FACTOR_CACHE_MB`` caps that,
+and leaves past the cap get their factors built per leaf block at scoring
+time (less memory, slower single-sample calls). Scoring runs over (sample,
+leaf) blocks to bound temporaries.
+
+Runtime configuration:
+- TREE_SHAP_FACTOR_CACHE_MB=<unset> (unset: precompile the whole forest;
+  0 builds every leaf block's factors on demand)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+# Scoring works on (sample, leaf) blocks of at most CHUNK_CELLS cells.
+CHUNK_CELLS = 1 << 16
+MIN_LEAF_CHUNK = 1024
+
+
+def get_factor_cache_bytes(env: Optional[Mapping[str, str]] = None) -> Optional[int]:
+    """Factor cache cap in bytes, or None (the default) for the whole forest."""
+
+    source = env or os.environ
+    raw = str(source.get("TREE_SHAP_FACTOR_CACHE_MB", "") or "").strip()
+    if not raw:
+        return None
+    try:
+        megabytes = float(raw)
+    except ValueError:
+        return None
+    return int(max(0.0, megabytes) * 1024 * 1024)
+
+
+def _tree_leaf_paths(tree: Any, n_features: int) -> Dict[str, np.ndarray]:
+    """Walk one fitted sklearn ``tree_`` and emit per-leaf path arrays."""
+
+    children_left = tree.children_left
+    children_right = tree.children_right
+    feature = tree.feature
+    threshold = tree.threshold
+    cover = np.asarray(tree.weighted_n_node_samples, dtype=float)
+    values = np.asarray(tree.value, dtype=float)
+    values = values.reshape(values.shape[0], -1)
+    totals = values.sum(axis=1, keepdims=True)
+    totals[totals == 0.0] = 1.0
+    # Classifier leaves hold class counts (or fractions since sklearn 1.4);
+    # shap explains the normalized per-tree probabilities.
+    values = values / totals
+
+    leaf_values: List[np.ndarray] = []
+    lows: List[np.ndarray] = []
+    highs: List[np.ndarray] = []
+    zeros: List[np.ndarray] = []
+    on_path: List[np.ndarray] = []
+
+    stack: List[Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = [
+        (
+            0,
+            np.full(n_features, -np.inf),
+            np.full(n_features, np.inf),
+            np.ones(n_features),
+            np.zeros(n_features, dtype=bool),
+        )
+    ]
+    while stack:
+        node, low, high, zero, mask = stack.pop()
+        left = children_left[node]
+        if left == -1:
+            leaf_values.append(values[node])
+            lows.append(low)
+            highs.append(high)
+            zeros.append(zero)
+            on_path.append(mask)
+            continue
+        right = children_right[node]
+        feat = int(feature[node])
+        thr = float(threshold[node])
+        parent_cover = cover[node] if cover[node] > 0 else 1.0
+
+        left_high = high.copy()
+        left_high[feat] = min(left_high[feat], thr)
+        left_zero = zero.copy()
+        left_zero[feat] *= cover[left] / parent_cover
+        left_mask = mask.copy()
+        left_mask[feat] = True
+        stack.append((left, low, left_high, left_zero, left_mask))
+
+        right_low = low.copy()
+        right_low[feat] = max(right_low[feat], thr)
+        right_zero = zero.copy()
+        right_zero[feat] *= cover[right] / parent_cover
+        right_mask = mask.copy()
+        right_mask[feat] = True
+        stack.append((right, right_low, high, right_zero, right_mask))
+
+    root_cover = cover[0] if cover[0] > 0 else 1.0
+    return {
+        "values": np.vstack(leaf_values),
+        "low": np.vstack(lows),
+        "high": np.vstack(highs),
+        "zero": np.vstack(zeros),
+        "on_path": np.vstack(on_path),
+        "expected": _tree_expected_value(values, children_left, cover, root_cover),
+    }
+
+
+def _tree_expected_value(
+    values: np.ndarray, children_left: np.ndarray, cover: np.ndarray, root_cover: float
+) -> np.ndarray:
+    leaves = children_left == -1
+    return (values[leaves] * (cover[leaves] / root_cover)[:, None]).sum(axis=0)
+
+
+class ForestTreeShap:
+    """Compiled path-dependent TreeSHAP explainer for a fitted sklearn forest."""
+
+    def __init__(self, forest: Any, *, factor_cache_bytes: Optional[int] = None) -> None:
+        estimators = getattr(forest, "estimators_", None)
+        if estimators is None:
+            estimators = [forest]
+        if not estimators or not all(hasattr(est, "tree_") for est in estimators):
+            raise TypeError("ForestTreeShap expects a fitted sklearn tree ensemble")
+
+        self.n_features = int(getattr(forest, "n_features_in_", estimators[0].tree_.n_features))
+        n_trees = len(estimators)
+        compiled = [_tree_leaf_paths(est.tree_, self.n_features) for est in estimators]
+
+        # Fold the 1/n_trees averaging into the leaf values once.
+        self._values = np.vstack([c["values"] for c in compiled]) / n_trees
+        on_path = np.vstack([c["on_path"] for c in compiled])
+        self._on_path = on_path
+        self._low = np.vstack([c["low"] for c in compiled])
+        self._high = np.vstack([c["high"] for c in compiled])
+        zero = np.where(on_path, np.vstack([c["zero"] for c in compiled]), 1.0)
+        self._zero = zero
+        self.n_outputs = int(self._values.shape[1])
+        self.n_leaves = int(self._values.shape[0])
+        self.expected_value = np.mean([c["expected"] for c in compiled], axis=0)
+
+        # Gauss-Legendre nodes/weights mapped from [-1, 1] onto [0, 1].
+        n_nodes = max(1, (self.n_features + 1) // 2)
+        nodes, node_weights = np.polynomial.legendre.leggauss(n_nodes)
+        self._nodes = (nodes + 1.0) / 2.0
+        self._node_weights = node_weights / 2.0
+        self._inv_one_minus_t = 1.0 / (1.0 - self._nodes)
+        self._log_one_minus_t = np.log1p(-self._nodes)
+
+        # Precompile leaf factors for the whole forest, or as many leaves as
+        # the configured cap allows.
+        if factor_cache_bytes is None:
+            factor_cache_bytes = get_factor_cache_bytes()
+        bytes_per_leaf = (2 * self.n_features + 1) * n_nodes * 8
+        if factor_cache_bytes is None:
+            self._cached_leaves = self.n_leaves
+        else:
+            self._cached_leaves = min(self.n_leaves, int(factor_cache_bytes) // bytes_per_leaf)
+        self.factor_cache_bytes = self._cached_leaves * bytes_per_leaf
+        self._cached_factors = self._build_leaf_factors(0, self._cached_leaves)
+
+    def shap_values(self, X: Any) -> np.ndarray:
+        """SHAP values with shape ``(n_samples, n_features, n_outputs)``."""
+
+        # sklearn trees compare float32 inputs against float64 thresholds.
+        x = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        if x.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected {self.n_features} features, got {x.shape[1]}"
+            )
+
+        n_samples = x.shape[0]
+        out = np.zeros((n_samples, self.n_features, self.n_outputs))
+        sample_step = max(1, min(n_samples, CHUNK_CELLS // MIN_LEAF_CHUNK))
+        leaf_step = max(MIN_LEAF_CHUNK, CHUNK_CELLS // sample_step)
+        # Leaf factors are built per leaf block and reused for every sample
+        # block, so memory stays at one block's worth whatever the forest size.
+        for start in range(0, self.n_leaves, leaf_step):
+            stop = min(start + leaf_step, self.n_leaves)
+            factors = self._leaf_factors(start, stop)
+            for row in range(0, n_samples, sample_step):
+                out[row : row + sample_step] += self._chunk_contributions(
+                    x[row : row + sample_step], start, stop, *factors
+                )
+        return out
+
+    def _leaf_factors(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        cached = self._cached_leaves
+        if stop <= cached:
+            return tuple(factor[start:stop] for factor in self._cached_factors)
+        if start >= cached:
+            return self._build_leaf_factors(start, stop)
+        built = self._build_leaf_factors(cached, stop)
+        return tuple(
+            np.concatenate([factor[start:], rest]) for factor, rest in zip(self._cached_factors, built)
+        )
+
+    def _build_leaf_factors(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``log(a / b)`` (L, F, M), ``sum log b`` (L, M) and ``1 / a`` (L, M, F) for a leaf block."""
+
+        # log b = log z + log(1 - t), so only a needs a per-node log.
+        log_zero = np.log(self._zero[start:stop])
+        a = self._zero[start:stop, None, :] * (1.0 - self._nodes)[:, None] + self._nodes[:, None]
+        log_ratio = np.swapaxes(np.log(a), 1, 2) - log_zero[:, :, None] - self._log_one_minus_t
+        log_base = log_zero.sum(axis=1)[:, None] + self.n_features * self._log_one_minus_t
+        return log_ratio, log_base, 1.0 / a
+
+    def _chunk_contributions(
+        self,
+        x: np.ndarray,
+        start: int,
+        stop: int,
+        log_ratio: np.ndarray,
+        log_base: np.ndarray,
+        inv_a: np.ndarray,
+    ) -> np.ndarray:
+        zero = self._zero[start:stop, None, :]
+
+        # one-fractions (L, n, F); off-path features read as o = 1 (with z = 1).
+        inside = (x[None] > self._low[start:stop, None]) & (x[None] <= self._high[start:stop, None])
+        one = (inside | ~self._on_path[start:stop, None]).astype(np.float64)
+
+        # Weighted full path product at every quadrature node: (L, n, M).
+        full = np.exp(log_base[:, None, :] + one @ log_ratio)
+        full *= self._node_weights
+        # Integral with feature i left out: divide by a_i (o_i = 1) or b_i (o_i = 0).
+        without_a = full @ inv_a
+        without_b = (full @ self._inv_one_minus_t)[:, :, None] / zero
+        sums = (one - zero) * np.where(one > 0.5, without_a, without_b)
+
+        # (L, n, F) x (L, C) -> (n, F, C)
+        return np.tensordot(sums, self._values[start:stop], axes=([0], [0]))
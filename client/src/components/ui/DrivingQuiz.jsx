@@ -512,6 +512,13 @@ const getDisplayText = (feature, impact) => {
           return
         }
 
+        if (event === 'section') {
+          if (data?.section && typeof data?.content === 'string') {
+            setStructuredExplanation((previous) => ({ ...(previous || {}), [data.section]: data.content }))
+          }
+          return
+        }
+
         if (event === 'done') {
           finalData = data?.result || null
           const finalExplanation = data?.explanation_text || finalData?.explanation_text || streamedExplanation
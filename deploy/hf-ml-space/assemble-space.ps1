@@ -47,10 +47,17 @@ $mlFiles = @(
     'contollers/Model/ml_service.py',
     'services/__init__.py',
     'services/quiz_explainer.py',
+    'services/tree_shap.py',
+    'services/occurrence_feature_store.py',
+    'services/explanation_cache.py',
+    'services/explanation_jobs.py',
+    'services/report_dedup.py',
+    'services/road_index.py',
     'anomaly-detection/report_spam_model.py',
     'anomaly-detection/report_validator.py',
     'anomaly-detection/SiaraSentinelDZ_v2.joblib',
     'anomaly-detection/report_validator_model.joblib',
+    'anomaly-detection/report_validator_model.npz',
     'anomaly-detection/report_validator_metadata.json',
     'driver-quiz-model/driver_model.joblib',
     'driver-quiz-model/driver_model_raw.joblib',
@@ -110,6 +117,11 @@ if ($IncludeSpamModel) {
     if (Copy-Into -SrcRoot $Api -Rel $pt -DstRoot $OutDir) {
         Write-Host "  + $pt (Phase 2 weights)"
         Write-Warning "Phase 2: add torch/CLIP/Pillow to requirements.txt and remove the *.pt rule from .dockerignore before building."
+        # Pre-converted copy (report_spam_model.py --convert): mmap-loaded at startup.
+        $mmapPt = 'anomaly-detection/best_fakeddit_model.mmap.pt'
+        if (Copy-Into -SrcRoot $Api -Rel $mmapPt -DstRoot $OutDir) {
+            Write-Host "  + $mmapPt (Phase 2 fast-load weights)"
+        }
     } else {
         Write-Warning "  -IncludeSpamModel set but api/$pt not found; skipping."
     }